@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+"""
+성능 벤치마크 (python -m benchmarks)
+
+    python -m benchmarks run [--quick] [--filter sequence/] [--out results.json]
+    python -m benchmarks run --save-baseline          # 기준 결과로 저장
+    python -m benchmarks compare benchmarks/baseline.json results.json
+기준 결과(benchmarks/baseline.json)가 있으면 run 이 끝난 뒤 비교하고,
+허용 비율보다 느려진 사례가 있으면 종료 코드 1로 끝납니다.
+
+    python -m benchmarks.load --students 30        # 한 반 rerun 프로파일 (AppTest, 실행은 한 번에 하나)
+    python -m benchmarks.load --server --students 30   # streamlit run 서버에 웹소켓으로 동시 접속 (benchmarks/load.py)
+"""
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+import argparse
+import os
+import sys
+
+from benchmarks import harness
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+# AppTest 로 페이지 전체를 돌리는 사례는 흔들림이 커서 넉넉히 봅니다.
+GROUP_THRESHOLDS = {"pages": 0.5}
+
+
+def _group_thresholds(items):
+    thresholds = dict(GROUP_THRESHOLDS)
+    for item in items or ():
+        group, _, value = item.partition("=")
+        thresholds[group] = float(value)
+    return thresholds
+
+
+def _add_threshold_arguments(parser, suppress=False):
+    """
+    비교 기준 옵션은 명령 앞뒤 어디에 써도 됩니다 (python -m benchmarks run --threshold 0.3).
+    하위 명령 쪽은 기본값을 두지 않아야(SUPPRESS) 앞에 쓴 값을 덮어쓰지 않습니다.
+    """
+    parser.add_argument("--threshold", type=float,
+                        default=argparse.SUPPRESS if suppress else harness.DEFAULT_THRESHOLD,
+                        help="허용하는 느려짐 비율 (0.25 = 중앙값 1.25배까지)")
+    parser.add_argument("--group-threshold", action="append", metavar="묶음=비율",
+                        default=argparse.SUPPRESS if suppress else None,
+                        help="묶음별 허용 비율 (예: pages=0.5, 여러 번 줄 수 있음)")
+
+
+def _report_changes(baseline, current, args):
+    changes = harness.compare(baseline, current, args.threshold, _group_thresholds(args.group_threshold))
+    print(harness.format_changes(changes))
+    slower = [ch for ch in changes if ch.status == "slower"]
+    print(f"\n느려짐 {len(slower)}건, 빨라짐 {sum(ch.status == 'faster' for ch in changes)}건, 비교 {len(changes)}건")
+    return 1 if slower else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="수열 탐구실 성능 벤치마크")
+    _add_threshold_arguments(parser)
+    sub = parser.add_subparsers(dest="command")
+    run = sub.add_parser("run", help="벤치마크를 돌립니다 (기본 명령).")
+    _add_threshold_arguments(run, suppress=True)
+    run.add_argument("--filter", action="append", help="이름에 이 글자가 든 사례만 (여러 번 줄 수 있음)")
+    run.add_argument("--quick", action="store_true",
+                     help=f"큰 사례(10^7 항)를 빼고 반복 수를 줄입니다 (최소 {harness.MIN_REPEAT}번).")
+    run.add_argument("--out", default="bench_results.json")
+    run.add_argument("--baseline", default=DEFAULT_BASELINE)
+    run.add_argument("--save-baseline", action="store_true", help="결과를 기준 결과로도 저장합니다.")
+    cmp_ = sub.add_parser("compare", help="저장된 두 결과를 비교합니다.")
+    _add_threshold_arguments(cmp_, suppress=True)
+    cmp_.add_argument("baseline")
+    cmp_.add_argument("current")
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        return _report_changes(harness.load(args.baseline), harness.load(args.current), args)
+
+    import benchmarks.cases  # noqa: F401  (사례 등록)
+
+    cases = [c for c in harness.REGISTRY
+             if not getattr(args, "filter", None) or any(f in c.name for f in args.filter)]
+    report = harness.run(cases, quick=getattr(args, "quick", False),
+                         progress=lambda t: print(harness.format_timing(t), flush=True))
+    out = getattr(args, "out", "bench_results.json")
+    harness.save(report, out)
+    print(f"\n결과 {len(report['results'])}건 → {out}")
+
+    baseline = getattr(args, "baseline", DEFAULT_BASELINE)
+    if getattr(args, "save_baseline", False):
+        harness.save(report, baseline)
+        print(f"기준 결과로 저장 → {baseline}")
+        return 0
+    if os.path.exists(baseline):
+        print(f"\n기준 결과와 비교 ({baseline})")
+        return _report_changes(harness.load(baseline), report, args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
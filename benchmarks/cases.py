@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+벤치마크 사례
+
+- sequence: 페이지의 generate_sequence 가 부르는 seqlab.engine.sequence_terms (50 ~ 10^7 항)
+  cold = 항 캐시가 빈 상태(처음 보는 범위), warm = 같은 범위를 다시 볼 때
+- limit_hint: rough_limit_hint 가 부르는 seqlab.limits.estimate_limit (수렴·발산·진동)
+- figures: 모드마다 표(DataFrame)와 Plotly 그림을 만드는 데 드는 시간
+- pages: Streamlit AppTest 로 페이지 전체를 실행 (새 세션 첫 실행, 같은 세션 다시 실행)
+페이지 파일 안의 함수는 스크립트 밖에서 불러올 수 없으므로, 그 함수들이 쓰는 seqlab 함수를
+페이지와 같은 인수로 잽니다. 페이지 자체의 비용은 pages 묶음이 잽니다.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.harness import register
+from seqlab import engine
+from seqlab.batch import evaluate_batch, related_expressions
+from seqlab.limits import estimate_limit
+from seqlab.plotting import animated_line_figure, line_figure, select_points
+from seqlab.sweep import sweep_grid
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIZES = (50, 1_000, 100_000, 1_000_000, 10_000_000)
+EXPRESSIONS = ("1/n", "(-1)**n/n", "n*sin(n)")
+
+
+# -----------------------------
+# 수열 계산
+# -----------------------------
+def _cold(expr):
+    def setup():
+        engine.TERMS_CACHE.clear()
+        engine.get_compiled(expr)
+    return setup
+
+
+def _warm(expr, size):
+    def setup():
+        engine.sequence_terms(expr, 1, size)
+    return setup
+
+
+for _expr in EXPRESSIONS:
+    for _size in SIZES:
+        _large = _size >= 10_000_000
+        _repeat = 3 if _size >= 1_000_000 else 7
+        register(f"sequence/cold/{_expr}/{_size:.0e}", "sequence",
+                 lambda _, e=_expr, s=_size: engine.sequence_terms(e, 1, s),
+                 setup=_cold(_expr), repeat=_repeat, large=_large)
+        register(f"sequence/warm/{_expr}/{_size:.0e}", "sequence",
+                 lambda _, e=_expr, s=_size: engine.sequence_terms(e, 1, s),
+                 setup=_warm(_expr, _size), repeat=_repeat, large=_large)
+
+
+def _compile_setup(expr):
+    def setup():
+        engine.COMPILED_CACHE.clear()
+        engine.TERMS_CACHE.clear()
+    return setup
+
+
+for _expr in EXPRESSIONS:
+    register(f"sequence/compile/{_expr}", "sequence", lambda _, e=_expr: engine.get_compiled(e),
+             setup=_compile_setup(_expr))
+
+
+# -----------------------------
+# 극한 힌트
+# -----------------------------
+HINT_INPUTS = {
+    "convergent": lambda ns: 1 + 1 / ns,
+    "divergent": lambda ns: np.sqrt(ns),
+    "oscillating": lambda ns: np.sin(ns),
+    "alternating": lambda ns: (-1.0) ** ns / ns,
+}
+
+for _kind, _make in HINT_INPUTS.items():
+    for _size in (1_000, 1_000_000):
+        _seq = _make(np.arange(1, _size + 1, dtype=float))
+        register(f"limit_hint/{_kind}/{_size:.0e}", "limit_hint", lambda _, s=_seq: estimate_limit(s))
+
+
+# -----------------------------
+# 표·그림 만들기 (모드별)
+# -----------------------------
+def _terms(expr, size):
+    return lambda: engine.sequence_terms(expr, 1, size)
+
+
+def _mode1(seq):
+    ns = np.arange(1, len(seq) + 1)
+    pd.DataFrame({"n": ns[:10], "a_n": seq[:10]})
+    line_figure(ns, {"a_n": seq})
+
+
+def _mode2(seq):
+    ns = np.arange(1, len(seq) + 1)
+    line_figure(ns, {"a_n": seq, "a_n_prime": 2.0 * seq}, y_title="값", legend_title="수열")
+
+
+def _sweep(seq):
+    ns = np.arange(1, len(seq) + 1)
+    ks, cs = np.linspace(-2, 2, 21), np.linspace(-1, 1, 21)
+    sweep_grid(seq, ks, cs, n=ns)
+    idx = select_points(ns, seq, max_points=400)
+    frames = {f"{k:.3g}": {"c = 0": k * seq[idx]} for k in ks}
+    animated_line_figure(ns[idx], frames, slider_prefix="k = ")
+
+
+def _mode3(size):
+    a = engine.get_compiled("1/n").expr
+    b = engine.get_compiled("(-1)**n*n").expr
+    series = evaluate_batch(related_expressions(a, b, True, ("a/b",)), 1, size, k_value=2.0, c_value=0.0)
+    line_figure(np.arange(1, size + 1), {name: series[name] for name in ("ab", "a'b", "a/b")})
+
+
+def _game(_):
+    ns = np.arange(1, 41)
+    values = 1 / ns
+    pd.DataFrame({"n": ns, "a_n": values}).head(10)
+    line_figure(ns, {"a_n": values})
+
+
+for _size in (50, 100_000, 1_000_000):
+    register(f"figures/mode1/{_size:.0e}", "figures", _mode1, setup=_terms("1/n", _size))
+    register(f"figures/mode2/{_size:.0e}", "figures", _mode2, setup=_terms("(-1)**n/n", _size))
+    register(f"figures/sweep/{_size:.0e}", "figures", _sweep, setup=_terms("(-1)**n/n", _size), repeat=3)
+    register(f"figures/mode3/{_size:.0e}", "figures", lambda _, s=_size: _mode3(s), repeat=3)
+register("figures/sequence20", "figures", _game)
+
+
+# -----------------------------
+# 페이지 전체 실행 (AppTest)
+# -----------------------------
+PAGES = {
+    "main": "main.py",
+    "lab": os.path.join("pages", "01.수열표현하기.py"),
+    "cardgame": os.path.join("pages", "01수열Cardgame.py"),
+    "sequence20": os.path.join("pages", "2.Sequence20_game.py"),
+}
+LAB_MODES = {
+    "mode1": "① 표현 실험실 (표·그래프)",
+    "mode2": "② 유사성 & 구조 (a, a')",
+    "mode3": "③ 연산 & 조건 (ab, a'b)",
+    "mode4": "④ 반례 & 일반화 메모",
+}
+APP_TIMEOUT = 300
+
+
+def _app(page):
+    from streamlit.testing.v1 import AppTest
+
+    return AppTest.from_file(os.path.join(ROOT, PAGES[page]), default_timeout=APP_TIMEOUT)
+
+
+def _session(page, prepare=None):
+    """첫 실행(과 prepare)까지 마친 AppTest — 다시 실행 시간을 잴 때"""
+    def setup():
+        at = _app(page)
+        at.run()
+        if prepare is not None:
+            prepare(at)
+        return at
+    return setup
+
+
+def _rerun(at):
+    at.run()
+    if at.exception:
+        raise RuntimeError(f"페이지 실행 중 오류: {at.exception[0].value}")
+
+
+def _lab_mode(label):
+    return lambda at: at.sidebar.radio[0].set_value(label).run()
+
+
+def _new_round(at):
+    at.button[0].click().run()
+
+
+for _page in PAGES:
+    register(f"pages/{_page}/new_session", "pages", _rerun, setup=lambda p=_page: _app(p), repeat=3)
+register("pages/main/rerun", "pages", _rerun, setup=_session("main"), repeat=5)
+for _mode, _label in LAB_MODES.items():
+    register(f"pages/lab/{_mode}/rerun", "pages", _rerun, setup=_session("lab", _lab_mode(_label)), repeat=5)
+register("pages/sequence20/round/rerun", "pages", _rerun, setup=_session("sequence20", _new_round), repeat=5)
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+벤치마크 등록·실행·비교
+
+사례(case)마다 준비(setup)는 시간에 넣지 않고, 본문만 repeat 번 재어
+최솟값·중앙값·평균을 남깁니다. 결과는 JSON 으로 저장하고,
+기준(baseline) JSON 과 중앙값 비율로 비교합니다.
+"""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable, List, Optional
+
+# 이보다 짧은 차이는 잡음으로 보고 회귀로 치지 않습니다 (초).
+NOISE_FLOOR = 0.002
+DEFAULT_THRESHOLD = 0.25
+# --quick 에서도 남기는 최소 반복 수 (중앙값을 비교하려면 표본이 셋은 있어야 합니다)
+MIN_REPEAT = 3
+
+
+@dataclass
+class Case:
+    name: str
+    group: str
+    func: Callable[[object], object]
+    setup: Optional[Callable[[], object]] = None
+    repeat: int = 5
+    warmup: int = 1
+    large: bool = False  # --quick 에서는 건너뜀
+
+
+@dataclass
+class Timing:
+    name: str
+    group: str
+    times: List[float] = field(default_factory=list)
+
+    @property
+    def median(self):
+        return statistics.median(self.times)
+
+    def as_dict(self):
+        data = asdict(self)
+        data.update(min=min(self.times), median=self.median, mean=statistics.fmean(self.times))
+        return data
+
+
+REGISTRY: List[Case] = []
+
+
+def register(name, group, func, setup=None, repeat=5, warmup=1, large=False):
+    """func(setup 결과)를 재는 사례를 등록합니다."""
+    REGISTRY.append(Case(name, group, func, setup, repeat, warmup, large))
+
+
+def run_case(case, quick=False):
+    repeat = max(min(MIN_REPEAT, case.repeat), case.repeat // 2) if quick else case.repeat
+    timing = Timing(case.name, case.group)
+    for i in range(case.warmup + repeat):
+        state = case.setup() if case.setup is not None else None
+        started = time.perf_counter()
+        case.func(state)
+        elapsed = time.perf_counter() - started
+        if i >= case.warmup:
+            timing.times.append(elapsed)
+    return timing
+
+
+def environment():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ""
+    import numpy
+    import streamlit
+
+    return {
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": numpy.__version__,
+        "streamlit": streamlit.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def run(cases, quick=False, progress=None):
+    """반환: {"meta": 환경, "results": {이름: 요약}}"""
+    results = {}
+    for case in cases:
+        if quick and case.large:
+            continue
+        timing = run_case(case, quick=quick)
+        results[case.name] = timing.as_dict()
+        if progress is not None:
+            progress(timing)
+    return {"meta": environment(), "results": results}
+
+
+def save(report, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@dataclass(frozen=True)
+class Change:
+    name: str
+    baseline: float
+    current: float
+    threshold: float
+
+    @property
+    def ratio(self):
+        return self.current / self.baseline if self.baseline > 0 else float("inf")
+
+    @property
+    def status(self):
+        if abs(self.current - self.baseline) < NOISE_FLOOR:
+            return "same"
+        if self.ratio > 1 + self.threshold:
+            return "slower"
+        if self.ratio < 1 / (1 + self.threshold):
+            return "faster"
+        return "same"
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD, group_thresholds=None):
+    """
+    두 보고서를 중앙값으로 비교합니다.
+    group_thresholds: {묶음 이름: 허용 비율} (AppTest 재실행처럼 흔들림이 큰 묶음에 넉넉히)
+    반환: [Change, ...] (양쪽에 다 있는 사례만)
+    """
+    group_thresholds = group_thresholds or {}
+    changes = []
+    for name, now in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        changes.append(Change(name, before["median"], now["median"], group_thresholds.get(now["group"], threshold)))
+    return changes
+
+
+def format_changes(changes):
+    lines = []
+    for ch in sorted(changes, key=lambda c: -c.ratio):
+        mark = {"slower": "▲", "faster": "▼", "same": " "}[ch.status]
+        lines.append(f"{mark} {ch.name:<48} {ch.baseline * 1e3:>10.2f} ms → {ch.current * 1e3:>10.2f} ms  "
+                     f"(×{ch.ratio:.2f}, 허용 ×{1 + ch.threshold:.2f})")
+    return "\n".join(lines)
+
+
+def format_timing(timing):
+    return f"{timing.name:<48} 중앙값 {timing.median * 1e3:>10.2f} ms  (최소 {min(timing.times) * 1e3:.2f} ms, {len(timing.times)}회)"
@@ -0,0 +1,515 @@
+# -*- coding: utf-8 -*-
+"""
+한 반이 동시에 페이지를 쓰는 상황을 흉내 내는 부하 생성기
+
+두 가지 방식이 있습니다.
+
+- AppTest (기본): 학생 한 명 = AppTest 세션 하나(페이지마다)로, 실제 학생처럼
+  식을 넣고, 모드를 바꾸고, 질문을 던지고, 메모를 쓰고, 정답을 엽니다.
+  프로세스 전역 캐시·기호 계산 작업 프로세스·저장소를 함께 쓰지만, AppTest 는 실행하는 동안
+  프로세스 전역(Runtime 등)을 바꿔 끼우므로 스크립트 실행은 한 번에 하나씩만 합니다.
+  그래서 동시 접속 부하가 아니라 '줄 세운 rerun 별 프로파일'입니다 (지연 = 차례 기다림 + 실행).
+- 로컬 서버 (--server): streamlit run 으로 서버를 따로 띄우고, 학생마다 브라우저처럼
+  웹소켓(/_stcore/stream)으로 붙어 다시 실행을 요청합니다. 세션마다 스크립트 스레드가 따로 돌므로
+  실제 동시 접속에 가깝습니다. 위젯은 식 입력·모드 선택·버튼만 누르고, 메모리는 서버 프로세스 것을 잽니다.
+
+    python -m benchmarks.load --students 30 [--think 0.5] [--cold] [--out load.json]
+    python -m benchmarks.load --server --students 30 [--port 8599]
+
+보고: 다시 실행(rerun) 지연의 p50/p95/p99 (전체·페이지별·단계별), 처리량(rerun/초),
+학생당 메모리 증가(프로세스 RSS 증가 ÷ 학생 수), 세션 상태 크기.
+메모리는 학생 한 명을 먼저 돌려 모듈·캐시를 채운 뒤부터 잽니다 (--cold 면 생략).
+"""
+import argparse
+import json
+import os
+import pickle
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = {
+    "main": os.path.join(ROOT, "main.py"),
+    "lab": os.path.join(ROOT, "pages", "01.수열표현하기.py"),
+    "sequence20": os.path.join(ROOT, "pages", "2.Sequence20_game.py"),
+}
+APP_TIMEOUT = 300
+# AppTest 실행은 전역 상태를 건드리므로 한 번에 하나씩
+_RUN_LOCK = threading.Lock()
+# 로컬 서버에서 페이지를 찾는 이름 (Streamlit 이 파일 이름 앞 번호를 떼고 붙인 이름에 들어 있는 말)
+SERVER_PAGES = {"main": "main", "lab": "수열표현하기", "sequence20": "Sequence20_game"}
+SERVER_START_TIMEOUT = 60
+# 학생들이 번갈아 넣어 보는 식
+EXPRESSIONS = ["1/n", "(-1)**n/n", "(3*n+1)/(2*n-1)", "n*sin(n)", "(1+1/n)**n", "log(n)/n", "sqrt(n)", "cos(n)/n"]
+LAB_MODES = ["② 유사성 & 구조 (a, a')", "③ 연산 & 조건 (ab, a'b)", "④ 반례 & 일반화 메모"]
+
+
+def _rss_bytes(pid="self"):
+    """프로세스(기본: 지금 프로세스)의 상주 메모리 (읽을 수 없으면 0)"""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        if pid != "self":
+            return 0
+        try:
+            import resource
+
+            # 리눅스가 아니면 최대 상주 메모리로 대신합니다.
+            scale = 1 if sys.platform == "darwin" else 1024
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+        except ImportError:
+            return 0
+
+
+def _by_label(widgets, prefix):
+    for w in widgets:
+        if w.label.startswith(prefix):
+            return w
+    raise LookupError(f"'{prefix}' 로 시작하는 위젯이 없습니다.")
+
+
+def _state_bytes(at):
+    total = 0
+    for key in at.session_state:
+        try:
+            total += len(pickle.dumps(at.session_state[key]))
+        except Exception:
+            pass
+    return total
+
+
+class Student:
+    """한 학생의 세션들 (페이지마다 AppTest 하나)과 그 기록"""
+
+    def __init__(self, number, rng, think, class_id):
+        self.number = number
+        self.rng = rng
+        self.think = think
+        self.class_id = class_id
+        self.samples = []   # (페이지, 단계, 지연 초, 실행 초)
+        self.errors = []
+        self.state_bytes = 0
+
+    def _pause(self):
+        if self.think > 0:
+            time.sleep(self.rng.expovariate(1.0 / self.think))
+
+    def _step(self, page, name, at, action=None):
+        self._pause()
+        try:
+            target = at if action is None else action(at)
+            started = time.perf_counter()
+            with _RUN_LOCK:
+                running = time.perf_counter()
+                target.run()
+            finished = time.perf_counter()
+        except Exception as exc:
+            self.errors.append(f"{page}/{name}: {exc!r}")
+            return
+        self.samples.append((page, name, finished - started, finished - running))
+        if at.exception:
+            self.errors.append(f"{page}/{name}: {at.exception[0].value}")
+
+    def _open(self, page):
+        from streamlit.testing.v1 import AppTest
+
+        at = AppTest.from_file(PAGES[page], default_timeout=APP_TIMEOUT)
+        at.session_state["class_id"] = self.class_id
+        at.session_state["student"] = f"load-{self.number}"
+        self._step(page, "open", at)
+        return at
+
+    def main_page(self):
+        at = self._open("main")
+        self._step("main", "rerun", at)
+
+    def lab_page(self):
+        at = self._open("lab")
+        expr = self.rng.choice(EXPRESSIONS)
+        self._step("lab", "expression", at, lambda a: _by_label(a.text_input, "일반항 a(n)").input(expr))
+        self._step("lab", "memo", at, lambda a: _by_label(a.text_area, "표 vs 그래프").input(f"{expr} 관찰 메모"))
+        for mode in LAB_MODES:
+            self._step("lab", "mode", at, lambda a, m=mode: a.sidebar.radio[0].set_value(m))
+            if mode.startswith("②"):
+                self._step("lab", "expression", at,
+                           lambda a: _by_label(a.text_input, "기본 수열 a(n)").input(self.rng.choice(EXPRESSIONS)))
+            elif mode.startswith("③"):
+                self._step("lab", "expression", at,
+                           lambda a: _by_label(a.text_input, "b(n)을").input(self.rng.choice(["n", "1/n", "(-1)**n"])))
+            else:
+                self._step("lab", "memo", at,
+                           lambda a: _by_label(a.text_area, "조건을 덧붙여").input("두 수열이 모두 유계일 때"))
+        self.state_bytes += _state_bytes(at)
+
+    def game_page(self, questions=3):
+        at = self._open("sequence20")
+        self._step("sequence20", "new_round", at, lambda a: _by_label(a.button, "🔄").click())
+        for _ in range(questions):
+            try:
+                label = self.rng.choice(_by_label(at.selectbox, "묻고자 하는 질문").options)
+            except LookupError:
+                break  # 더 물을 질문이 없음
+            # 선택지가 (key, 문구) 쌍이고 화면에는 문구만 보이므로, 문구가 같은 쌍을 넘기면
+            # 페이지 쪽에서 진짜 선택지로 되돌려 받습니다.
+            self._step("sequence20", "choose", at,
+                       lambda a: _by_label(a.selectbox, "묻고자 하는 질문").set_value((None, label)))
+            self._step("sequence20", "ask", at, lambda a: _by_label(a.button, "❓").click())
+        self._step("sequence20", "verdict", at, lambda a: _by_label(a.radio, "이 수열의 운명").set_value("수렴한다"))
+        self._step("sequence20", "reason", at, lambda a: _by_label(a.text_area, "어찌하여").input("표가 줄어들어서"))
+        self._step("sequence20", "reveal", at, lambda a: _by_label(a.button, "📢").click())
+        self.state_bytes += _state_bytes(at)
+
+    def run(self):
+        self.main_page()
+        self.lab_page()
+        self.game_page()
+        return self
+
+
+# -----------------------------
+# 로컬 서버 (--server)
+# -----------------------------
+WIDGET_KINDS = ("text_input", "text_area", "radio", "selectbox", "button")
+
+
+class _ServerSession:
+    """
+    브라우저 탭 하나: 웹소켓으로 다시 실행을 요청하고 script_finished 가 올 때까지 받습니다.
+    바꾼 위젯 값은 브라우저처럼 기억해 두었다가 다음 요청에도 함께 보냅니다.
+    """
+
+    def __init__(self, url):
+        from websockets.sync.client import connect
+
+        self._stack = ExitStack()
+        self.ws = self._stack.enter_context(
+            connect(url, subprotocols=["streamlit"], max_size=None, open_timeout=APP_TIMEOUT)
+        )
+        self.pages = {}      # "주소 이름" → page_script_hash (navigation 메시지)
+        self.page = ""       # 빈 문자열은 첫 페이지(main.py)
+        self.widgets = {}    # 위젯 id → WidgetState
+        self.elements = []   # 마지막 실행에서 받은 (위젯 종류, 요소)
+        self.exceptions = []
+
+    def close(self):
+        self._stack.close()
+
+    def rerun(self, page=None, triggers=()):
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        if page is not None and page != self.page:
+            self.page, self.widgets = page, {}
+        msg = BackMsg()
+        msg.rerun_script.page_script_hash = self.page
+        msg.rerun_script.widget_states.widgets.extend(list(self.widgets.values()) + list(triggers))
+        self.ws.send(msg.SerializeToString())
+        self.elements, self.exceptions = [], []
+        while True:
+            fwd = ForwardMsg()
+            fwd.ParseFromString(self.ws.recv(timeout=APP_TIMEOUT))
+            kind = fwd.WhichOneof("type")
+            if kind == "navigation":
+                self.pages = {f"{p.url_pathname} {p.page_name}": p.page_script_hash for p in fwd.navigation.app_pages}
+            elif kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                element = fwd.delta.new_element
+                name = element.WhichOneof("type")
+                if name == "exception":
+                    self.exceptions.append(element.exception.message)
+                elif name in WIDGET_KINDS:
+                    self.elements.append((name, getattr(element, name)))
+            elif kind == "script_finished":
+                return
+
+    def find(self, kind, prefix):
+        for name, element in self.elements:
+            if name == kind and element.label.startswith(prefix):
+                return element
+        raise LookupError(f"'{prefix}' 로 시작하는 위젯이 없습니다.")
+
+    def set_string(self, kind, prefix, value):
+        """글 입력·라디오·선택 상자 (라디오·선택 상자는 화면에 보이는 선택지 문자열)"""
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        widget_id = self.find(kind, prefix).id
+        self.widgets[widget_id] = WidgetState(id=widget_id, string_value=value)
+
+    def click(self, prefix):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        return (WidgetState(id=self.find("button", prefix).id, trigger_value=True),)
+
+
+def server_pages(url):
+    """서버에 한 번 붙어 페이지 이름 → page_script_hash 를 받아 옵니다 (navigation 메시지)."""
+    session = _ServerSession(url)
+    try:
+        session.rerun()
+    finally:
+        session.close()
+    found = {}
+    for page, word in SERVER_PAGES.items():
+        matches = [script_hash for name, script_hash in session.pages.items() if word in name]
+        if not matches:
+            raise LookupError(f"서버에 '{word}' 페이지가 없습니다.")
+        found[page] = matches[0]
+    return found
+
+
+class ServerStudent(Student):
+    """로컬 서버에 웹소켓으로 붙는 학생 (페이지마다 탭 하나, 기록 형식은 Student 와 같음)"""
+
+    def __init__(self, number, rng, think, class_id, url, pages):
+        super().__init__(number, rng, think, class_id)
+        self.url = url
+        self.pages = pages
+
+    def _server_step(self, page, name, session, action=None):
+        self._pause()
+        try:
+            triggers = () if action is None else action(session) or ()
+            started = time.perf_counter()
+            session.rerun(triggers=triggers)
+            finished = time.perf_counter()
+        except Exception as exc:
+            self.errors.append(f"{page}/{name}: {exc!r}")
+            return
+        # 서버에서는 차례를 기다리지 않으므로 실행 시간 = 지연
+        self.samples.append((page, name, finished - started, finished - started))
+        if session.exceptions:
+            self.errors.append(f"{page}/{name}: {session.exceptions[0]}")
+
+    def _server_open(self, page):
+        session = _ServerSession(self.url)
+        session.page = self.pages[page]
+        self._server_step(page, "open", session)
+        return session
+
+    def _write_memo(self, session, prefix, text):
+        # AppTest 학생처럼 반·이름을 적어 메모가 저장소에도 저장되게 합니다.
+        session.set_string("text_input", "반", self.class_id)
+        session.set_string("text_input", "이름", f"load-{self.number}")
+        session.set_string("text_area", prefix, text)
+
+    def main_page(self):
+        session = self._server_open("main")
+        self._server_step("main", "rerun", session)
+        session.close()
+
+    def lab_page(self):
+        session = self._server_open("lab")
+        expr = self.rng.choice(EXPRESSIONS)
+        self._server_step("lab", "expression", session,
+                          lambda s: s.set_string("text_input", "일반항 a(n)", expr))
+        self._server_step("lab", "memo", session, lambda s: self._write_memo(s, "표 vs 그래프", f"{expr} 관찰 메모"))
+        for mode in LAB_MODES:
+            self._server_step("lab", "mode", session, lambda s, m=mode: s.set_string("radio", "탐구 카테고리", m))
+            if mode.startswith("②"):
+                self._server_step("lab", "expression", session,
+                                  lambda s: s.set_string("text_input", "기본 수열 a(n)", self.rng.choice(EXPRESSIONS)))
+            elif mode.startswith("③"):
+                self._server_step("lab", "expression", session,
+                                  lambda s: s.set_string("text_input", "b(n)을", self.rng.choice(["n", "1/n", "(-1)**n"])))
+        session.close()
+
+    def game_page(self, questions=3):
+        session = self._server_open("sequence20")
+        self._server_step("sequence20", "new_round", session, lambda s: s.click("🔄"))
+        for _ in range(questions):
+            try:
+                label = self.rng.choice(session.find("selectbox", "묻고자 하는 질문").options)
+            except LookupError:
+                break  # 더 물을 질문이 없음
+            self._server_step("sequence20", "choose", session,
+                              lambda s: s.set_string("selectbox", "묻고자 하는 질문", label))
+            self._server_step("sequence20", "ask", session, lambda s: s.click("❓"))
+        self._server_step("sequence20", "verdict", session, lambda s: s.set_string("radio", "이 수열의 운명", "수렴한다"))
+        self._server_step("sequence20", "reveal", session, lambda s: s.click("📢"))
+        session.close()
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port=None):
+    """
+    streamlit run main.py 를 머리 없이(headless) 띄우고 /_stcore/health 가 응답할 때까지 기다립니다.
+    반환: (Popen, 웹소켓 주소)
+    """
+    port = port or _free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", PAGES["main"], "--server.headless", "true",
+         "--server.port", str(port), "--browser.gatherUsageStats", "false"],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"streamlit 서버가 시작하지 못했습니다 (종료 코드 {proc.returncode}).")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    return proc, f"ws://127.0.0.1:{port}/_stcore/stream"
+        except OSError:
+            time.sleep(0.2)
+    stop_server(proc)
+    raise RuntimeError(f"streamlit 서버가 {SERVER_START_TIMEOUT}초 안에 응답하지 않았습니다.")
+
+
+def stop_server(proc):
+    proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+def _percentiles(values):
+    if not values:
+        return {}
+    arr = np.asarray(values) * 1e3
+    p50, p95, p99 = np.percentile(arr, [50, 95, 99])
+    return {"count": len(values), "p50_ms": p50, "p95_ms": p95, "p99_ms": p99, "max_ms": float(arr.max())}
+
+
+def run_load(students=30, think=0.5, seed=0, class_id="load-test", cold=False, server_url=None, server_pid=None):
+    """
+    students 명을 동시에 움직이고 요약 dict 를 돌려줍니다.
+    cold: 미리 데우지 않고 수업 첫 순간처럼 캐시 채우는 비용까지 잼
+    server_url: 띄워 둔 서버의 웹소켓 주소 (start_server). 없으면 이 프로세스 안의 AppTest
+    server_pid: 메모리를 잴 서버 프로세스
+    """
+    if server_url is None:
+        def make(i, rng, think_seconds):
+            return Student(i, rng, think_seconds, class_id)
+        pid = "self"
+    else:
+        pages = server_pages(server_url)
+
+        def make(i, rng, think_seconds):
+            return ServerStudent(i, rng, think_seconds, class_id, server_url, pages)
+        pid = server_pid or "self"
+
+    if not cold:
+        make(-1, random.Random(seed), 0).run()
+    rss_before = _rss_bytes(pid)
+    rngs = [random.Random(seed * 1_000_003 + i) for i in range(students)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=students, thread_name_prefix="student") as pool:
+        done = list(pool.map(lambda i: make(i, rngs[i], think).run(), range(students)))
+    wall = time.perf_counter() - started
+    rss_after = _rss_bytes(pid)
+
+    samples = [s for student in done for s in student.samples]
+    by_page = {}
+    by_step = {}
+    for page, step, seconds, _ in samples:
+        by_page.setdefault(page, []).append(seconds)
+        by_step.setdefault(f"{page}/{step}", []).append(seconds)
+    return {
+        "mode": "apptest" if server_url is None else "server",
+        "students": students,
+        "think_seconds": think,
+        "cold": cold,
+        "wall_seconds": wall,
+        "reruns": len(samples),
+        "throughput_per_s": len(samples) / wall if wall > 0 else 0.0,
+        "latency": _percentiles([s[2] for s in samples]),
+        "run_time": _percentiles([s[3] for s in samples]),
+        "latency_by_page": {page: _percentiles(v) for page, v in sorted(by_page.items())},
+        "latency_by_step": {step: _percentiles(v) for step, v in sorted(by_step.items())},
+        "rss_before_mb": rss_before / 2**20,
+        "rss_after_mb": rss_after / 2**20,
+        "rss_growth_per_student_mb": (rss_after - rss_before) / 2**20 / students,
+        # 서버 쪽 세션 상태는 밖에서 볼 수 없습니다.
+        "session_state_kb_per_student": (
+            sum(s.state_bytes for s in done) / 1024 / students if server_url is None else None
+        ),
+        "errors": [e for student in done for e in student.errors],
+    }
+
+
+def format_report(report):
+    if report.get("mode") == "server":
+        title = f"로컬 서버: streamlit run 에 웹소켓 세션 {report['students']}개가 동시에 붙음"
+    else:
+        title = "AppTest: 줄 세운 rerun 별 프로파일 (스크립트 실행은 한 번에 하나, 지연 = 차례 기다림 + 실행)"
+    lines = [
+        title,
+        f"학생 {report['students']}명, 생각 시간 평균 {report['think_seconds']}초, 걸린 시간 {report['wall_seconds']:.1f}초",
+        f"다시 실행 {report['reruns']}회, 처리량 {report['throughput_per_s']:.1f}회/초",
+    ]
+
+    def row(name, p):
+        return f"  {name:<24} p50 {p['p50_ms']:>8.1f}  p95 {p['p95_ms']:>8.1f}  p99 {p['p99_ms']:>8.1f}  ms  ({p['count']}회)"
+
+    if report["latency"]:
+        lines.append(row("전체", report["latency"]))
+        if report.get("mode") != "server":
+            lines.append(row("  (실행만)", report["run_time"]))
+    for page, p in report["latency_by_page"].items():
+        lines.append(row(page, p))
+    lines.append("  단계별")
+    for step, p in report["latency_by_step"].items():
+        lines.append("  " + row(step, p))
+    memory = (
+        f"메모리: {report['rss_before_mb']:.0f} MB → {report['rss_after_mb']:.0f} MB "
+        f"(학생당 {report['rss_growth_per_student_mb']:.2f} MB)"
+    )
+    if report["session_state_kb_per_student"] is None:
+        lines.append(memory + " (서버 프로세스)")
+    else:
+        lines.append(memory + f", 세션 상태 학생당 {report['session_state_kb_per_student']:.1f} KB")
+    if report["errors"]:
+        lines.append(f"오류 {len(report['errors'])}건:")
+        lines.extend(f"  {e}" for e in report["errors"][:20])
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load", description="교실 동시 접속 부하 생성기")
+    parser.add_argument("--students", type=int, default=30)
+    parser.add_argument("--think", type=float, default=0.5, help="단계 사이 평균 생각 시간 (초, 지수 분포)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cold", action="store_true", help="미리 데우지 않음 (첫 접속 비용까지 잼)")
+    parser.add_argument("--db", default=None, help="활동 기록 DB (기본: 임시 파일, 실제 기록을 건드리지 않음)")
+    parser.add_argument("--out", default=None, help="결과 JSON 파일")
+    parser.add_argument("--server", action="store_true",
+                        help="streamlit run 으로 서버를 띄우고 웹소켓으로 동시에 붙음 (기본: AppTest, 실행은 한 번에 하나)")
+    parser.add_argument("--port", type=int, default=None, help="--server 의 포트 (기본: 빈 포트)")
+    args = parser.parse_args(argv)
+
+    # 저장소는 처음 쓸 때 경로를 정하므로, 페이지를 불러오기 전에 정해 둡니다.
+    os.environ["SEQLAB_DB"] = args.db or os.path.join(tempfile.mkdtemp(prefix="seqlab-load-"), "classroom.db")
+    if args.server:
+        proc, url = start_server(args.port)
+        try:
+            report = run_load(args.students, args.think, args.seed, cold=args.cold, server_url=url, server_pid=proc.pid)
+        finally:
+            stop_server(proc)
+    else:
+        report = run_load(args.students, args.think, args.seed, cold=args.cold)
+    print(format_report(report))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,13 @@ import streamlit as st
 import streamlit.components.v1 as components
 from pathlib import Path
 
+from seqlab import core, telemetry
+
+telemetry.begin_rerun("main")
+# 서버 프로세스의 첫 접속이면 계산 페이지가 쓸 무거운 모듈·캐시를 뒤에서 미리 데웁니다.
+# (Streamlit 에는 서버 시작 훅이 없어 보통 이 첫 화면이 그 시점입니다.)
+core.warm_up()
+
 st.set_page_config(page_title="Evolving Logic", layout="wide")
 
 # 상단 제목
@@ -27,11 +34,16 @@ st.markdown(
 
 # 이 파일(main.py)와 같은 위치의 main.html 읽기
 html_path = Path(__file__).resolve().parent / "main.html"
-html_code = html_path.read_text(encoding="utf-8")
+with telemetry.span("read_html"):
+    html_code = html_path.read_text(encoding="utf-8")
+telemetry.payload("main_html", len(html_code.encode("utf-8")))
 
 # Streamlit 안에서 애니메이션 렌더링
-components.html(
-    html_code,
-    height=900,
-    scrolling=False
-)
+with telemetry.span("components_html"):
+    components.html(
+        html_code,
+        height=900,
+        scrolling=False
+    )
+
+telemetry.end_rerun()
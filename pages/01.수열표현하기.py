@@ -2,59 +2,430 @@
 # -*- coding: utf-8 -*-
 
 import streamlit as st
-import numpy as np
-import pandas as pd
-import plotly.express as px
-import sympy as sp
+
+# numpy·sympy·pandas·plotly 와 그것을 쓰는 seqlab 모듈은 쓰는 모드·함수 안에서 불러옵니다.
+# (④ 반례 & 일반화 메모는 하나도 불러오지 않습니다.)
+from seqlab import core, telemetry
+from seqlab.core import CONVERGES, DIVERGES_NEG, DIVERGES_POS, OSCILLATES, UNKNOWN
+from seqlab.export import export_panel
+from seqlab.guard import ExpressionRejected
+from seqlab.store import get_store
+
+PAGE_ID = "sequence_lab"
+# 이 rerun 에서 어디에 시간이 드는지 잽니다 (seqlab.telemetry, 맨 아래에서 끝냄).
+telemetry.begin_rerun(PAGE_ID)
+# 이 서버 프로세스에서 처음이면 무거운 모듈·캐시를 뒤에서 미리 데웁니다.
+core.warm_up()
 
 st.set_page_config(page_title="수열의 극한 탐구실", layout="wide")
 
 st.title("📈 수열의 극한 탐구실")
 st.caption("Simple is structural. — 한 문장, 전체 구조")
 
-# 공통 심볼
-n = sp.symbols('n')
-
 # 유틸: 수열 생성 함수
 def generate_sequence(expr_str, n_min=1, n_max=50):
     """
     expr_str: '1/n' 같은 문자열
     n_min ~ n_max: 정수 범위
-    반환: 리스트(float), 오류시 None
+    반환: 읽기 전용 float 배열(np.ndarray, 계산 불가 항은 NaN), 오류시 None
+    같은 식·같은 범위는 모든 세션이 캐시를 함께 씁니다.
+    계산 비용이 지나친 식은 오류를 보여 주고 여기서 멈춥니다.
     """
+    from seqlab.engine import sequence_terms
+
     try:
-        expr = sp.sympify(expr_str)
-    except Exception:
+        with telemetry.span("sequence_terms"):
+            return sequence_terms(expr_str, n_min, n_max)
+    except ExpressionRejected as exc:
+        reject_expression(expr_str, exc)
+    except ValueError:
         return None
 
-    seq = []
-    for k in range(n_min, n_max + 1):
-        try:
-            val = expr.subs(n, k)
-            seq.append(float(val))
-        except Exception:
-            seq.append(np.nan)
-    return seq
+
+def reject_expression(expr_str, exc):
+    st.error(f"`{expr_str}` 은(는) 계산하기에 너무 무거운 식입니다: {exc} 더 간단한 식으로 바꿔 입력해 주세요.")
+    st.stop()
 
 # 유틸: 간단한 수렴/발산 힌트
+CONFIDENCE_LABEL = {"high": "높음", "medium": "보통", "low": "낮음"}
+
+
 def rough_limit_hint(seq):
-    arr = np.array(seq, dtype=float)
-    # NaN 제거
-    arr = arr[~np.isnan(arr)]
-    if len(arr) < 10:
+    """
+    seq: 항 배열/리스트(n = 1부터), 또는 스트리밍 요약(StreamSummary)
+    수열 가속 변환(Aitken, Richardson, Wynn ε)으로 극한을 추정해 문장으로 돌려줍니다.
+    """
+    from seqlab.limits import estimate_limit
+    from seqlab.stream import StreamSummary
+
+    with telemetry.span("limit_hint"):
+        if isinstance(seq, StreamSummary):
+            est = estimate_limit(seq.tail, seq.tail_n)
+        else:
+            est = estimate_limit(seq)
+
+    if est.kind == UNKNOWN and est.method.startswith("slow"):
+        return "증가분이 너무 천천히 줄어 유한한 항으로는 수렴·발산을 가릴 수 없습니다 (ln n, 1/ln n 과 비슷한 속도)."
+    if est.kind == UNKNOWN:
         return "데이터가 충분하지 않습니다."
+    if est.kind == DIVERGES_POS:
+        return "값이 한없이 커지고 있습니다 → +∞로 발산할 가능성이 큽니다."
+    if est.kind == DIVERGES_NEG:
+        return "값이 한없이 작아지고 있습니다 → -∞로 발산할 가능성이 큽니다."
+    if est.kind == OSCILLATES:
+        return f"진동하거나 불규칙해 보입니다 → 극한이 존재하지 않을 수 있습니다 (꼬리 진폭 ≈ {est.error:.4g})"
+    return (
+        f"수렴할 가능성이 큽니다 → 추정 극한 ≈ {est.value:.6g} "
+        f"(오차 범위 ±{est.error:.1e}, 확신도 {CONFIDENCE_LABEL[est.confidence]}, 방법: {est.method})"
+    )
+
+# 유틸: 정확한 극한 (기호 계산)
+def _show_exact_limit(label, limit_res, simplify_res):
+    from seqlab.symbolic import OK, TIMEOUT
+
+    if limit_res.status == OK:
+        if limit_res.text == "nan" or limit_res.text.startswith("AccumBounds"):
+            st.write(f"기호 계산 결과: **{label}의 극한은 존재하지 않습니다.** (`{limit_res.text}`)")
+        else:
+            st.latex(rf"\lim_{{n \to \infty}} {label} = {limit_res.latex}")
+        if simplify_res.status == OK:
+            st.caption(f"정리한 식: {simplify_res.text}  ·  계산 {limit_res.seconds:.2f}초")
+    elif limit_res.status == TIMEOUT:
+        st.warning(f"⏱️ 기호 계산이 {limit_res.seconds:.0f}초 안에 끝나지 않았습니다 (timed out). 위의 수치 힌트를 참고하세요.")
+    else:
+        st.caption("기호 계산으로는 극한을 구하지 못했습니다.")
+
+
+def exact_limit_panel(expr_str, label="a(n)"):
+    """
+    sympy.limit 결과를 작업 프로세스에 맡기고, 기다리지 않고 먼저 그립니다.
+    결과가 도착하면 채워 넣고, 제한 시간을 넘기면 '시간 초과'를 보여 줍니다.
+    """
+    from seqlab.engine import get_compiled
+    from seqlab.symbolic import submit_limit, submit_simplify
+
+    try:
+        compiled = get_compiled(expr_str)
+    except ValueError:
+        return
+    if compiled.has_foreign_symbols:
+        return
+    with telemetry.span("symbolic_submit"):
+        limit_fut = submit_limit(compiled)
+        simplify_fut = submit_simplify(compiled)
+
+    if limit_fut.done() and simplify_fut.done():
+        _show_exact_limit(label, limit_fut.result(), simplify_fut.result())
+        return
+
+    @st.fragment(run_every=0.5)
+    def _wait_for_exact_limit():
+        if limit_fut.done() and simplify_fut.done():
+            st.rerun()
+        st.caption("⏳ 정확한 극한을 기호 계산으로 구하는 중입니다...")
+
+    _wait_for_exact_limit()
+
+
+# 유틸: 입력이 같으면 다시 만들지 않는 표·그래프 (모든 세션이 함께 씀)
+#  - 인수는 정규화된 식 문자열과 범위·변환 값처럼 '진짜 입력'만 받습니다.
+#  - 그래프는 항이 아무리 많아도 화면 픽셀 수 정도의 점만 담습니다 (seqlab.plotting).
+@st.cache_resource(max_entries=256, show_spinner=False)
+def build_sequence_view(expr_key, n_min, n_max, log_x=False):
+    import numpy as np
+    import pandas as pd
+
+    from seqlab.engine import sequence_terms
+    from seqlab.plotting import line_figure
+
+    seq = sequence_terms(expr_key, n_min, n_max)
+    ns = np.arange(n_min, n_max + 1)
+    with telemetry.span("dataframe"):
+        df_head = pd.DataFrame({"n": ns[:10], "a_n": seq[:10]})
+    fig = line_figure(ns, {"a_n": seq}, log_x=log_x)
+    return df_head, fig
+
+
+def show_chart(fig):
+    """그림을 내보냅니다 (직렬화·전송 시간을 plotly_chart 로 잼)."""
+    with telemetry.span("plotly_chart"):
+        st.plotly_chart(fig, use_container_width=True)
+
+
+def transform_sequence(seq, use_k, k, c):
+    """a' = k·a 또는 a' = a + c"""
+    import numpy as np
+
+    arr = np.asarray(seq, dtype=float)
+    if use_k:
+        return k * arr, f"a'(n) = {k} · a(n)"
+    return arr + c, f"a'(n) = a(n) + {c}"
+
+
+@st.cache_resource(max_entries=256, show_spinner=False)
+def build_similarity_view(expr_key, n_min, n_max, use_k, k, c, log_x=False):
+    import numpy as np
+
+    from seqlab.engine import sequence_terms
+    from seqlab.plotting import line_figure
+
+    seq_a = sequence_terms(expr_key, n_min, n_max)
+    seq_ap, desc = transform_sequence(seq_a, use_k, k, c)
+    fig2 = line_figure(
+        np.arange(n_min, n_max + 1),
+        {"a_n": seq_a, "a_n_prime": seq_ap},
+        log_x=log_x,
+        y_title="값",
+        legend_title="수열",
+        title="a(n) vs a'(n) 비교"
+    )
+    return desc, fig2
+
+
+# 훑기(sweep) 애니메이션에 담는 최대 프레임 수와 프레임당 점 수
+SWEEP_FRAMES = 21
+SWEEP_POINTS = 400
+KIND_LABEL = {
+    CONVERGES: "수렴",
+    DIVERGES_POS: "+∞ 발산",
+    DIVERGES_NEG: "-∞ 발산",
+    OSCILLATES: "진동",
+    UNKNOWN: "판단 불가",
+}
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def build_sweep_view(expr_key, n_min, n_max, k_range, c_range, steps, log_x=False):
+    """
+    k×c 격자 전체의 a' = k·a + c 를 한 번에 계산해
+    극한 히트맵과 (브라우저에서만 움직이는) k 애니메이션을 만듭니다.
+    """
+    import numpy as np
+    import plotly.graph_objects as go
+
+    from seqlab.engine import sequence_terms
+    from seqlab.plotting import animated_line_figure, select_points
+    from seqlab.sweep import sweep_grid
+
+    ns = np.arange(n_min, n_max + 1)
+    seq_a = sequence_terms(expr_key, n_min, n_max)
+    ks = np.linspace(k_range[0], k_range[1], steps)
+    cs = np.linspace(c_range[0], c_range[1], steps)
+    result = sweep_grid(seq_a, ks, cs, n=ns)
+
+    limit = result.limit
+    if np.isfinite(limit).any():
+        z, z_title = limit, "극한 k·L + c"
+    else:
+        z, z_title = result.tail_mean, "꼬리 평균"
+    kinds = np.vectorize(KIND_LABEL.get)(result.kind)
+    heat = go.Figure(
+        go.Heatmap(
+            x=cs,
+            y=ks,
+            z=z,
+            colorbar_title=z_title,
+            customdata=np.dstack([kinds, result.tail_width, result.max_abs]),
+            hovertemplate=(
+                "k = %{y:.3g}, c = %{x:.3g}<br>%{customdata[0]}, " + z_title + " ≈ %{z:.4g}"
+                "<br>꼬리 진폭 %{customdata[1]:.3g}, 최대 |a'| %{customdata[2]:.3g}<extra></extra>"
+            ),
+        )
+    )
+    heat.update_layout(xaxis_title="c", yaxis_title="k", title="k·c 격자에서 a'(n)의 극한")
+
+    # 애니메이션: 점 선택은 a(n)으로 한 번만 (a' = k·a + c 는 모양이 같으므로)
+    idx = select_points(ns, seq_a, max_points=SWEEP_POINTS, log_x=log_x)
+    x, a_pts = ns[idx], np.asarray(seq_a)[idx]
+    c_show = np.unique(cs[[0, len(cs) // 2, -1]])
+    frame_ks = ks[np.unique(np.linspace(0, len(ks) - 1, min(SWEEP_FRAMES, len(ks))).astype(int))]
+    frames = {
+        f"{kv:.3g}": {f"c = {cv:.3g}": kv * a_pts + cv for cv in c_show}
+        for kv in frame_ks
+    }
+    anim = animated_line_figure(
+        x, frames, log_x=log_x, y_title="a'(n)", slider_prefix="k = ", title="k를 바꾸며 보는 a'(n) = k·a(n) + c"
+    )
+    return result, heat, anim
+
+
+@st.cache_resource(max_entries=256, show_spinner=False)
+def build_product_view(a_key, b_key, n_min, n_max, use_k, k, c, extras=(), log_x=False):
+    """
+    ab, a'b 와 더 보고 싶은 수열(extras: a/b, a^b, a∘b)을 한 번에 계산합니다.
+    공통 부분식은 한 번만 계산하고, k, c 는 인수로 넘기므로 값만 바뀌면 다시 컴파일하지 않습니다.
+    """
+    import numpy as np
+
+    from seqlab.batch import evaluate_batch, related_expressions
+    from seqlab.engine import get_compiled
+    from seqlab.plotting import line_figure
+
+    exprs = related_expressions(get_compiled(a_key).expr, get_compiled(b_key).expr, use_k, extras)
+    series = evaluate_batch(exprs, n_min, n_max, k_value=k, c_value=c)
+    desc3 = f"a'(n) = {k} · a(n)" if use_k else f"a'(n) = a(n) + {c}"
+
+    fig3 = line_figure(
+        np.arange(n_min, n_max + 1),
+        {name: series[name] for name in ("ab", "a'b") + tuple(extras)},
+        log_x=log_x,
+        y_title="값",
+        legend_title="수열"
+    )
+    return desc3, fig3, rough_limit_hint(series["ab"]), rough_limit_hint(series["a'b"])
+
+
+# ⑤ 워크벤치: 수열 수십 개를 (수열 × n) 배열 하나로 계산하고 그림 하나(WebGL)에 겹칩니다.
+# ④ 반례 카드에 나오는 수열들 (식 목록의 기본값)
+COUNTEREXAMPLE_SEQUENCES = "\n".join([
+    "1/n", "(-1)**n*n", "(-1)**n", "n", "log(n)", "sqrt(n)", "(n+1)/n**2",
+])
+WORKBENCH_VIEWS = ("값 aₙ", "극한과의 거리 |aₙ − L| (로그-로그)")
+
+
+def _rate_label(rate):
+    import numpy as np
+
+    if not np.isfinite(rate):
+        return "-"
+    # |a_n - L| 이 n 의 거듭제곱보다 빨리 줄어들면 p 가 한없이 커집니다 (r^n 꼴).
+    return "기하급수적 (매우 빠름)" if rate > 10 else f"{rate:.2f}"
+
+
+def _exact_value(text):
+    """기호 계산 극한 문자열 → 유한한 실수 (∞·AccumBounds·nan 이거나 읽을 수 없으면 None)"""
+    import sympy as sp
+
+    if text is None:
+        return None
+    try:
+        value = sp.sympify(text)
+    except Exception:
+        return None
+    if isinstance(value, sp.AccumBounds) or not (value.is_number and value.is_finite and value.is_real):
+        return None
+    return float(value)
+
+
+def workbench_exact_limits(sources):
+    """
+    식마다 기호 계산 극한을 맡기고, 이미 끝난 것만 문자열로 모읍니다 (기다리지 않음).
+    반환: (식별 극한 문자열 또는 None 의 튜플, 아직 계산 중인 Future 목록)
+    """
+    from seqlab.engine import get_compiled
+    from seqlab.symbolic import OK, submit_limit
+
+    texts, pending = [], []
+    with telemetry.span("symbolic_submit"):
+        for source in sources:
+            try:
+                compiled = get_compiled(source)
+            except ValueError:
+                texts.append(None)
+                continue
+            if compiled.has_foreign_symbols:
+                texts.append(None)
+                continue
+            fut = submit_limit(compiled)
+            if not fut.done():
+                pending.append(fut)
+                texts.append(None)
+            else:
+                texts.append(fut.result().text if fut.result().status == OK else None)
+    return tuple(texts), pending
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def build_overlay_view(source_kind, inputs, n_min, n_max, view, log_x=False, clip_y=True, exact=None):
+    """
+    source_kind: "family" 면 inputs = (템플릿, 값 튜플), "list" 면 inputs = 식 튜플
+    exact: 수열별 기호 계산 극한 문자열 (모르면 None, workbench_exact_limits)
+    반환: (수열별 극한·수렴 속도 표, 그림)
+    """
+    import numpy as np
+    import pandas as pd
 
-    tail = arr[-10:]
-    std_tail = np.nanstd(tail)
-    mean_tail = np.nanmean(tail)
+    from seqlab.family import evaluate_family, evaluate_list
+    from seqlab.limits import round_limit
+    from seqlab.plotting import overlay_figure
+
+    if source_kind == "family":
+        result = evaluate_family(*inputs, n_min, n_max)
+    else:
+        result = evaluate_list(inputs, n_min, n_max)
+
+    exact = exact or (None,) * len(result.sources)
+    converges = [est.kind == CONVERGES for est in result.limits]
+    # 오차 자릿수로 반올림한 추정값 (오차 안에 0 이 있으면 0: 1/√n 의 꼬리값 1e-3 대신 0)
+    estimates = [round_limit(est.value, est.error) if ok else np.nan for est, ok in zip(result.limits, converges)]
+    with telemetry.span("dataframe"):
+        table = pd.DataFrame({
+            "수열": result.labels,
+            "식": result.sources,
+            "판정": [KIND_LABEL[est.kind] for est in result.limits],
+            "극한 추정": estimates,
+            "오차 ±": [est.error if ok else np.nan for est, ok in zip(result.limits, converges)],
+            "확신도": [CONFIDENCE_LABEL[est.confidence] if ok else "-" for est, ok in zip(result.limits, converges)],
+            "기호 계산 극한": [text if text is not None else "-" for text in exact],
+            "수렴 속도 p (|aₙ−L| ~ n⁻ᵖ)": [_rate_label(rate) for rate in result.rates],
+        })
+
+    if view == WORKBENCH_VIEWS[1]:
+        # 극한은 기호 계산 값을 먼저 쓰고, 없으면 확신도가 '낮음'이 아닌 수치 추정만 씁니다
+        # (꼬리값을 극한으로 잘못 잡으면 거리가 가짜로 0 에 붙습니다).
+        keep, chosen = [], []
+        for i, est in enumerate(result.limits):
+            value = _exact_value(exact[i])
+            if value is None and converges[i] and est.confidence != "low":
+                value = estimates[i]
+            if value is not None:
+                keep.append(i)
+                chosen.append(value)
+        limits = np.array(chosen)[:, None]
+        gaps = np.abs(result.values[keep] - limits) if keep else np.empty((0, len(result.ns)))
+        fig = overlay_figure(result.ns, [result.labels[i] for i in keep], gaps, log_x=True, log_y=True,
+                             y_title="|aₙ − L|", title="수렴하는 수열만: 극한과의 거리")
+        return table, fig
+
+    y_range = None
+    if clip_y:
+        # 발산하는 수열 하나가 축을 독차지하지 않도록, 유한한 값의 2% ~ 98% 구간에 여유를 두어 자릅니다.
+        finite = result.values[np.isfinite(result.values)]
+        if len(finite):
+            lo, hi = np.percentile(finite, [2, 98])
+            pad = 0.1 * (hi - lo) if hi > lo else 1.0
+            y_range = (float(lo - pad), float(hi + pad))
+    fig = overlay_figure(result.ns, result.labels, result.values, log_x=log_x, y_title="aₙ", y_range=y_range)
+    return table, fig
+
+
+# 유틸: 메모 칸은 고칠 때마다 기억해 두고, 반·이름을 적었으면 서버에도 저장합니다.
+# (다른 탐구 카테고리에 다녀오거나 서버가 다시 켜져도 내용이 돌아옵니다.)
+def current_identity():
+    return (st.session_state.get("class_id", "").strip(), st.session_state.get("student", "").strip())
+
+
+def remember_memo(key):
+    text = st.session_state.get(key, "")
+    st.session_state.setdefault("saved_memos", {})[key] = text
+    identity = current_identity()
+    if all(identity):
+        get_store().save_memo(*identity, PAGE_ID, key, text)
+
+
+def memo_field(label, key, widget=st.text_area, **kwargs):
+    saved = st.session_state.setdefault("saved_memos", {})
+    if key not in st.session_state and key in saved:
+        st.session_state[key] = saved[key]
+    return widget(label, key=key, on_change=remember_memo, args=(key,), **kwargs)
+
+
+# 유틸: 메모 칸은 그 칸만 다시 그립니다 (수열·그래프는 다시 계산하지 않음)
+@st.fragment
+@telemetry.traced(PAGE_ID, "memo_box")
+def memo_box(label, key, **kwargs):
+    return memo_field(label, key, **kwargs)
 
-    if np.any(np.abs(arr) > 1e6):
-        return "값이 매우 커지고 있습니다 → 발산 가능성이 큽니다."
-    if std_tail < 1e-3:
-        return f"꼬리 부분이 거의 변하지 않습니다 → 수렴할 가능성이 큽니다 (근사값 ≈ {mean_tail:.4f})"
-    if np.nanmean(np.abs(tail)) < 1e-2:
-        return f"0 근처에서 진동하거나 서서히 접근하는 것처럼 보입니다 (평균 ≈ {mean_tail:.4f})"
-    return "진동하거나 불규칙해 보입니다 → 극한이 존재하지 않을 수 있습니다."
 
 # 사이드바
 mode = st.sidebar.radio(
@@ -63,15 +434,57 @@ mode = st.sidebar.radio(
         "① 표현 실험실 (표·그래프)",
         "② 유사성 & 구조 (a, a')",
         "③ 연산 & 조건 (ab, a'b)",
-        "④ 반례 & 일반화 메모"
+        "④ 반례 & 일반화 메모",
+        "⑤ 여러 수열 겹쳐 보기 (워크벤치)",
     ]
 )
 
+# 반·이름 (스무고개 페이지와 함께 씀)
+for key in ("class_id", "student"):
+    # 다른 페이지에 다녀와도 입력한 값이 남도록 다시 적어 둡니다.
+    st.session_state[key] = st.session_state.get(key, "")
+st.sidebar.text_input("반", key="class_id", placeholder="예: 2-3", help="반·이름을 적으면 메모가 서버에 저장됩니다.")
+st.sidebar.text_input("이름(번호)", key="student", placeholder="예: 15 홍길동")
+if all(current_identity()) and st.session_state.get("memos_restored_for") != current_identity():
+    st.session_state.memos_restored_for = current_identity()
+    saved = st.session_state.setdefault("saved_memos", {})
+    for key, text in get_store().memos(*current_identity(), PAGE_ID).items():
+        saved.setdefault(key, text)
+
+# 관찰할 항의 범위 (④ 메모를 뺀 모든 모드 공통)
+N_MIN = 1
+N_MAX = 50
+LOG_X = False
+if not mode.startswith("④"):
+    N_MAX = int(
+        st.sidebar.number_input(
+            "n 최댓값 (몇 번째 항까지 볼까요?)",
+            min_value=10,
+            max_value=10**6,
+            value=50,
+            step=50,
+            help="범위를 넓혀도 이미 계산한 항은 다시 계산하지 않습니다. 그래프에는 모양을 지키는 점 약 2,000개만 그립니다."
+        )
+    )
+    LOG_X = st.sidebar.checkbox("n축 로그 스케일", help="n이 클 때 앞쪽과 먼 쪽의 모양을 함께 봅니다.")
+
+    # 캐시 상태를 보려면 seqlab.engine(sympy)을 불러와야 하므로 계산하는 모드에서만 보여 줍니다.
+    with st.sidebar.expander("⚙️ 계산 캐시 상태"):
+        from seqlab.engine import cache_stats
+
+        for cache_name, stats in cache_stats().items():
+            st.caption(
+                f"{cache_name}: 적중 {stats.hits} / 실패 {stats.misses} "
+                f"({stats.hit_rate:.0%}), 항목 {stats.entries}개, {stats.nbytes / 1024:.0f} KB"
+            )
+
 # =========================
 # ① 표현 실험실
 # =========================
 if mode == "① 표현 실험실 (표·그래프)":
     st.header("① 표현 실험실 : 표 · 그래프 · 식")
+    with telemetry.span("imports"):
+        from seqlab.engine import normalize_source
 
     st.markdown(
         """
@@ -83,33 +496,93 @@ if mode == "① 표현 실험실 (표·그래프)":
 
     expr_str = st.text_input("일반항 a(n)을 입력하세요 (예: 1/n, (-1)**n, (3*n+1)/(2*n-1))", value="1/n")
 
-    seq = generate_sequence(expr_str, 1, 50)
-    if seq is None:
-        st.error("수식을 해석할 수 없습니다. n을 포함한 올바른 수학식을 입력해 주세요.")
-        st.stop()
-
-    df = pd.DataFrame({"n": range(1, 51), "a_n": seq})
+    stream_mode = st.toggle(
+        "🚀 대용량 스트리밍 모드 (수억 항까지)",
+        help="항을 블록 단위로 계산하며 요약값만 남깁니다. ln(n), sin(n)처럼 아주 먼 곳에서야 드러나는 성질을 볼 때 쓰세요."
+    )
 
-    col1, col2 = st.columns(2)
-    with col1:
-        st.subheader("표(일부)")
-        st.dataframe(df.head(10), use_container_width=True)
-    with col2:
-        st.subheader("그래프")
-        fig = px.line(df, x="n", y="a_n", markers=True)
-        st.plotly_chart(fig, use_container_width=True)
+    if stream_mode:
+        n_stream = st.select_slider(
+            "몇 번째 항까지 흘려 볼까요?",
+            options=[10**6, 10**7, 10**8, 5 * 10**8],
+            value=10**7,
+            format_func=lambda v: f"{v:,}"
+        )
+        with telemetry.span("imports"):
+            import plotly.graph_objects as go
+
+            from seqlab.stream import summarize
+        bar = st.progress(0.0, text="블록 단위로 계산하는 중...")
+        try:
+            with telemetry.span("stream_summary"):
+                summary = summarize(
+                    expr_str, N_MIN, n_stream,
+                    progress=lambda done, total: bar.progress(done / total, text=f"{done:,} / {total:,} 항")
+                )
+        except ExpressionRejected as exc:
+            reject_expression(expr_str, exc)
+        except ValueError:
+            st.error("수식을 해석할 수 없습니다. n을 포함한 올바른 수학식을 입력해 주세요.")
+            st.stop()
+        bar.empty()
+
+        m1, m2, m3, m4 = st.columns(4)
+        m1.metric("최솟값", f"{summary.min:.6g}", help=f"n = {summary.argmin}")
+        m2.metric("최댓값", f"{summary.max:.6g}", help=f"n = {summary.argmax}")
+        m3.metric(f"꼬리 평균 (마지막 {len(summary.tail):,}항)", f"{summary.tail_mean:.6g}")
+        m4.metric("부호 변화 횟수", f"{summary.sign_changes:,}")
+        st.caption(
+            f"증가 {summary.increases:,}번 · 감소 {summary.decreases:,}번 "
+            f"→ 단조성 위반 {summary.monotone_violations:,}번, 계산 불가 항 {summary.nan_count:,}개"
+        )
+
+        env = summary.envelope()
+        fig = go.Figure([
+            go.Scattergl(x=env["n"], y=env["max"], mode="lines", line=dict(width=0), showlegend=False),
+            go.Scattergl(x=env["n"], y=env["min"], mode="lines", line=dict(width=0), fill="tonexty", name="구간 최소~최대"),
+            go.Scattergl(x=env["n"], y=env["mean"], mode="lines", name="구간 평균"),
+        ])
+        fig.update_layout(xaxis_title="n", yaxis_title="a_n")
+        if LOG_X:
+            fig.update_xaxes(type="log")
+        st.subheader("그래프 (구간별 최소·최대·평균)")
+        show_chart(fig)
+    else:
+        seq = generate_sequence(expr_str, N_MIN, N_MAX)
+        if seq is None:
+            st.error("수식을 해석할 수 없습니다. n을 포함한 올바른 수학식을 입력해 주세요.")
+            st.stop()
+
+        with telemetry.span("sequence_view"):
+            df_head, fig = build_sequence_view(normalize_source(expr_str), N_MIN, N_MAX, LOG_X)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.subheader("표(일부)")
+            with telemetry.span("st_dataframe"):
+                st.dataframe(df_head, use_container_width=True)
+        with col2:
+            st.subheader("그래프")
+            show_chart(fig)
 
     st.markdown("### 🧠 표현별 관찰 기록")
     st.write("- 같은 수열인데, **표**와 **그래프**에서 어떻게 다르게 느껴지나요?")
     st.write("- 이 수열이 **수렴/발산/진동**하는지, 표현마다 판단이 달라질까요?")
 
     st.markdown("#### 메모")
-    note = st.text_area("표 vs 그래프 비교해서 느낀 점을 적어보세요.")
-    if st.button("메모 저장(로컬에 복사해서 사용하세요)"):
-        st.success("이 텍스트 박스의 내용을 복사해 보고서나 활동지에 붙여넣으세요!")
+
+    @st.fragment
+    @telemetry.traced(PAGE_ID, "representation_memo")
+    def representation_memo():
+        memo_field("표 vs 그래프 비교해서 느낀 점을 적어보세요.", key="memo_repr")
+        if st.button("메모 저장(로컬에 복사해서 사용하세요)"):
+            st.success("이 텍스트 박스의 내용을 복사해 보고서나 활동지에 붙여넣으세요!")
+
+    representation_memo()
 
     st.markdown("#### 간단한 극한 직관 힌트")
-    st.info(rough_limit_hint(seq))
+    st.info(rough_limit_hint(summary if stream_mode else seq))
+    exact_limit_panel(expr_str)
 
 
 # =========================
@@ -117,6 +590,8 @@ if mode == "① 표현 실험실 (표·그래프)":
 # =========================
 elif mode == "② 유사성 & 구조 (a, a')":
     st.header("② 유사성 & 구조 : a와 a' 비교")
+    with telemetry.span("imports"):
+        from seqlab.engine import normalize_source
 
     st.markdown(
         """
@@ -126,51 +601,64 @@ elif mode == "② 유사성 & 구조 (a, a')":
     )
 
     expr_a = st.text_input("기본 수열 a(n)을 입력하세요", value="1/n")
-    seq_a = generate_sequence(expr_a, 1, 50)
+    seq_a = generate_sequence(expr_a, N_MIN, N_MAX)
     if seq_a is None:
         st.error("a(n) 수식을 해석할 수 없습니다.")
         st.stop()
 
-    transform = st.selectbox("a'(n) 생성 방식 선택", ["k배 하기: a' = k·a", "상수 더하기: a' = a + c"])
-    col_kc1, col_kc2 = st.columns(2)
-    with col_kc1:
-        k = st.number_input("k 값 (배수)", value=2.0)
-    with col_kc2:
-        c = st.number_input("c 값 (더하는 상수)", value=1.0)
-
-    if transform.startswith("k배"):
-        seq_ap = list(k * np.array(seq_a, dtype=float))
-        desc = f"a'(n) = {k} · a(n)"
-    else:
-        seq_ap = list(np.array(seq_a, dtype=float) + c)
-        desc = f"a'(n) = a(n) + {c}"
-
-    df2 = pd.DataFrame(
-        {
-            "n": range(1, 51),
-            "a_n": seq_a,
-            "a_n_prime": seq_ap
-        }
-    )
-
-    st.markdown(f"**생성된 a'(n):** {desc}")
-
-    fig2 = px.line(
-        df2,
-        x="n",
-        y=["a_n", "a_n_prime"],
-        markers=True,
-        labels={"value": "값", "variable": "수열"},
-        title="a(n) vs a'(n) 비교"
-    )
-    st.plotly_chart(fig2, use_container_width=True)
+    # k, c 를 바꿀 때는 이 부분만 다시 그립니다.
+    @st.fragment
+    @telemetry.traced(PAGE_ID, "similarity_panel")
+    def similarity_panel(expr_key):
+        transform = st.selectbox("a'(n) 생성 방식 선택", ["k배 하기: a' = k·a", "상수 더하기: a' = a + c"])
+        col_kc1, col_kc2 = st.columns(2)
+        with col_kc1:
+            k = st.number_input("k 값 (배수)", value=2.0)
+        with col_kc2:
+            c = st.number_input("c 값 (더하는 상수)", value=1.0)
+
+        with telemetry.span("similarity_view"):
+            desc, fig2 = build_similarity_view(expr_key, N_MIN, N_MAX, transform.startswith("k배"), k, c, LOG_X)
+        st.markdown(f"**생성된 a'(n):** {desc}")
+        show_chart(fig2)
+
+    similarity_panel(normalize_source(expr_a))
+
+    # k, c 를 하나씩 바꿔 보는 대신 격자 전체를 한 번에 훑어봅니다.
+    @st.fragment
+    @telemetry.traced(PAGE_ID, "sweep_panel")
+    def sweep_panel(expr_key):
+        if not st.toggle("🎛️ k·c 한꺼번에 훑어보기 (a' = k·a + c)", key="sweep_on"):
+            return
+        col_s1, col_s2, col_s3 = st.columns(3)
+        with col_s1:
+            k_range = st.slider("k 범위", -5.0, 5.0, (-2.0, 2.0), step=0.5, key="sweep_k")
+        with col_s2:
+            c_range = st.slider("c 범위", -5.0, 5.0, (-1.0, 1.0), step=0.5, key="sweep_c")
+        with col_s3:
+            steps = st.slider("격자 칸 수 (한 방향)", 5, 41, 21, step=2, key="sweep_steps")
+
+        with telemetry.span("sweep_view"):
+            result, heat, anim = build_sweep_view(expr_key, N_MIN, N_MAX, k_range, c_range, steps, LOG_X)
+        st.caption(
+            f"a(n) 자체: {KIND_LABEL[result.base.kind]}"
+            + (f" (극한 ≈ {result.base.value:.6g})" if result.base.kind == CONVERGES else "")
+            + f" · {steps}×{steps} 격자 × {N_MAX - N_MIN + 1:,}항을 한 번에 계산했습니다."
+        )
+        col_h, col_m = st.columns(2)
+        with col_h:
+            show_chart(heat)
+        with col_m:
+            show_chart(anim)
+
+    sweep_panel(normalize_source(expr_a))
 
     st.markdown("### 🧠 유사성에 대한 질문")
     st.write("- 그래프를 보았을 때, a와 a'가 **어떤 점에서 닮았다고** 말할 수 있나요?")
     st.write("- 두 수열의 **극한값**은 어떻게 될까요? 같을까요, 다를까요? 왜 그렇게 생각하나요?")
 
     st.markdown("#### 메모")
-    note2 = st.text_area("a와 a'의 유사성을 말로 설명해 보세요.")
+    memo_box("a와 a'의 유사성을 말로 설명해 보세요.", key="memo_similarity")
     st.caption("예: '두 수열은 모두 0으로 수렴하지만, a'는 항상 a보다 1만큼 크다.' 등")
 
 
@@ -179,6 +667,8 @@ elif mode == "② 유사성 & 구조 (a, a')":
 # =========================
 elif mode == "③ 연산 & 조건 (ab, a'b)":
     st.header("③ 연산 & 조건 : ab와 a'b 비교")
+    with telemetry.span("imports"):
+        from seqlab.engine import normalize_source
 
     st.markdown(
         """
@@ -193,62 +683,61 @@ elif mode == "③ 연산 & 조건 (ab, a'b)":
     with col_b:
         expr_b3 = st.text_input("b(n)을 입력하세요", value="n")
 
-    seq_a3 = generate_sequence(expr_a3, 1, 50)
-    seq_b3 = generate_sequence(expr_b3, 1, 50)
+    seq_a3 = generate_sequence(expr_a3, N_MIN, N_MAX)
+    seq_b3 = generate_sequence(expr_b3, N_MIN, N_MAX)
 
     if seq_a3 is None or seq_b3 is None:
         st.error("a(n) 또는 b(n) 수식을 해석할 수 없습니다.")
         st.stop()
 
-    # a' 생성
-    transform3 = st.selectbox("a'(n) 생성 방식", ["k배: a' = k·a", "상수 더하기: a' = a + c"], key="op_transform")
-    col_kc3a, col_kc3b = st.columns(2)
-    with col_kc3a:
-        k3 = st.number_input("k 값 (배수)", value=2.0, key="op_k")
-    with col_kc3b:
-        c3 = st.number_input("c 값 (상수)", value=1.0, key="op_c")
-
-    if transform3.startswith("k배"):
-        seq_ap3 = list(k3 * np.array(seq_a3, dtype=float))
-        desc3 = f"a'(n) = {k3} · a(n)"
-    else:
-        seq_ap3 = list(np.array(seq_a3, dtype=float) + c3)
-        desc3 = f"a'(n) = a(n) + {c3}"
-
-    # 곱 수열
-    arr_a3 = np.array(seq_a3, dtype=float)
-    arr_ap3 = np.array(seq_ap3, dtype=float)
-    arr_b3 = np.array(seq_b3, dtype=float)
-
-    ab = arr_a3 * arr_b3
-    apb = arr_ap3 * arr_b3
-
-    df3 = pd.DataFrame(
-        {
-            "n": range(1, 50 + 1),
-            "ab": ab,
-            "a'b": apb
-        }
-    )
-
-    st.markdown(f"**a'(n):** {desc3}")
-
-    st.subheader("ab vs a'b 그래프 비교")
-    fig3 = px.line(df3, x="n", y=["ab", "a'b"], labels={"value": "값", "variable": "수열"})
-    st.plotly_chart(fig3, use_container_width=True)
-
-    st.markdown("### 🧠 조건에 대한 질문")
-    st.write("- a와 a'가 '유사'하다고 해도, b가 발산하면 **ab와 a'b는 어떻게 달라질 수 있을까요?**")
-    st.write("- ab가 수렴한다고 해서 **항상 a와 b가 각각 수렴한다고 말할 수 있을까요?**")
-
-    st.markdown("#### ab에 대한 간단한 극한 힌트")
-    st.info("ab에 대한 직관: " + rough_limit_hint(ab))
-    st.markdown("#### a'b에 대한 간단한 극한 힌트")
-    st.info("a'b에 대한 직관: " + rough_limit_hint(apb))
+    # a' 생성 방식과 k, c 를 바꿀 때는 이 부분만 다시 그립니다.
+    @st.fragment
+    @telemetry.traced(PAGE_ID, "product_panel")
+    def product_panel(a_key, b_key):
+        transform3 = st.selectbox("a'(n) 생성 방식", ["k배: a' = k·a", "상수 더하기: a' = a + c"], key="op_transform")
+        col_kc3a, col_kc3b = st.columns(2)
+        with col_kc3a:
+            k3 = st.number_input("k 값 (배수)", value=2.0, key="op_k")
+        with col_kc3b:
+            c3 = st.number_input("c 값 (상수)", value=1.0, key="op_c")
+        use_k = transform3.startswith("k배")
+        extras = st.multiselect(
+            "함께 볼 수열 (선택)",
+            ["a/b", "a^b", "a∘b"],
+            key="op_extras",
+            help="a∘b 는 합성 a(b(n)) 입니다."
+        )
+
+        with telemetry.span("product_view"):
+            desc3, fig3, hint_ab, hint_apb = build_product_view(
+                a_key, b_key, N_MIN, N_MAX, use_k, k3, c3, tuple(extras), LOG_X
+            )
+
+        st.markdown(f"**a'(n):** {desc3}")
+
+        st.subheader("ab vs a'b 그래프 비교")
+        show_chart(fig3)
+
+        st.markdown("### 🧠 조건에 대한 질문")
+        st.write("- a와 a'가 '유사'하다고 해도, b가 발산하면 **ab와 a'b는 어떻게 달라질 수 있을까요?**")
+        st.write("- ab가 수렴한다고 해서 **항상 a와 b가 각각 수렴한다고 말할 수 있을까요?**")
+
+        st.markdown("#### ab에 대한 간단한 극한 힌트")
+        st.info("ab에 대한 직관: " + hint_ab)
+        exact_limit_panel(f"({a_key})*({b_key})", label="a(n)b(n)")
+        st.markdown("#### a'b에 대한 간단한 극한 힌트")
+        st.info("a'b에 대한 직관: " + hint_apb)
+        if use_k:
+            exact_limit_panel(f"{k3}*({a_key})*({b_key})", label="a'(n)b(n)")
+        else:
+            exact_limit_panel(f"(({a_key})+{c3})*({b_key})", label="a'(n)b(n)")
+
+    product_panel(normalize_source(expr_a3), normalize_source(expr_b3))
 
     st.markdown("#### 내 언어로 정리해 보기")
-    st.text_area(
+    memo_box(
         "위 상황에서 '연산의 안정성(조건부 성립)'에 대해 느낀 점을 적어보세요.",
+        key="memo_operation",
         placeholder="예: 'a와 a'는 닮았지만, b가 너무 빠르게 커지면 ab와 a'b의 거리가 함께 커진다.' 등"
     )
 
@@ -278,28 +767,122 @@ elif mode == "④ 반례 & 일반화 메모":
             "예: a(n) = 1/n,  a'(n) = (n+1)/(n^2) 등 (둘 다 0으로 가지만 패턴이 다름)"
     }
 
-    selected = st.selectbox("관심 있는 반례 유형을 선택하세요", list(examples.keys()))
-    st.markdown(f"**설명:** {examples[selected]}")
-
-    st.markdown("### 1) 이 반례가 깨뜨리는 '원리'는 무엇인가요?")
-    wrong_rule = st.text_input("예: 'ab가 수렴하면 a와 b도 수렴한다' 등")
+    # 글을 쓰는 동안에는 이 메모 영역만 다시 그립니다.
+    @st.fragment
+    @telemetry.traced(PAGE_ID, "counterexample_notes")
+    def counterexample_notes():
+        selected = st.selectbox("관심 있는 반례 유형을 선택하세요", list(examples.keys()))
+        st.markdown(f"**설명:** {examples[selected]}")
+
+        st.markdown("### 1) 이 반례가 깨뜨리는 '원리'는 무엇인가요?")
+        wrong_rule = memo_field("예: 'ab가 수렴하면 a와 b도 수렴한다' 등", key="memo_wrong_rule", widget=st.text_input)
+
+        st.markdown("### 2) 이 반례를 막기 위해 어떤 조건이 필요할까요?")
+        cond_text = memo_field("조건을 덧붙여 문장을 다시 써보세요.", key="memo_condition")
+
+        st.markdown("### 3) 더 이상 깨지지 않는 '일반화 문장' 만들기")
+        generalization = memo_field(
+            "조건을 포함한 '최종 원리'를 한 문장으로 써보세요.",
+            key="memo_generalization",
+            placeholder="예: '두 수열 a, b가 모두 수렴하고, 그 극한 중 하나가 0이 아니면, 곱의 극한은 각 극한의 곱과 같다.'"
+        )
+
+        st.markdown("---")
+        st.markdown("#### ✍️ 정리용 복사본")
+        st.write("아래 내용을 복사해서 활동지/보고서에 활용할 수 있습니다.")
+        st.code(
+            f"[반례 유형]\n{selected}\n\n"
+            f"[깨지는 원리]\n{wrong_rule}\n\n"
+            f"[필요 조건]\n{cond_text}\n\n"
+            f"[최종 일반화 문장]\n{generalization}",
+            language="text"
+        )
+
+    counterexample_notes()
+
+    # 모든 학생의 메모·일반화 문장을 한꺼번에 내려받습니다 (seqlab.export, 교사 암호가 있어야 열림).
+    export_panel(PAGE_ID, tables=("memos", "rounds", "events"), wide=True)
 
-    st.markdown("### 2) 이 반례를 막기 위해 어떤 조건이 필요할까요?")
-    cond_text = st.text_area("조건을 덧붙여 문장을 다시 써보세요.")
+# =========================
+# ⑤ 여러 수열 겹쳐 보기
+# =========================
+elif mode == "⑤ 여러 수열 겹쳐 보기 (워크벤치)":
+    st.header("⑤ 여러 수열 겹쳐 보기 : 수렴의 빠르기 비교")
+    with telemetry.span("imports"):
+        from seqlab.family import family_members, parse_list, parse_values
 
-    st.markdown("### 3) 더 이상 깨지지 않는 '일반화 문장' 만들기")
-    generalization = st.text_area(
-        "조건을 포함한 '최종 원리'를 한 문장으로 써보세요.",
-        placeholder="예: '두 수열 a, b가 모두 수렴하고, 그 극한 중 하나가 0이 아니면, 곱의 극한은 각 극한의 곱과 같다.'"
+    st.markdown(
+        """
+        - **목표**: `1/n^p` 같은 수열 가족이나 반례 수열들을 **한 그래프에 겹쳐**,  
+          어떤 수열이 더 빨리 극한에 다가가는지, 무엇이 수렴과 발산을 가르는지 함께 이야기합니다.
+        - 수열이 수십 개여도 한 번에 계산하고 그림 하나로 그리므로, 늘려도 느려지지 않습니다.
+        """
     )
 
-    st.markdown("---")
-    st.markdown("#### ✍️ 정리용 복사본")
-    st.write("아래 내용을 복사해서 활동지/보고서에 활용할 수 있습니다.")
-    st.code(
-        f"[반례 유형]\n{selected}\n\n"
-        f"[깨지는 원리]\n{wrong_rule}\n\n"
-        f"[필요 조건]\n{cond_text}\n\n"
-        f"[최종 일반화 문장]\n{generalization}",
-        language="text"
+    source_kind = st.radio("수열 고르기", ["매개변수 가족", "식 목록"], horizontal=True, key="wb_kind")
+    try:
+        if source_kind == "매개변수 가족":
+            col_t, col_v = st.columns(2)
+            template = col_t.text_input(
+                "일반항 (n 과 매개변수 하나)", value="1/n**p", key="wb_template", help="예: 1/n**p, r**n, (1+p/n)**n"
+            )
+            values_text = col_v.text_input(
+                "매개변수 값 (시작:끝:간격 또는 1, 2, 3)", value="0.5:3:0.25", key="wb_values",
+                help="예: 0.5:3:0.25 → 0.5, 0.75, ..., 3"
+            )
+            kind_key, inputs = "family", (template, parse_values(values_text))
+            shown = template
+        else:
+            list_text = st.text_area(
+                "식 목록 (한 줄에 하나)", value=COUNTEREXAMPLE_SEQUENCES, height=180, key="wb_list",
+                help="기본값은 ④ 반례 카드에 나오는 수열들입니다. # 뒤는 주석입니다."
+            )
+            kind_key, inputs = "list", parse_list(list_text)
+            shown = ", ".join(inputs)
+            if not inputs:
+                st.info("식을 한 줄에 하나씩 적어 주세요.")
+                st.stop()
+    except ValueError as exc:
+        st.error(str(exc))
+        st.stop()
+
+    col_view, col_clip = st.columns([3, 1])
+    view = col_view.radio("보기", WORKBENCH_VIEWS, horizontal=True, key="wb_view")
+    clip_y = col_clip.checkbox("y축 자르기", value=True, key="wb_clip", help="발산하는 수열이 축을 독차지하지 않게 합니다.")
+
+    try:
+        sources = family_members(*inputs)[2] if kind_key == "family" else inputs
+        exact, exact_pending = workbench_exact_limits(sources)
+        with telemetry.span("overlay_view"):
+            table, fig = build_overlay_view(kind_key, inputs, N_MIN, N_MAX, view, LOG_X, clip_y, exact)
+    except ExpressionRejected as exc:
+        reject_expression(shown, exc)
+    except ValueError:
+        st.error("수식을 해석할 수 없습니다. n(과 매개변수)을 포함한 올바른 수학식을 입력해 주세요.")
+        st.stop()
+
+    show_chart(fig)
+    st.subheader("수열별 극한 추정과 수렴 속도")
+    with telemetry.span("st_dataframe"):
+        st.dataframe(table, use_container_width=True, hide_index=True)
+    st.caption(
+        "극한 추정은 오차 자릿수까지 반올림한 수치 추정입니다 (오차 안에 0 이 있으면 0). "
+        "극한과의 거리 그림은 기호 계산 극한을, 없으면 확신도가 보통 이상인 추정만 씁니다. "
+        "수렴 속도 p 는 꼬리 항에서 |aₙ − L| 이 n⁻ᵖ 처럼 줄어드는 빠르기를 잰 값입니다 (클수록 빠름)."
+    )
+    if exact_pending:
+        @st.fragment(run_every=0.5)
+        def _wait_for_exact_limits():
+            if all(fut.done() for fut in exact_pending):
+                st.rerun()
+            st.caption(f"⏳ 기호 계산 극한 {len(exact_pending)}개를 구하는 중입니다...")
+
+        _wait_for_exact_limits()
+
+    memo_box(
+        "여러 수열을 겹쳐 보며 알게 된 점을 적어 보세요.",
+        key="memo_workbench",
+        placeholder="예: 'p가 1보다 크면 1/n^p는 1/n보다 훨씬 빨리 0에 다가간다.' 등"
     )
+
+telemetry.end_rerun()
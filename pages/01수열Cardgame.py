@@ -1,23 +1,52 @@
 import streamlit as st
 import streamlit.components.v1 as components
 
+from seqlab import core, telemetry
+from seqlab.bundle import load_bundle
+from seqlab.decks import embed_deck, load_deck
+
+telemetry.begin_rerun("cardgame")
+# 이 서버 프로세스에서 처음이면 계산 페이지가 쓸 모듈·캐시를 뒤에서 미리 데웁니다.
+core.warm_up()
+
 st.title("🧩 Limit Trinity - 수열 매칭 놀이")
 
-st.markdown(
-    """
-    ⚠️ **만일 이 자리에서 화면이 드러나지 아니하거든,  
-    아래에 적힌 바른 길을 밟아 곧장 나아가시옵소서.**  
+GAME_URL = "https://hamama11.github.io/boostcamp/limit.html"
+
+# 미리 만든 CSS·Chart.js 를 넣은 limt.html (python -m seqlab.bundle build) 을 바깥 연결 없이 띄웁니다.
+# 정적 파일 제공을 켜 두었으면 CSS·JS 는 해시 붙은 파일로 내보내 브라우저가 캐시합니다.
+with telemetry.span("bundle"):
+    bundle = load_bundle(static=bool(st.get_option("server.enableStaticServing")))
+
+if bundle is not None:
+    # 카드 묶음(표 값·그래프 점)은 서버가 계산해 디스크에 캐시해 두고(seqlab.decks), 페이지에 넣어 보냅니다.
+    # 같은 묶음이면 HTML 이 그대로라 다시 실행해도 iframe 을 새로 읽지 않습니다.
+    if st.button("🔀 새 카드 묶음", help="카탈로그에서 다른 수열들을 뽑아 라운드를 새로 꾸립니다."):
+        st.session_state.deck_seed = st.session_state.get("deck_seed", 0) + 1
+    with telemetry.span("deck"):
+        deck = load_deck(seed=st.session_state.get("deck_seed", 0))
+        page_html = embed_deck(bundle.html, deck)
+    telemetry.payload("limit_html", len(page_html.encode("utf-8")))
+    components.html(page_html, width=1200, height=2200, scrolling=True)
+else:
+    # 묶음을 아직 만들지 않은 서버에서는 예전처럼 바깥 페이지를 띄웁니다.
+    st.markdown(
+        f"""
+        ⚠️ **만일 이 자리에서 화면이 드러나지 아니하거든,  
+        아래에 적힌 바른 길을 밟아 곧장 나아가시옵소서.**  
+
+        👉 [hamama11.github.io/boostcamp/limit.html]({GAME_URL})
 
-    👉 [hamama11.github.io/boostcamp/limit.html](https://hamama11.github.io/boostcamp/limit.html)
+        **배움의 도(道)는 잠시 가려질지언정 끊어지지 아니하나니, 뜻을 세운 이라면 기필코 확인하여 탐구를 이어가시기 바라옵니다.**
+        """,
+        unsafe_allow_html=True
+    )
 
-    **배움의 도(道)는 잠시 가려질지언정 끊어지지 아니하나니, 뜻을 세운 이라면 기필코 확인하여 탐구를 이어가시기 바라옵니다.**
-    """,
-    unsafe_allow_html=True
-)
+    components.iframe(
+        src=GAME_URL,
+        width=1200,
+        height=2200,
+        scrolling=True
+    )
 
-components.iframe(
-    src="https://hamama11.github.io/boostcamp/limit.html",
-    width=1200,
-    height=2200,
-    scrolling=True
-)
+telemetry.end_rerun()
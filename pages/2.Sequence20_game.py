@@ -1,8 +1,19 @@
 # -*- coding: utf-8 -*-
 import streamlit as st
 import numpy as np
-import pandas as pd
-import plotly.express as px
+
+# pandas·plotly·sympy 는 표·그림·기본 수열을 처음 만들 때 그 함수 안에서 불러옵니다.
+from seqlab import core, telemetry
+from seqlab.advisor import PropertyIndex, plan_exact, rank_questions
+from seqlab.catalog import open_catalog
+from seqlab.export import export_panel
+from seqlab.store import RoundRecord, get_store
+
+PAGE_ID = "sequence20"
+# 이 rerun 에서 어디에 시간이 드는지 잽니다 (seqlab.telemetry, 맨 아래에서 끝냄).
+telemetry.begin_rerun(PAGE_ID)
+# 이 서버 프로세스에서 처음이면 무거운 모듈·캐시를 뒤에서 미리 데웁니다.
+core.warm_up()
 
 st.title("🎮 수열 스무고개 : 조건으로 추론하라")
 
@@ -34,116 +45,60 @@ st.markdown(
 # -----------------------------
 # 0. 숨겨진 수열 데이터 준비
 # -----------------------------
-SEQUENCES = [
-    {
-        "name": "1/n",
-        "expr": r"a_n = 1/n",
-        "preview_n": 40,
-        "seq": lambda n: 1 / n,
-        "convergent": True,
-        "limit_value": 0.0,
-        "bounded": True,
-        "monotone": True,         # n>=1에서 단조 감소
-        "sign_changes": False,
-        "n_times_conv": True,     # n*a_n = 1 → 수렴
-        "abs_conv": True,         # |a_n| = 1/n → 0으로 수렴
-        "piecewise2": False,
-        "even_subseq_conv": True,     # a_{2n} = 1/(2n) → 0
-        "odd_subseq_conv": True,      # a_{2n-1} = 1/(2n-1) → 0
-        "with_1_over_n_conv": True,   # a_n * (1/n) = 1/n^2 → 0
-        "explain": "a_n = 1/n 은 단조 감소하며 유계인 수열로, 0으로 수렴하옵니다."
-    },
-    {
-        "name": "(-1)^n",
-        "expr": r"a_n = (-1)^n",
-        "preview_n": 20,
-        "seq": lambda n: (-1) ** n,
-        "convergent": False,
-        "limit_value": None,
-        "bounded": True,
-        "monotone": False,
-        "sign_changes": True,
-        "n_times_conv": False,        # n*a_n = ±n → 발산
-        "abs_conv": False,            # |a_n| = 1 → 상수이나 '극한 구조' 비교용으로 비수렴 처리
-        "piecewise2": True,
-        "even_subseq_conv": True,     # a_{2n} = 1
-        "odd_subseq_conv": True,      # a_{2n-1} = -1
-        "with_1_over_n_conv": True,   # (-1)^n / n → 0
-        "explain": "a_n = (-1)^n 은 두 값 사이를 오르내리며 진동하므로, 한 점으로 모이지는 않사옵니다."
-    },
-    {
-        "name": "n",
-        "expr": r"a_n = n",
-        "preview_n": 20,
-        "seq": lambda n: n,
-        "convergent": False,
-        "limit_value": None,
-        "bounded": False,
-        "monotone": True,
-        "sign_changes": False,
-        "n_times_conv": False,        # n^2 → 발산
-        "abs_conv": False,
-        "piecewise2": False,
-        "even_subseq_conv": False,    # 2n → 발산
-        "odd_subseq_conv": False,     # 2n-1 → 발산
-        "with_1_over_n_conv": True,   # n * (1/n) = 1 → 수렴
-        "explain": "a_n = n 은 끝없이 자라나 위로 유계가 아니므로, 극한이 존재하지 않사옵니다."
-    },
-    {
-        "name": "(-1)^n / n",
-        "expr": r"a_n = (-1)^n / n",
-        "preview_n": 60,
-        "seq": lambda n: (-1) ** n / n,
-        "convergent": True,
-        "limit_value": 0.0,
-        "bounded": True,
-        "monotone": False,
-        "sign_changes": True,
-        "n_times_conv": False,        # (-1)^n → 진동
-        "abs_conv": True,             # |a_n| = 1/n → 0
-        "piecewise2": True,
-        "even_subseq_conv": True,     # 1/(2n) → 0
-        "odd_subseq_conv": True,      # -1/(2n-1) → 0
-        "with_1_over_n_conv": True,   # (-1)^n / n^2 → 0
-        "explain": "a_n = (-1)^n / n 은 부호는 번갈아 바뀌되, 크기가 줄어들어 마침내 0으로 모이옵니다."
-    },
-    {
-        "name": "ln(n)",
-        "expr": r"a_n = \\ln n",
-        "preview_n": 40,
-        "seq": lambda n: np.log(n),
-        "convergent": False,
-        "limit_value": None,
-        "bounded": False,
-        "monotone": True,
-        "sign_changes": False,
-        "n_times_conv": False,        # n ln n → 발산
-        "abs_conv": False,
-        "piecewise2": False,
-        "even_subseq_conv": False,    # ln(2n) → ∞
-        "odd_subseq_conv": False,     # ln(2n-1) → ∞
-        "with_1_over_n_conv": True,   # (ln n)/n → 0
-        "explain": "a_n = \\ln n 은 더디게 오르나, 끝내 멈추지 않고 발산하옵니다."
-    },
-    {
-        "name": "sin(n)",
-        "expr": r"a_n = \\sin n",
-        "preview_n": 60,
-        "seq": lambda n: np.sin(n),
-        "convergent": False,
-        "limit_value": None,
-        "bounded": True,
-        "monotone": False,
-        "sign_changes": True,
-        "n_times_conv": False,        # n sin n → 일반적으로 발산
-        "abs_conv": False,
-        "piecewise2": False,
-        "even_subseq_conv": False,    # sin(2n) 진동
-        "odd_subseq_conv": False,     # sin(2n-1) 진동
-        "with_1_over_n_conv": True,   # sin n / n → 0
-        "explain": "a_n = \\sin n 은 -1과 1 사이를 복잡히 오가며, 한 점으로 모이지 않사옵니다."
-    },
-]
+# 항목 하나 = (일반항, 미리 보여 줄 항 수, 해설) 한 줄
+# 질문의 답(수렴·유계·단조 등)과 극한값은 식에서 자동으로 구합니다 (seqlab.properties).
+@st.cache_resource(show_spinner="숨겨진 수열들의 성질을 따져 보는 중이옵니다...")
+def build_sequences(specs):
+    from seqlab.properties import catalog_entry
+
+    return [catalog_entry(expr, preview_n, explain) for expr, preview_n, explain in specs]
+
+
+SEQUENCE_SPECS = (
+    ("1/n", 40, "a_n = 1/n 은 단조 감소하며 유계인 수열로, 0으로 수렴하옵니다."),
+    ("(-1)**n", 20, "a_n = (-1)^n 은 두 값 사이를 오르내리며 진동하므로, 한 점으로 모이지는 않사옵니다."),
+    ("n", 20, "a_n = n 은 끝없이 자라나 위로 유계가 아니므로, 극한이 존재하지 않사옵니다."),
+    ("(-1)**n/n", 60, "a_n = (-1)^n / n 은 부호는 번갈아 바뀌되, 크기가 줄어들어 마침내 0으로 모이옵니다."),
+    ("log(n)", 40, "a_n = \\ln n 은 더디게 오르나, 끝내 멈추지 않고 발산하옵니다."),
+    ("sin(n)", 60, "a_n = \\sin n 은 -1과 1 사이를 복잡히 오가며, 한 점으로 모이지 않사옵니다."),
+)
+
+
+# 미리 만들어 둔 카탈로그 파일(python -m seqlab.catalog build)이 있으면 그 수천 개 가운데서 뽑고,
+# 없으면 위의 기본 수열들을 씁니다. 파일은 메모리 맵으로 열어 모든 세션이 함께 쓰며, 뽑힌 항목만 읽습니다.
+@st.cache_resource(show_spinner=False)
+def load_deck():
+    catalog = open_catalog()
+    if catalog is not None and len(catalog):
+        return catalog
+    return build_sequences(SEQUENCE_SPECS)
+
+
+DECK = load_deck()
+
+
+# 후보 좁히기용 비트셋 색인 (덱과 함께 프로세스당 한 번)
+@st.cache_resource(show_spinner=False)
+def load_index():
+    return PropertyIndex.from_deck(load_deck())
+
+
+INDEX = load_index()
+
+
+# 뽑힌 수열마다 항목·표·그래프를 한 번만 만들어 모든 세션이 함께 씁니다.
+# (질문 고르기·판단 입력 등으로 다시 실행될 때는 만들어 둔 것을 그대로 내보냄)
+@st.cache_resource(show_spinner=False, max_entries=4096)
+def round_view(idx):
+    import pandas as pd
+
+    from seqlab.plotting import line_figure
+
+    entry = DECK[idx]
+    n_values = np.arange(1, entry["preview_n"] + 1)
+    a_values = np.asarray(entry["preview"][:entry["preview_n"]], dtype=float)
+    table = pd.DataFrame({"n": n_values, "a_n": a_values}).head(10)
+    return entry, table, line_figure(n_values, {"a_n": a_values})
 
 # -----------------------------
 # 질문 목록 정의
@@ -177,6 +132,44 @@ if "q_count" not in st.session_state:
     st.session_state.q_count = 0
 if "show_answer" not in st.session_state:
     st.session_state.show_answer = False
+if "round_no" not in st.session_state:
+    st.session_state.round_no = 0
+st.session_state.setdefault("verdict", "아직 판단을 미루겠다")
+
+# 반·이름을 적으면 진행 상황이 서버에 저장되어, 새로 고치거나 서버가 다시 켜져도 이어서 할 수 있사옵니다.
+for key in ("class_id", "student"):
+    # 다른 페이지에 다녀와도 입력한 값이 남도록 다시 적어 둡니다.
+    st.session_state[key] = st.session_state.get(key, "")
+st.sidebar.text_input("반", key="class_id", placeholder="예: 2-3")
+st.sidebar.text_input("이름(번호)", key="student", placeholder="예: 15 홍길동")
+identity = (st.session_state.class_id.strip(), st.session_state.student.strip())
+store = get_store() if all(identity) else None
+
+if store is not None and st.session_state.get("sequence20_restored_for") != identity:
+    st.session_state.sequence20_restored_for = identity
+    record = store.latest_round(*identity, PAGE_ID)
+    if record is not None:
+        st.session_state.round_no = record.round_no
+        st.session_state.seq_idx = record.seq_idx
+        st.session_state.asked = dict(record.asked)
+        st.session_state.q_count = record.q_count
+        st.session_state.show_answer = record.show_answer
+        st.session_state.verdict = record.verdict or "아직 판단을 미루겠다"
+        st.session_state.guess_limit = record.guess
+        st.session_state.reason = record.reason
+        st.session_state.saved_round = record
+
+
+# 모든 학생의 라운드·판단·근거를 한꺼번에 내려받습니다 (seqlab.export, 교사 암호가 있어야 열림).
+# 라운드를 열지 않아도 쓸 수 있게 사이드바에 둡니다.
+with st.sidebar:
+    export_panel(PAGE_ID)
+
+
+def log_event(kind, **payload):
+    if store is not None:
+        store.log_event(*identity, PAGE_ID, kind, st.session_state.round_no, **payload)
+
 
 # -----------------------------
 # 2. 새 라운드 시작 버튼
@@ -184,43 +177,42 @@ if "show_answer" not in st.session_state:
 col_new, col_info = st.columns([1, 3])
 with col_new:
     if st.button("🔄 새 라운드 다시 여는가"):
-        st.session_state.seq_idx = int(np.random.randint(0, len(SEQUENCES)))
+        st.session_state.seq_idx = int(np.random.randint(0, len(DECK)))
         st.session_state.asked = {}
         st.session_state.q_count = 0
         st.session_state.show_answer = False
+        st.session_state.round_no += 1
+        log_event("round_start", seq_idx=st.session_state.seq_idx)
 
 with col_info:
     if st.session_state.seq_idx is None:
-        st.info("👉 먼저 **'새 라운드 다시 여는가'** 버튼을 눌러, 한 수열을 뽑아 보시옵소서.")
+        st.info(f"👉 먼저 **'새 라운드 다시 여는가'** 버튼을 눌러, 숨은 수열 {len(DECK):,}개 가운데 하나를 뽑아 보시옵소서.")
     else:
         st.success("이제 질문을 골라 던지며, 감추어진 수열의 속내를 밝혀 보시옵소서.")
 
-if st.session_state.seq_idx is None:
+if st.session_state.seq_idx is None or st.session_state.seq_idx >= len(DECK):
+    telemetry.end_rerun()
     st.stop()
 
-seq_data = SEQUENCES[st.session_state.seq_idx]
+with telemetry.span("round_view"):
+    seq_data, preview_table, preview_fig = round_view(st.session_state.seq_idx)
 
 # -----------------------------
 # 3. 표 & 그래프 (초기 정보)
 # -----------------------------
 st.markdown("## 1️⃣ 드러나 있는 단서 : 앞부분 표와 그래프")
 
-N_PREVIEW = seq_data["preview_n"]
-n_values = np.arange(1, N_PREVIEW + 1)
-a_values = np.array([seq_data["seq"](k) for k in n_values], dtype=float)
-
-df = pd.DataFrame({"n": n_values, "a_n": a_values})
-
 col_table, col_plot = st.columns(2)
 with col_table:
     st.subheader("표 (일부 항)")
-    st.dataframe(df.head(10), use_container_width=True)
+    with telemetry.span("st_dataframe"):
+        st.dataframe(preview_table, use_container_width=True)
     st.caption("※ 출제자는 뒤에 어떤 일이 기다리는지 알지만, 질문자는 이 앞부분만 보고 추론하여야 하옵니다.")
 
 with col_plot:
     st.subheader("그래프")
-    fig = px.line(df, x="n", y="a_n", markers=True)
-    st.plotly_chart(fig, use_container_width=True)
+    with telemetry.span("plotly_chart"):
+        st.plotly_chart(preview_fig, use_container_width=True)
 
 st.markdown("---")
 
@@ -254,6 +246,7 @@ else:
             ans = seq_data[q_key]  # True / False / None
             st.session_state.asked[q_key] = ans
             st.session_state.q_count += 1
+            log_event("question", key=q_key, answer=ans)
 
 # 이미 물어본 질문과 답 요약
 if st.session_state.asked:
@@ -268,6 +261,38 @@ if st.session_state.asked:
             txt = "판단 불가 (미리 정해 두지 아니하였음)"
         st.write(f"- **{label}** ➜ **{txt}**")
 
+# 지금까지의 답만으로 후보를 좁히고, 다음 질문을 권합니다 (숨은 수열 자체는 보지 않음).
+with st.expander("🧭 질문 참모 : 남은 후보와 다음 질문 권하기 (교사용)"):
+    question_keys = [key for key, _ in QUESTIONS]
+    with telemetry.span("rank_questions"):
+        total, scores = rank_questions(INDEX, st.session_state.asked, question_keys)
+    st.write(f"- 지금까지의 답과 어긋나지 않는 수열 : **{total:,}개** / 전체 {INDEX.size:,}개")
+    if scores:
+        import pandas as pd
+
+        st.dataframe(
+            pd.DataFrame({
+                "질문": [dict(QUESTIONS)[s.key].replace("**", "") for s in scores],
+                "예": [s.yes for s in scores],
+                "아니오": [s.no for s in scores],
+                "기대 정보량(비트)": [round(s.gain, 3) for s in scores],
+            }),
+            use_container_width=True,
+            hide_index=True,
+        )
+    budget = MAX_QUESTIONS - st.session_state.q_count
+    if scores and budget > 0 and st.checkbox(f"남은 {budget}번 안에서 가장 좋은 질문 순서를 끝까지 따져 보기"):
+        with telemetry.span("plan_exact"):
+            plan = plan_exact(INDEX, st.session_state.asked, budget, question_keys)
+        if plan.question is None:
+            st.write("- 더 물어도 후보를 가를 수 없사옵니다.")
+        else:
+            st.write(f"- 다음으로 물을 질문 ➜ {dict(QUESTIONS)[plan.question]}")
+            st.write(
+                f"- 이 전략으로는 평균 **{plan.questions:.2f}번** 더 묻고, "
+                f"끝에 남는 불확실성은 평균 **{plan.entropy:.2f}비트**이옵니다."
+            )
+
 st.markdown("---")
 
 # -----------------------------
@@ -280,17 +305,18 @@ with col_judge1:
     verdict = st.radio(
         "이 수열의 운명은 어떠하다고 보시는가?",
         ["수렴한다", "발산한다", "아직 판단을 미루겠다"],
-        index=2
+        key="verdict",
     )
 with col_judge2:
     guess_limit = st.text_input(
         "수렴한다고 본다면, 그 극한값은 무엇이라 여기시는가? (모르겠다면 비워 두어도 좋사옵니다.)",
-        value=""
+        key="guess_limit",
     )
 
 reason = st.text_area(
     "어찌하여 그러한 결론에 이르렀는지, 그 근거를 적어 보시옵소서.",
-    placeholder="예: 표를 보니 점점 줄어드는 듯하고, 유계·단조라는 답을 얻었으므로 0으로 수렴한다고 판단하였음 등"
+    placeholder="예: 표를 보니 점점 줄어드는 듯하고, 유계·단조라는 답을 얻었으므로 0으로 수렴한다고 판단하였음 등",
+    key="reason",
 )
 
 st.markdown("---")
@@ -300,6 +326,7 @@ st.markdown("---")
 # -----------------------------
 if st.button("📢 이제 정답을 드러낼 것인가"):
     st.session_state.show_answer = True
+    log_event("reveal", verdict=verdict, guess=guess_limit)
 
 if st.session_state.show_answer:
     st.markdown("## ✅ 정답과 해설")
@@ -328,3 +355,24 @@ if st.session_state.show_answer:
     st.write("- 방금 던졌던 질문들 가운데, **가장 결정적인 질문**은 어느 것이었사온지?")
     st.write("- 지금 돌이켜 보면, **굳이 물을 필요가 없었던 질문**은 무엇이었사온지?")
     st.write("- 다시 한 번 같은 수열을 출제한다면, 그대는 **어떤 순서로 질문을 배치**하겠는가?")
+
+# -----------------------------
+# 7. 진행 상황 저장 (바뀐 것이 있을 때만, 디스크는 기다리지 않음)
+# -----------------------------
+if store is not None:
+    record = RoundRecord(
+        *identity, PAGE_ID,
+        round_no=st.session_state.round_no,
+        seq_idx=st.session_state.seq_idx,
+        asked=tuple(st.session_state.asked.items()),
+        q_count=st.session_state.q_count,
+        show_answer=st.session_state.show_answer,
+        verdict=verdict,
+        guess=guess_limit,
+        reason=reason,
+    )
+    if record != st.session_state.get("saved_round"):
+        store.save_round(record)
+        st.session_state.saved_round = record
+
+telemetry.end_rerun()
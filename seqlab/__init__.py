@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+"""
+seqlab: 수열 탐구 페이지들이 함께 쓰는 계산 모듈 모음
+"""
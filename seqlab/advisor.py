@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+스무고개 후보 좁히기와 질문 참모
+
+- PropertyIndex: 수열 × 성질 비트 행렬을 성질마다 uint64 단어로 묶어(packed) 둡니다.
+  지금까지의 예/아니오 답에 맞는 후보 집합은 질문 수만큼의 AND 로 구하고,
+  후보 수는 popcount 로 셉니다. (수열 10만 개 = 성질 하나에 1,563 단어)
+- rank_questions: 남은 질문마다 예/아니오로 갈리는 후보 수와 기대 정보량(비트, 탐욕 엔트로피)
+- plan_exact: 남은 질문 수 안에서 기대 잔여 엔트로피가 가장 작은 결정 트리 (정확 계산)
+  답은 성질 비트로만 정해지므로 같은 비트 무늬의 수열은 한 덩어리(개수)로 보고,
+  무늬가 최대 2^10 = 1,024 가지라 카탈로그 크기와 무관하게 빠릅니다.
+"""
+import math
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from seqlab.cache import LRUCache
+from seqlab.core import PROPERTY_KEYS
+
+# (후보 무늬, 개수, 질문들, 남은 질문 수) → 결정 트리
+PLAN_CACHE = LRUCache(max_entries=256)
+
+_POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.int64)
+# 확률 비교 허용 오차
+_EPS = 1e-12
+
+
+def popcount(words):
+    """uint64 배열의 마지막 축에서 켜진 비트 수"""
+    words = np.ascontiguousarray(words, dtype=np.uint64)
+    if hasattr(np, "bitwise_count"):  # numpy 2.0 이상
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+    return _POPCOUNT8[words.view(np.uint8)].sum(axis=-1)
+
+
+def _pack(rows):
+    """bool 행렬 (행, 수열) → uint64 단어 행렬 (행, 단어), 비트 순서는 수열 번호 순"""
+    packed = np.packbits(rows, axis=-1, bitorder="little")
+    pad = -packed.shape[-1] % 8
+    if pad:
+        packed = np.pad(packed, [(0, 0)] * (packed.ndim - 1) + [(0, pad)])
+    return np.ascontiguousarray(packed).view("<u8")
+
+
+def property_codes(deck, keys=PROPERTY_KEYS):
+    """스무고개 항목 목록 또는 seqlab.catalog.Catalog → 수열마다 성질 비트(keys 순서)"""
+    columns = getattr(deck, "columns", None)
+    if columns is not None and list(deck.header["properties"]) == list(keys):
+        return np.asarray(columns["bits"], dtype=np.uint16)
+    return np.array(
+        [sum(1 << j for j, key in enumerate(keys) if deck[i][key]) for i in range(len(deck))],
+        dtype=np.uint16,
+    )
+
+
+class PropertyIndex:
+    """
+    수열 × 성질 비트 행렬 (성질마다 묶은 비트셋)
+    codes: 수열마다 성질 비트 (j번째 비트 = keys[j] 가 참)
+    """
+
+    def __init__(self, codes, keys=PROPERTY_KEYS):
+        self.keys = tuple(keys)
+        self.position = {key: j for j, key in enumerate(self.keys)}
+        self.codes = np.asarray(codes, dtype=np.uint16)
+        self.size = len(self.codes)
+        shifts = np.arange(len(self.keys), dtype=np.uint16)[:, None]
+        self.words = _pack(((self.codes[None, :] >> shifts) & 1).astype(bool))
+        self.everything = _pack(np.ones((1, self.size), dtype=bool))[0]
+
+    @classmethod
+    def from_deck(cls, deck, keys=PROPERTY_KEYS):
+        return cls(property_codes(deck, keys), keys)
+
+    def candidates(self, asked):
+        """asked: {성질 이름: True/False/None} → 모든 답과 맞는 수열의 비트셋 (None 답은 건너뜀)"""
+        mask = self.everything.copy()
+        for key, ans in asked.items():
+            if ans is None or key not in self.position:
+                continue
+            row = self.words[self.position[key]]
+            mask &= row if ans else ~row
+        return mask
+
+    def count(self, mask):
+        return int(popcount(mask))
+
+    def members(self, mask):
+        """비트셋 → 수열 번호 배열"""
+        bits = np.unpackbits(np.ascontiguousarray(mask).view(np.uint8), bitorder="little")
+        return np.flatnonzero(bits[:self.size])
+
+
+def _entropy(counts):
+    counts = np.asarray(counts, dtype=float)
+    total = counts.sum()
+    if total <= 0:
+        return 0.0
+    p = counts[counts > 0] / total
+    return max(0.0, float(-(p * np.log2(p)).sum()))
+
+
+def _binary_entropy(p):
+    p = np.clip(np.asarray(p, dtype=float), 0.0, 1.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        h = -(p * np.log2(p) + (1 - p) * np.log2(1 - p))
+    return np.nan_to_num(h)
+
+
+@dataclass(frozen=True)
+class QuestionScore:
+    key: str
+    yes: int      # '예'일 때 남는 후보 수
+    no: int       # '아니오'일 때 남는 후보 수
+    gain: float   # 기대 정보량 (비트)
+
+
+def rank_questions(index, asked, keys=None):
+    """
+    아직 묻지 않은 질문들의 탐욕 엔트로피 순위
+    keys: 물어볼 수 있는 성질 이름들 (생략하면 index.keys 전체)
+    반환: (후보 수, [QuestionScore, ...] 정보량이 큰 순)
+    """
+    mask = index.candidates(asked)
+    total = index.count(mask)
+    keys = [key for key in (keys or index.keys) if key not in asked and key in index.position]
+    if not keys:
+        return total, []
+    rows = index.words[[index.position[key] for key in keys]]
+    yes = popcount(rows & mask)
+    gain = _binary_entropy(yes / total) if total else np.zeros(len(keys))
+    scores = [QuestionScore(key, int(y), total - int(y), float(g)) for key, y, g in zip(keys, yes, gain)]
+    return total, sorted(scores, key=lambda s: (-s.gain, keys.index(s.key)))
+
+
+@dataclass(frozen=True)
+class DecisionNode:
+    count: int                 # 이 마디까지 남은 후보 수
+    entropy: float             # 이 마디 아래에서 기대되는 잔여 엔트로피 (비트)
+    questions: float           # 이 마디 아래에서 기대되는 질문 수
+    question: Optional[str] = None   # None 이면 잎(더 묻지 않음)
+    yes: Optional["DecisionNode"] = None
+    no: Optional["DecisionNode"] = None
+
+
+def _solve(patterns, counts, positions, keys, budget, memo):
+    """patterns/counts: 후보 비트 무늬와 그 개수, positions: 물어볼 성질 비트 위치들"""
+    memo_key = (patterns.tobytes(), budget)
+    if memo_key in memo:
+        return memo[memo_key]
+
+    total = int(counts.sum())
+    best = DecisionNode(count=total, entropy=_entropy(counts), questions=0.0)
+    if budget > 0 and len(patterns) > 1:
+        answers = (patterns[None, :] >> positions[:, None]) & 1
+        yes_counts = answers @ counts
+        for j in np.flatnonzero((yes_counts > 0) & (yes_counts < total)):
+            # 이미 물은 질문은 모든 후보의 답이 같으므로 여기서 저절로 빠집니다.
+            split = answers[j].astype(bool)
+            yes = _solve(patterns[split], counts[split], positions, keys, budget - 1, memo)
+            no = _solve(patterns[~split], counts[~split], positions, keys, budget - 1, memo)
+            w = yes.count / total
+            entropy = w * yes.entropy + (1 - w) * no.entropy
+            questions = 1 + w * yes.questions + (1 - w) * no.questions
+            if entropy < best.entropy - _EPS or (
+                math.isclose(entropy, best.entropy, abs_tol=_EPS) and questions < best.questions - _EPS
+            ):
+                best = DecisionNode(total, entropy, questions, keys[j], yes, no)
+    memo[memo_key] = best
+    return best
+
+
+def plan_exact(index, asked, budget, keys=None):
+    """
+    지금 후보들에서 질문을 많아야 budget 번 더 할 때의 최적 결정 트리
+    목표: 끝났을 때 남는 후보 무늬의 기대 엔트로피 최소 (같으면 기대 질문 수 최소)
+    반환: DecisionNode (question 이 다음에 물을 질문, 후보가 없거나 더 물을 게 없으면 None)
+    """
+    keys = tuple(key for key in (keys or index.keys) if key in index.position)
+    members = index.members(index.candidates(asked))
+    patterns, counts = np.unique(index.codes[members], return_counts=True)
+    patterns = patterns.astype(np.int64)
+    counts = counts.astype(np.int64)
+    positions = np.array([index.position[key] for key in keys], dtype=np.int64)
+    cache_key = (patterns.tobytes(), counts.tobytes(), keys, int(budget))
+    return PLAN_CACHE.get_or_compute(
+        cache_key,
+        lambda: _solve(patterns, counts, positions, keys, max(int(budget), 0), {}),
+    )
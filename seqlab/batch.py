@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""
+여러 관련 식을 한 번에 계산하는 일괄 계산기
+
+③ 연산 모드처럼 a, b에서 만든 여러 수열(ab, a'b, a/b, ...)을 볼 때,
+- sympy CSE(공통 부분식 제거)로 겹치는 부분(a, b, a·b 등)은 한 번만 계산하고
+- 부분식을 공유하지 않는 식들은 묶음을 나누어 스레드 풀에서 동시에 계산합니다.
+k, c 는 컴파일된 함수의 인수이므로, 값을 바꿔도 다시 컴파일하지 않습니다.
+(k, c 는 Dummy 라서 사용자가 식에 적은 k, c 와는 다른 문자입니다: 그런 식은 엔진처럼 NaN)
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Tuple
+
+import numpy as np
+import sympy as sp
+
+from seqlab.cache import LRUCache
+from seqlab.engine import FLOAT_EXTRAS, RECHECK_LIMIT, _as_real_array, n, periodic_form
+from seqlab.guard import ExpressionRejected, check_expression
+
+# 변환 매개변수 (a' = k·a 또는 a' = a + c), 사용자 식의 k, c 와 섞이지 않도록 Dummy
+k, c = sp.Dummy("k"), sp.Dummy("c")
+PARAMS = (k, c)
+
+# 식 묶음 → 컴파일 결과 (k, c 값과 무관)
+PLAN_CACHE = LRUCache(max_entries=256)
+
+_POOL = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1), thread_name_prefix="seqlab-batch")
+
+
+def related_expressions(a_expr, b_expr, use_k, extras=()):
+    """
+    a, b 로 만든 ③ 모드의 식들 (k, c 는 기호 그대로)
+    extras: "a/b", "a^b", "a∘b" 중 더 보고 싶은 것
+    """
+    a_prime = k * a_expr if use_k else a_expr + c
+    exprs = {
+        "a": a_expr,
+        "b": b_expr,
+        "a'": a_prime,
+        "ab": a_expr * b_expr,
+        "a'b": a_prime * b_expr,
+    }
+    derived = {
+        "a/b": lambda: a_expr / b_expr,
+        "a^b": lambda: a_expr ** b_expr,
+        "a∘b": lambda: a_expr.subs(n, b_expr),  # a(b(n))
+    }
+    for name in extras:
+        exprs[name] = derived[name]()
+    return exprs
+
+
+@dataclass(frozen=True)
+class BatchPlan:
+    names: Tuple[str, ...]
+    exprs: Tuple[sp.Expr, ...]
+    # (이 묶음이 계산하는 식의 번호들, 함수(n, k, c) → 결과 목록)
+    groups: Tuple[Tuple[Tuple[int, ...], Callable], ...]
+
+
+def _group_by_shared_terms(exprs):
+    """CSE 부분식을 함께 쓰는 식끼리 묶습니다 (union-find)."""
+    replacements, reduced = sp.cse(list(exprs))
+    uses = {}
+    for sym, sub in replacements:
+        # 부분식이 다른 부분식을 쓰면 그것까지 함께 씁니다.
+        uses[sym] = {sym}.union(*(uses.get(s, set()) for s in sub.free_symbols))
+
+    parent = list(range(len(exprs)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    owner = {}
+    for i, red in enumerate(reduced):
+        shared = set().union(*(uses.get(s, set()) for s in red.free_symbols))
+        for sym in shared:
+            if sym in owner:
+                parent[find(i)] = find(owner[sym])
+            else:
+                owner[sym] = i
+
+    groups = {}
+    for i in range(len(exprs)):
+        groups.setdefault(find(i), []).append(i)
+    return list(groups.values())
+
+
+def plan_batch(exprs):
+    """exprs: {이름: sympy 식} → BatchPlan (식 묶음이 같으면 캐시)"""
+    names = tuple(exprs)
+    items = tuple(sp.sympify(e) for e in exprs.values())
+    key = (names, tuple(sp.srepr(e) for e in items))
+
+    def build():
+        groups = []
+        for idx in _group_by_shared_terms(items):
+            # n, k, c 이외의 문자가 든 식은 계산하지 않습니다 (NaN).
+            idx = [i for i in idx if not (items[i].free_symbols - {n, k, c})]
+            if not idx:
+                continue
+            forms, tables = zip(*(periodic_form(items[i]) for i in idx))
+            func = sp.lambdify((n, k, c), list(forms), modules=[_merged(tables), FLOAT_EXTRAS, "numpy"], cse=True)
+            groups.append((tuple(idx), func))
+        return BatchPlan(names=names, exprs=items, groups=tuple(groups))
+
+    return PLAN_CACHE.get_or_compute(key, build)
+
+
+def _merged(tables):
+    """식마다 구한 표 함수들을 하나로 (이름이 항에서 정해지므로 겹쳐도 같은 함수)"""
+    merged = {}
+    for table in tables:
+        merged.update(table)
+    return merged
+
+
+def _run_group(func, idx, ns, k_value, c_value):
+    try:
+        with np.errstate(all="ignore"):
+            outs = func(ns, k_value, c_value)
+        return [_as_real_array(out, len(ns)) for out in outs]
+    except Exception:
+        # 묶음 전체가 실패하면 식 하나씩 다시 시도합니다.
+        return [None] * len(idx)
+
+
+def _exact_ok(expr, n_max):
+    try:
+        cost = check_expression(str(expr))
+    except ExpressionRejected:
+        return False
+    return cost is None or cost.exact_ok(n_max)
+
+
+def _recheck(expr, arr, n_min, n_max):
+    """유한하지 않은 항이 적고 정확 계산이 싸면 항별로 다시 구합니다 (engine.evaluate와 같은 규칙)."""
+    bad = np.flatnonzero(~np.isfinite(arr))
+    if 0 < len(bad) <= RECHECK_LIMIT and _exact_ok(expr, n_max):
+        for i in bad:
+            try:
+                arr[i] = float(expr.subs(n, n_min + int(i)))
+            except Exception:
+                arr[i] = np.nan
+    return arr
+
+
+def evaluate_batch(exprs, n_min, n_max, k_value=1.0, c_value=0.0):
+    """
+    exprs: {이름: sympy 식} (n, k, c 사용 가능)
+    n_min ~ n_max: 정수 범위 (양 끝 포함)
+    반환: {이름: float 배열}, 계산할 수 없는 항은 NaN
+    """
+    plan = plan_batch(exprs)
+    size = n_max - n_min + 1
+    ns = np.arange(n_min, n_max + 1, dtype=float)
+    results = {name: np.full(size, np.nan) for name in plan.names}
+    if size <= 0:
+        return results
+
+    if len(plan.groups) == 1:
+        (idx, func), = plan.groups
+        outputs = [(idx, _run_group(func, idx, ns, k_value, c_value))]
+    else:
+        futures = [(idx, _POOL.submit(_run_group, func, idx, ns, k_value, c_value)) for idx, func in plan.groups]
+        outputs = [(idx, fut.result()) for idx, fut in futures]
+
+    params = {k: k_value, c: c_value}
+    for idx, arrays in outputs:
+        for i, arr in zip(idx, arrays):
+            expr = plan.exprs[i].subs(params)
+            if arr is None:
+                arr = _evaluate_single(expr, ns)
+            if arr is not None:
+                results[plan.names[i]] = _recheck(expr, arr, n_min, n_max)
+    return results
+
+
+def _evaluate_single(expr, ns):
+    try:
+        form, tables = periodic_form(expr)
+        func = sp.lambdify(n, form, modules=[tables, FLOAT_EXTRAS, "numpy"])
+        with np.errstate(all="ignore"):
+            return _as_real_array(func(ns), len(ns))
+    except Exception:
+        return None
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+"""
+카드 게임(limt.html)을 인터넷 없이 띄우는 묶음
+
+limt.html 은 Tailwind(브라우저에서 CSS 를 그때그때 컴파일하는 CDN 스크립트), Chart.js(jsDelivr),
+Google Fonts 를 바깥에서 불러오므로 학교 필터망에서는 느리거나 막힙니다.
+빌드 때 Tailwind CSS 를 미리 컴파일(압축)하고 Chart.js 를 받아 assets/limit/ 에 두면,
+페이지는 바깥 태그를 지우고 그 파일들을 끼워 넣은 HTML 하나를 components.html 로 띄웁니다.
+
+    python -m seqlab.bundle build    # 인터넷과 Node(npx) 또는 tailwindcss 단독 실행 파일이 필요 (한 번만)
+    python -m seqlab.bundle info
+
+만든 assets/limit/ 를 저장소에 함께 커밋해 두면 교실 서버에서는 빌드가 필요 없습니다.
+묶음마다 내용 해시(digest)를 붙입니다. 해시가 같으면 다시 실행해도 HTML 이 그대로라 iframe 을 새로 읽지 않고,
+Streamlit 정적 파일 제공(server.enableStaticServing)을 켜면 CSS·JS 를 해시가 붙은 파일 이름으로
+static/limit/ 에서 내보내므로 브라우저가 캐시해 두고 새 세션에서도 다시 받지 않습니다.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import urllib.request
+from dataclasses import dataclass
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE = os.path.join(ROOT, "limt.html")
+# Tailwind 가 클래스 이름을 찾아볼 파일: 카드 HTML(formula_html 의 text-lg·text-xl 등)은 seqlab.decks 가 만듭니다.
+CSS_CONTENT = (SOURCE, os.path.join(ROOT, "seqlab", "decks.py"))
+ASSET_DIR = os.path.join(ROOT, "assets", "limit")
+# Streamlit 은 메인 스크립트 옆 static/ 을 app/static/ 으로 내보냅니다.
+STATIC_DIR = os.path.join(ROOT, "static", "limit")
+STATIC_URL = "app/static/limit"
+
+TAILWIND_VERSION = "3.4.17"
+CHART_VERSION = "4.4.1"
+CHART_URL = f"https://cdn.jsdelivr.net/npm/chart.js@{CHART_VERSION}/dist/chart.umd.min.js"
+CSS_NAME = "tailwind.min.css"
+JS_NAME = "chart.umd.min.js"
+MANIFEST_NAME = "manifest.json"
+
+# 지울 바깥 태그 (Noto Sans KR 은 크롬북 등에 깔린 글꼴, 없으면 sans-serif 로 대신함)
+EXTERNAL_TAGS = {
+    "tailwind": re.compile(r'\s*<script src="https://cdn\.tailwindcss\.com[^"]*"></script>'),
+    "chart": re.compile(r'\s*<script src="https://cdn\.jsdelivr\.net/npm/chart\.js[^"]*"></script>'),
+    "fonts": re.compile(r'\s*<link href="https://fonts\.googleapis\.com/[^"]*" rel="stylesheet">'),
+}
+TAILWIND_INPUT = "@tailwind base;\n@tailwind components;\n@tailwind utilities;\n"
+
+
+@dataclass(frozen=True)
+class Bundle:
+    html: str
+    digest: str
+
+
+# -----------------------------
+# 빌드 (인터넷이 되는 곳에서 한 번)
+# -----------------------------
+def _tailwind_command():
+    """단독 실행 파일(TAILWIND 환경 변수 또는 PATH 의 tailwindcss)이 있으면 그것을, 없으면 npx"""
+    binary = os.environ.get("TAILWIND") or shutil.which("tailwindcss")
+    if binary:
+        return [binary]
+    npx = shutil.which("npx")
+    if npx is None:
+        raise RuntimeError("tailwindcss 실행 파일이나 npx(Node)가 필요합니다.")
+    return [npx, "--yes", f"tailwindcss@{TAILWIND_VERSION}"]
+
+
+def build_css(out_path, content=CSS_CONTENT):
+    """
+    content 파일들(limt.html 안의 JS 문자열, 카드 HTML 을 만드는 seqlab.decks)에 쓰인
+    클래스만 담아 압축한 Tailwind CSS 를 씁니다.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        input_css = os.path.join(tmp, "input.css")
+        with open(input_css, "w", encoding="utf-8") as f:
+            f.write(TAILWIND_INPUT)
+        subprocess.run(
+            _tailwind_command() + ["-i", input_css, "-o", out_path, "--content", ",".join(content), "--minify"],
+            check=True, cwd=tmp,
+        )
+
+
+def fetch_chart(out_path, url=CHART_URL):
+    """버전을 고정한 Chart.js UMD 빌드를 받아 둡니다."""
+    with urllib.request.urlopen(url, timeout=60) as response:
+        data = response.read()
+    with open(out_path, "wb") as f:
+        f.write(data)
+
+
+def build(asset_dir=ASSET_DIR, content=CSS_CONTENT):
+    """반환: manifest dict"""
+    os.makedirs(asset_dir, exist_ok=True)
+    build_css(os.path.join(asset_dir, CSS_NAME), content)
+    fetch_chart(os.path.join(asset_dir, JS_NAME))
+    manifest = {
+        "tailwind": TAILWIND_VERSION,
+        "chart.js": CHART_VERSION,
+        "files": {name: _sha256(os.path.join(asset_dir, name)) for name in (CSS_NAME, JS_NAME)},
+    }
+    with open(os.path.join(asset_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def _sha256(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+# -----------------------------
+# 페이지에서 쓰기
+# -----------------------------
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def _signature(paths):
+    # 파일이 바뀌면(다시 빌드·limt.html 수정) 새로 묶도록 크기·수정 시각을 열쇠로 씁니다.
+    return tuple((p, os.stat(p).st_mtime_ns, os.stat(p).st_size) for p in paths)
+
+
+def load_bundle(static=False, asset_dir=ASSET_DIR, source=SOURCE, static_dir=STATIC_DIR):
+    """
+    바깥 태그를 지우고 미리 만든 CSS·JS 를 넣은 limt.html
+    static=True: 끼워 넣는 대신 static_dir 에 해시 붙은 이름으로 복사하고 그 주소를 씁니다.
+    반환: Bundle (빌드한 파일이 없으면 None). 입력 파일이 그대로면 프로세스 안에서 한 번만 만듭니다.
+    """
+    paths = [source, os.path.join(asset_dir, CSS_NAME), os.path.join(asset_dir, JS_NAME)]
+    try:
+        key = (_signature(paths), static, static_dir)
+    except FileNotFoundError:
+        return None
+    with _cache_lock:
+        bundle = _cache.get(key)
+        if bundle is None:
+            bundle = _cache[key] = _render(*paths, static=static, static_dir=static_dir)
+    return bundle
+
+
+def _render(source, css_path, js_path, static=False, static_dir=STATIC_DIR):
+    with open(source, encoding="utf-8") as f:
+        html = f.read()
+    with open(css_path, "rb") as f:
+        css = f.read()
+    with open(js_path, "rb") as f:
+        js = f.read()
+    digest = hashlib.sha256(b"\0".join([html.encode("utf-8"), css, js])).hexdigest()[:16]
+
+    if static:
+        os.makedirs(static_dir, exist_ok=True)
+        css_url = _publish(static_dir, CSS_NAME, css)
+        js_url = _publish(static_dir, JS_NAME, js)
+        assets = (f'<link rel="stylesheet" href="{css_url}">\n'
+                  f'    <script src="{js_url}"></script>')
+    else:
+        # 압축된 JS 안의 "</script" 가 태그를 일찍 닫지 않도록 막습니다.
+        script = js.decode("utf-8").replace("</script", "<\\/script")
+        assets = (f'<style data-asset="tailwind">{css.decode("utf-8")}</style>\n'
+                  f'    <script data-asset="chart.js">{script}</script>')
+    # Tailwind CDN 태그 자리에 넣고 나머지 바깥 태그는 지웁니다 (<meta charset> 은 그대로 맨 앞).
+    # 대신할 문자열에 역슬래시가 있을 수 있으므로 함수로 넘깁니다.
+    replacement = f'\n    <meta name="seqlab-bundle" content="{digest}">\n    {assets}'
+    for name, pattern in EXTERNAL_TAGS.items():
+        html = pattern.sub(lambda m: replacement if name == "tailwind" else "", html, count=1)
+    return Bundle(html, digest)
+
+
+def _publish(static_dir, name, data):
+    """내용 해시를 이름에 넣어 복사하고 브라우저에서 쓸 주소를 돌려줍니다."""
+    stem, ext = name.split(".", 1)
+    hashed = f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}.{ext}"
+    path = os.path.join(static_dir, hashed)
+    if not os.path.exists(path):
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    return f"{STATIC_URL}/{hashed}"
+
+
+# -----------------------------
+# 명령줄
+# -----------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m seqlab.bundle", description="카드 게임 오프라인 묶음")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build_cmd = sub.add_parser("build", help="Tailwind CSS 를 컴파일하고 Chart.js 를 받아 둡니다.")
+    build_cmd.add_argument("--out", default=ASSET_DIR)
+    info = sub.add_parser("info", help="묶음 파일과 내용 해시를 보여 줍니다.")
+    info.add_argument("--path", default=ASSET_DIR)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        manifest = build(args.out)
+        for name, sha in manifest["files"].items():
+            print(f"{name:<20} {os.path.getsize(os.path.join(args.out, name)) / 1024:>7.0f} KB  {sha[:12]}")
+        return 0
+    bundle = load_bundle(asset_dir=args.path)
+    if bundle is None:
+        print(f"{args.path} 에 묶음 파일이 없습니다. python -m seqlab.bundle build 로 만드세요.", file=sys.stderr)
+        return 1
+    print(f"limt.html 묶음 {len(bundle.html.encode('utf-8')) / 1024:.0f} KB, 해시 {bundle.digest}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
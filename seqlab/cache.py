@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+프로세스 전체에서 공유하는 LRU 캐시
+
+Streamlit은 한 서버 프로세스 안에서 여러 학생의 세션을 돌리므로,
+모듈 전역에 둔 캐시는 모든 세션이 함께 씁니다.
+"""
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+
+
+def sizeof(value):
+    """캐시 항목이 차지하는 대략적인 바이트 수"""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    return sys.getsizeof(value)
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    nbytes: int = 0
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class LRUCache:
+    """
+    항목 수와 바이트 수를 함께 제한하는 스레드 안전 LRU 캐시
+    max_entries: 최대 항목 수
+    max_bytes: 최대 바이트 수 (None이면 제한 없음)
+    """
+
+    def __init__(self, max_entries=256, max_bytes=None, size_func=sizeof):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._size_func = size_func
+        self._data = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.RLock()
+        self._stats = CacheStats()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self._stats.hits += 1
+                return self._data[key]
+            self._stats.misses += 1
+            return default
+
+    def put(self, key, value):
+        size = self._size_func(value)
+        with self._lock:
+            if key in self._data:
+                self._stats.nbytes -= self._sizes[key]
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._sizes[key] = size
+            self._stats.nbytes += size
+            self._evict()
+        return value
+
+    def get_or_compute(self, key, compute):
+        """
+        있으면 캐시 값을, 없으면 compute()를 계산해 저장한 뒤 돌려줍니다.
+        compute는 잠금 밖에서 실행되므로, 드물게 같은 값을 두 번 계산할 수 있습니다.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value
+        return self.put(key, compute())
+
+    def resize(self, key):
+        """값이 제자리에서 커졌을 때 크기를 다시 잽니다."""
+        with self._lock:
+            if key in self._data:
+                self._stats.nbytes -= self._sizes[key]
+                self._sizes[key] = self._size_func(self._data[key])
+                self._stats.nbytes += self._sizes[key]
+                self._evict(keep=key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self._stats = CacheStats()
+
+    def stats(self):
+        with self._lock:
+            return CacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                entries=len(self._data),
+                nbytes=self._stats.nbytes,
+            )
+
+    def _evict(self, keep=None):
+        def over():
+            if len(self._data) > self.max_entries:
+                return True
+            return self.max_bytes is not None and self._stats.nbytes > self.max_bytes
+
+        while self._data and over():
+            key = next(iter(self._data))
+            if key == keep:
+                if len(self._data) == 1:
+                    break
+                self._data.move_to_end(key)
+                key = next(iter(self._data))
+            del self._data[key]
+            self._stats.nbytes -= self._sizes.pop(key)
+            self._stats.evictions += 1
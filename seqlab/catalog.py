@@ -0,0 +1,348 @@
+# -*- coding: utf-8 -*-
+"""
+스무고개용 수열 카탈로그 (오프라인 생성 + 메모리 맵 파일)
+
+생성: 문법(거듭제곱, 로그, 삼각함수, 부호 교대, 짝·홀 나눔, 1/n 곱 등)으로
+깊이 제한까지 식을 늘어놓고, 표본 항 벡터의 해시(fingerprint)가 같은 식은 하나만 남깁니다.
+성질 비트는 seqlab.properties 로 정합니다. 학생에게 정답으로 보여 주는 파일이므로
+성질끼리 모순되는 행(수렴하는데 유계가 아님 등)이나 극한값을 충분히 정확히 모르는 행은 넣지 않습니다.
+
+파일 형식 (한 파일, 열 단위):
+    MAGIC(8바이트) | 헤더 길이(uint64, little endian) | JSON 헤더 | 열 데이터 ...
+각 열은 ALIGN 바이트 경계에서 시작하며, 헤더에 dtype·shape·offset 이 적혀 있습니다.
+읽을 때는 열마다 np.memmap 으로 열기만 하므로, 여러 작업 프로세스가 같은 파일을
+운영체제 페이지 캐시로 함께 쓰고, 실제로 읽은 항목만 메모리에 올라옵니다.
+
+    python -m seqlab.catalog build [--depth 3] [--out data/sequence_catalog.bin]
+    python -m seqlab.catalog info [--path ...]
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from seqlab.core import PROPERTY_KEYS
+
+MAGIC = b"SEQCAT1\0"
+# 2: 모순 검사·극한 반올림을 거친 카탈로그 (1 은 다시 만들어야 함)
+VERSION = 2
+ALIGN = 64
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "sequence_catalog.bin")
+
+# 미리 보여 주는 앞부분 항 수
+PREVIEW_TERMS = 40
+# 같은 수열인지 가리는 표본 위치: 앞부분 전체 + 먼 곳 몇 군데
+FINGERPRINT_N = np.concatenate([np.arange(1, 65), [100, 1_000, 10_000, 100_000]])
+# 표본 값을 비교할 때 남기는 가수 비트 수 (약 11자리)
+FINGERPRINT_BITS = 36
+_NAN_SENTINEL = -7.0e307
+# 수치로만 구한 극한값은 상대 오차가 이보다 작을 때만 씁니다 (0 으로 맞춘 값은 제외).
+LIMIT_TOLERANCE = 1e-6
+
+# -----------------------------
+# 문법
+# -----------------------------
+ATOMS = ["n", "n**2", "n**3", "sqrt(n)", "log(n)", "sin(n)", "cos(n)", "2**n", "(1/2)**n", "1/n"]
+UNARY = [
+    "1/({t})",
+    "(-1)**n*({t})",
+    "({t})/n",
+    "({t})/(({t})+1)",
+    "({t})**2",
+]
+BINARY = [
+    "({t})+({u})",
+    "({t})-({u})",
+    "({t})*({u})",
+    "({t})/({u})",
+    # 짝수 번째는 t, 홀수 번째는 u
+    "(1+(-1)**n)/2*({t})+(1-(-1)**n)/2*({u})",
+]
+
+
+def enumerate_expressions(depth=3):
+    """
+    깊이 depth 까지의 식 문자열 (중복 가능, 순서 고정)
+    깊이 1: ATOMS, 깊이 2: 단항·이항 규칙 한 번, 깊이 3 이상: 단항 규칙을 한 번 더
+    """
+    levels = [list(ATOMS)]
+    if depth >= 2:
+        level = [rule.format(t=t) for rule in UNARY for t in ATOMS]
+        level += [rule.format(t=t, u=u) for rule in BINARY for t, u in itertools.permutations(ATOMS, 2)]
+        levels.append(level)
+    for _ in range(3, depth + 1):
+        levels.append([rule.format(t=t) for rule in UNARY for t in levels[-1]])
+    return list(itertools.chain.from_iterable(levels))
+
+
+def fingerprint(values):
+    """표본 항 벡터의 해시 (반올림 오차 정도의 차이는 같은 값으로 봅니다)"""
+    v = np.asarray(values, dtype=float)
+    mant, exp = np.frexp(v)
+    with np.errstate(all="ignore"):
+        rounded = np.ldexp(np.round(mant * 2.0 ** FINGERPRINT_BITS), exp)
+    # -0.0 과 0.0, 여러 NaN 비트 패턴을 하나로 맞춥니다.
+    rounded = np.where(rounded == 0, 0.0, rounded)
+    rounded = np.where(np.isnan(rounded), _NAN_SENTINEL, rounded)
+    return int.from_bytes(hashlib.blake2b(rounded.tobytes(), digest_size=8).digest(), "little")
+
+
+# -----------------------------
+# 생성
+# -----------------------------
+def inconsistency(props, limit, limit_error):
+    """
+    성질 dict 와 극한값이 서로 맞지 않으면 그 이유, 맞으면 None
+    - 수렴 ⇒ 유계, |a_n|·짝수·홀수 부분수열·a_n/n 도 수렴, 극한값이 유한
+    - n·a_n 수렴 ⇒ a_n 은 0 으로 수렴
+    - 수치로만 구한 극한은 상대 오차 LIMIT_TOLERANCE 이하 (0 으로 맞춘 값은 그대로 씀)
+    """
+    if props["n_times_conv"] and not (props["convergent"] and limit == 0):
+        return "n_times_conv"
+    if not props["convergent"]:
+        return None
+    for key in ("bounded", "abs_conv", "even_subseq_conv", "odd_subseq_conv", "with_1_over_n_conv"):
+        if not props[key]:
+            return f"convergent_not_{key}"
+    if limit is None or not np.isfinite(limit):
+        return "limit_missing"
+    if limit != 0 and not (limit_error is not None and limit_error <= LIMIT_TOLERANCE * max(1.0, abs(limit))):
+        return "limit_imprecise"
+    return None
+
+
+def _examine(source, symbolic=True):
+    """
+    식 하나를 계산해 카탈로그 행을 만듭니다 (작업 프로세스에서 실행).
+    symbolic: 성질 판정에 기호 극한도 쓸지 (느리지만 1/ln n 처럼 아주 느린 수렴도 맞힘)
+    반환: (fingerprint, source, preview, bits, limit), 쓸 수 없는 식이면 None,
+    성질이 모순되거나 극한을 정확히 모르면 그 이유 문자열 (inconsistency)
+    """
+    from seqlab.engine import evaluate, get_compiled
+    from seqlab.limits import round_limit
+    from seqlab.properties import infer_properties
+
+    try:
+        compiled = get_compiled(source)
+    except ValueError:
+        return None
+    if compiled.is_constant_in_n or compiled.has_foreign_symbols:
+        return None
+    samples = np.concatenate([evaluate(compiled, int(k), int(k)) for k in FINGERPRINT_N[64:]])
+    samples = np.concatenate([evaluate(compiled, 1, 64), samples])
+    preview = samples[:PREVIEW_TERMS]
+    if not np.all(np.isfinite(preview)):
+        # 앞부분 표·그래프가 비면 스무고개 단서로 쓸 수 없습니다.
+        return None
+    props = infer_properties(source, symbolic=symbolic)
+    flags = {key: getattr(props, key) for key in PROPERTY_KEYS}
+    reason = inconsistency(flags, props.limit_value, props.limit_error)
+    if reason is not None:
+        return reason
+    bits = sum(1 << i for i, key in enumerate(PROPERTY_KEYS) if flags[key])
+    limit = round_limit(props.limit_value, props.limit_error) if props.convergent else np.nan
+    # 이름은 sympy가 정리한 식으로 (괄호가 겹겹이 붙은 생성 문자열 대신)
+    return fingerprint(samples), str(compiled.expr), preview, bits, limit
+
+
+def build_catalog(depth=3, jobs=None, symbolic=True, progress=None, rejected=None):
+    """
+    문법으로 식을 늘어놓고 계산해, 서로 다른 수열만 담은 열 dict 를 돌려줍니다.
+    progress: (처리한 식 수, 전체 식 수)를 받는 콜백 (선택)
+    rejected: dict 를 주면 모순 검사에서 뺀 식을 {이유: [식, ...]} 로 채웁니다.
+    """
+    sources = list(dict.fromkeys(enumerate_expressions(depth)))
+    seen = set()
+    rows = []
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for i, row in enumerate(pool.map(partial(_examine, symbolic=symbolic), sources, chunksize=16), 1):
+            if isinstance(row, str):
+                if rejected is not None:
+                    rejected.setdefault(row, []).append(sources[i - 1])
+            elif row is not None and row[0] not in seen:
+                seen.add(row[0])
+                rows.append(row)
+            if progress is not None:
+                progress(i, len(sources))
+
+    encoded = [src.encode("utf-8") for _, src, _, _, _ in rows]
+    offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(b) for b in encoded])
+    return {
+        "fingerprint": np.array([r[0] for r in rows], dtype=np.uint64),
+        "preview": np.array([r[2] for r in rows], dtype=np.float64).reshape(len(rows), PREVIEW_TERMS),
+        "bits": np.array([r[3] for r in rows], dtype=np.uint16),
+        "limit": np.array([r[4] for r in rows], dtype=np.float64),
+        "expr_offsets": offsets,
+        "expr_data": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+    }
+
+
+def _aligned(pos):
+    return -(-pos // ALIGN) * ALIGN
+
+
+def write_catalog(path, columns, meta=None):
+    """열 dict 를 한 파일로 씁니다 (임시 파일에 쓴 뒤 바꿔치기)."""
+    header = {
+        "version": VERSION,
+        "count": int(len(columns["bits"])),
+        "preview_terms": PREVIEW_TERMS,
+        "properties": list(PROPERTY_KEYS),
+        "meta": meta or {},
+        "columns": {},
+    }
+    # 헤더 길이가 offset 에 영향을 주므로, 자리를 넉넉히 잡고 두 번 계산합니다.
+    for _ in range(2):
+        pos = _aligned(len(MAGIC) + 8 + len(json.dumps(header).encode("utf-8")) + 256)
+        for name, arr in columns.items():
+            arr = np.ascontiguousarray(arr)
+            header["columns"][name] = {"dtype": arr.dtype.str, "shape": list(arr.shape), "offset": pos}
+            pos = _aligned(pos + arr.nbytes)
+    blob = json.dumps(header).encode("utf-8")
+    assert len(MAGIC) + 8 + len(blob) <= min(c["offset"] for c in header["columns"].values())
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(len(blob).to_bytes(8, "little"))
+        f.write(blob)
+        for name, arr in columns.items():
+            f.seek(header["columns"][name]["offset"])
+            f.write(np.ascontiguousarray(arr).tobytes())
+    os.replace(tmp, path)
+
+
+# -----------------------------
+# 읽기
+# -----------------------------
+class Catalog:
+    """
+    메모리 맵으로 연 카탈로그 (읽기 전용)
+    len(catalog), catalog[i] → 스무고개 SEQUENCES 항목과 같은 모양의 dict
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"수열 카탈로그 파일이 아닙니다: {path}")
+            size = int.from_bytes(f.read(8), "little")
+            self.header = json.loads(f.read(size).decode("utf-8"))
+        if self.header.get("version") != VERSION:
+            raise ValueError("카탈로그 형식이 오래되었습니다. python -m seqlab.catalog build 로 다시 만들어 주세요.")
+        if self.header["properties"] != list(PROPERTY_KEYS):
+            raise ValueError("카탈로그의 성질 목록이 현재 질문 목록과 다릅니다. 다시 만들어 주세요.")
+        self.columns = {}
+        for name, spec in self.header["columns"].items():
+            shape = tuple(spec["shape"])
+            if np.prod(shape) == 0:
+                self.columns[name] = np.empty(shape, dtype=np.dtype(spec["dtype"]))
+                continue
+            self.columns[name] = np.memmap(path, dtype=np.dtype(spec["dtype"]), mode="r", offset=spec["offset"], shape=shape)
+
+    def __len__(self):
+        return self.header["count"]
+
+    def source(self, i):
+        lo, hi = self.columns["expr_offsets"][i:i + 2]
+        return bytes(self.columns["expr_data"][lo:hi]).decode("utf-8")
+
+    def properties(self, i):
+        bits = int(self.columns["bits"][i])
+        return {key: bool(bits >> j & 1) for j, key in enumerate(self.header["properties"])}
+
+    def __getitem__(self, i):
+        import sympy as sp
+
+        from seqlab.engine import get_compiled
+
+        source = self.source(i)
+        compiled = get_compiled(source)
+        props = self.properties(i)
+        limit = float(self.columns["limit"][i])
+        entry = {
+            "name": source.replace("**", "^"),
+            "expr": f"a_n = {sp.latex(compiled.expr)}",
+            "preview_n": self.header["preview_terms"],
+            "preview": np.array(self.columns["preview"][i]),
+            "seq": compiled.scalar_func,
+            "limit_value": limit if props["convergent"] and np.isfinite(limit) else None,
+            "explain": _explain(props, limit),
+        }
+        entry.update(props)
+        return entry
+
+
+def _explain(props, limit):
+    if props["convergent"]:
+        return f"이 수열은 {limit:.6g}(으)로 수렴하옵니다."
+    if props["bounded"]:
+        return "이 수열은 유계이나 한 점으로 모이지 아니하옵니다."
+    return "이 수열은 한없이 커지거나 작아져, 수렴하지 않사옵니다."
+
+
+def open_catalog(path=DEFAULT_PATH):
+    """카탈로그 파일이 있으면 Catalog, 없으면 None"""
+    if not os.path.exists(path):
+        return None
+    return Catalog(path)
+
+
+# -----------------------------
+# 명령줄
+# -----------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m seqlab.catalog", description="스무고개 수열 카탈로그")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="문법으로 식을 만들어 카탈로그 파일을 씁니다.")
+    build.add_argument("--depth", type=int, default=3)
+    build.add_argument("--jobs", type=int, default=None, help="작업 프로세스 수 (기본: CPU 수)")
+    build.add_argument("--out", default=DEFAULT_PATH)
+    build.add_argument("--numeric-only", action="store_true", help="기호 극한 없이 수치 근거만으로 성질을 정합니다 (빠름).")
+    info = sub.add_parser("info", help="카탈로그 파일 요약을 보여 줍니다.")
+    info.add_argument("--path", default=DEFAULT_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        started = time.monotonic()
+
+        def progress(done, total):
+            if done % 200 == 0 or done == total:
+                print(f"\r{done:,} / {total:,} 식", end="", file=sys.stderr, flush=True)
+
+        rejected = {}
+        columns = build_catalog(depth=args.depth, jobs=args.jobs, symbolic=not args.numeric_only,
+                                progress=progress, rejected=rejected)
+        print(file=sys.stderr)
+        for reason, sources in sorted(rejected.items()):
+            print(f"  뺀 식 ({reason}) {len(sources):,}개, 예: {sources[0]}", file=sys.stderr)
+        meta = {
+            "depth": args.depth,
+            "symbolic": not args.numeric_only,
+            "rejected": {reason: len(sources) for reason, sources in sorted(rejected.items())},
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        write_catalog(args.out, columns, meta=meta)
+        print(f"{len(columns['bits']):,}개 수열 → {args.out} ({os.path.getsize(args.out) / 1024:.0f} KB, "
+              f"{time.monotonic() - started:.0f}초)")
+    else:
+        catalog = Catalog(args.path)
+        print(f"{args.path}: {len(catalog):,}개 수열, 미리보기 {catalog.header['preview_terms']}항")
+        print(f"  만든 설정: {json.dumps(catalog.header['meta'], ensure_ascii=False)}")
+        bits = np.asarray(catalog.columns["bits"])
+        for j, key in enumerate(catalog.header["properties"]):
+            print(f"  {key:<20} {int(np.count_nonzero(bits >> j & 1)):>7,}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
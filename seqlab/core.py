@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+페이지와 seqlab 모듈이 함께 쓰는 가벼운 핵심
+
+여기에는 numpy·sympy·pandas·plotly 없이 불러올 수 있는 것만 둡니다.
+페이지는 맨 위에서 이 모듈만 불러오고, 무거운 라이브러리는 그것을 쓰는 모드·함수 안에서 불러옵니다.
+(④ 반례 & 일반화 메모나 카드 게임처럼 계산이 없는 화면은 무거운 라이브러리를 전혀 불러오지 않습니다.)
+
+- 극한 판정 이름(CONVERGES 등)과 스무고개 성질 이름(PROPERTY_KEYS)
+- warm_up(): 서버 프로세스가 처음 쓰일 때(첫 접속, 보통 main.py) 뒤에서 무거운 모듈을 불러오고
+  캐시·기호 계산 작업 프로세스를 데워, 배포·증설 뒤 첫 학생이 그 시간을 기다리지 않게 합니다.
+
+    SEQLAB_WARMUP=0    미리 데우지 않음
+"""
+import importlib
+import os
+import threading
+import time
+
+# 극한 추정의 판정 (seqlab.limits)
+CONVERGES = "converges"
+DIVERGES_POS = "diverges_pos"
+DIVERGES_NEG = "diverges_neg"
+OSCILLATES = "oscillates"
+UNKNOWN = "unknown"
+
+# 스무고개에서 물을 수 있는 성질 (카탈로그 비트 순서와 같음, seqlab.properties)
+PROPERTY_KEYS = (
+    "convergent",
+    "bounded",
+    "monotone",
+    "sign_changes",
+    "abs_conv",
+    "piecewise2",
+    "n_times_conv",
+    "even_subseq_conv",
+    "odd_subseq_conv",
+    "with_1_over_n_conv",
+)
+
+WARMUP_ENABLED = os.environ.get("SEQLAB_WARMUP", "1").lower() not in ("0", "off", "false", "no")
+# 미리 불러올 모듈 (앞의 것일수록 여러 화면이 함께 씀)
+HEAVY_MODULES = (
+    "numpy",
+    "sympy",
+    "pandas",
+    "plotly.graph_objects",
+    "seqlab.engine",
+    "seqlab.plotting",
+    "seqlab.limits",
+    "seqlab.stream",
+    "seqlab.sweep",
+    "seqlab.batch",
+    "seqlab.symbolic",
+    "seqlab.catalog",
+    "seqlab.advisor",
+    "seqlab.family",
+)
+
+# 단계 이름 → 걸린 초 (실패한 단계는 예외 문자열)
+WARMUP_TIMES = {}
+_warmup_thread = None
+_warmup_lock = threading.Lock()
+
+
+def _prime_sequences():
+    from seqlab.engine import sequence_terms
+    from seqlab.limits import estimate_limit
+
+    # 첫 화면의 기본값(1/n)과 같은 계산: 컴파일·배열 계산·극한 추정
+    estimate_limit(sequence_terms("1/n", 1, 50))
+
+
+def _prime_figures():
+    import numpy as np
+    import pandas as pd
+
+    from seqlab.plotting import line_figure
+
+    # plotly 는 첫 그림을 만들 때 검사기(validator)들을 불러오므로 작은 그림 하나를 그려 둡니다.
+    ns = np.arange(1, 11)
+    pd.DataFrame({"n": ns, "a_n": 1 / ns})
+    line_figure(ns, {"a_n": 1 / ns}).to_plotly_json()
+
+
+def _prime_catalog():
+    from seqlab.catalog import open_catalog
+
+    catalog = open_catalog()
+    if catalog is not None and len(catalog):
+        catalog[0]  # 파일을 페이지 캐시에 올리고 sympy 의 latex 출력도 데움
+
+
+def _prime_symbolic():
+    from seqlab.engine import get_compiled
+    from seqlab.symbolic import submit_limit, submit_simplify
+
+    # 작업 프로세스를 띄우고(각자 sympy 를 불러옴) 기본값 1/n 의 정확한 극한을 미리 구해 둡니다.
+    compiled = get_compiled("1/n")
+    submit_limit(compiled)
+    submit_simplify(compiled)
+
+
+WARMUP_STEPS = (
+    ("sequences", _prime_sequences),
+    ("figures", _prime_figures),
+    ("catalog", _prime_catalog),
+    ("symbolic", _prime_symbolic),
+)
+
+
+def _warm():
+    for name in HEAVY_MODULES:
+        _timed(f"import {name}", lambda: importlib.import_module(name))
+    for name, step in WARMUP_STEPS:
+        _timed(name, step)
+
+
+def _timed(name, func):
+    started = time.perf_counter()
+    try:
+        func()
+    except Exception as exc:  # 미리 데우기는 실패해도 페이지에는 영향이 없어야 합니다.
+        WARMUP_TIMES[name] = repr(exc)
+        return
+    WARMUP_TIMES[name] = time.perf_counter() - started
+
+
+def warm_up(background=True):
+    """
+    프로세스마다 한 번만 무거운 모듈·캐시를 데웁니다 (두 번째부터는 아무것도 하지 않음).
+    background=False 이면 끝날 때까지 기다립니다 (명령줄·시험용).
+    반환: 데우는 스레드 (끈 경우 None)
+    """
+    global _warmup_thread
+    if not WARMUP_ENABLED:
+        return None
+    with _warmup_lock:
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(target=_warm, name="seqlab-warmup", daemon=True)
+            _warmup_thread.start()
+        thread = _warmup_thread
+    if not background:
+        thread.join()
+    return thread
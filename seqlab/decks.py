@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+"""
+카드 게임(limt.html)의 카드 묶음(deck)
+
+식·표·그래프 카드에 들어갈 값을 서버에서 한 번 계산해 작은 JSON 으로 묶습니다.
+표는 앞 TABLE_TERMS 항, 그래프는 앞 GRAPH_TERMS 항을 LTTB 로 GRAPH_POINTS 개 이하로 줄인 점입니다.
+입력(수열 정의·라운드 수·seed·카탈로그)의 해시를 파일 이름으로 data/decks/ 에 저장해 두므로
+같은 묶음은 서버를 다시 켜도 계산하지 않고, 브라우저는 받은 값을 그리기만 합니다.
+
+- 앞 라운드들은 CURATED (limt.html 에 박혀 있던 12 수열, 라운드마다 SETS_PER_ROUND 개)
+- 그 뒤 라운드는 스무고개 카탈로그(python -m seqlab.catalog build)가 있으면 거기서 seed 로 뽑음
+  (성질이 서로 맞는 행만, 극한값은 카탈로그에 반올림해 둔 값 그대로)
+- limt.html 에는 CURATED 로 만든 묶음을 #seqlab-fallback-deck 로 박아 두어,
+  서버도 deck.json 도 없이 파일만 열어도 처음 세 라운드는 할 수 있습니다.
+
+    python -m seqlab.decks build [--rounds 10] [--seed 0] [--out deck.json]
+    (limt.html 을 따로 올릴 때는 만든 deck.json 을 그 옆에 두면 페이지가 불러 씁니다.)
+    python -m seqlab.decks fallback [--page limt.html]   CURATED 를 고치면 박아 둔 묶음도 다시 씀
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+import sys
+from dataclasses import asdict, dataclass
+
+from seqlab.cache import LRUCache
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DECK_DIR = os.path.join(ROOT, "data", "decks")
+FORMAT = 2
+SETS_PER_ROUND = 4
+TABLE_TERMS = 5
+GRAPH_TERMS = 30
+GRAPH_POINTS = 20
+DEFAULT_ROUNDS = 10
+DECK_CACHE = LRUCache(max_entries=64)
+PAGE_PATH = os.path.join(ROOT, "limt.html")
+FALLBACK_ID = "seqlab-fallback-deck"
+
+
+@dataclass(frozen=True)
+class CardSpec:
+    id: str
+    expr: str           # seqlab.engine 이 읽는 식
+    name: str
+    formula_html: str
+    insight: str
+    color: str
+
+
+CURATED = (
+    # [Round 1] Basic Concepts
+    CardSpec("R1-A", "1/n", "조화수열 (Harmonic)", 'aₙ = <span class="text-xl">1/n</span>',
+             "n이 커질수록 0에 가까워집니다.<br><b>'0으로 수렴'하는 가장 기본적인 형태입니다.</b>", "#4F46E5"),
+    CardSpec("R1-B", "1 + (-1)**n", "진동 (Oscillation)", "aₙ = 1 + (-1)ⁿ",
+             "0과 2를 왔다 갔다 합니다.<br><b>특정한 값에 머무르지 않으므로 발산입니다.</b>", "#EF4444"),
+    CardSpec("R1-C", "3", "상수수열 (Constant)", "aₙ = 3",
+             "변화가 없어도 수렴입니다.<br><b>모든 항이 3이므로 극한값도 3입니다.</b>", "#10B981"),
+    CardSpec("R1-D", "n/(n+1)", "유리식 (Rational)", 'aₙ = <span class="text-lg">n / (n+1)</span>',
+             "분자, 분모가 비슷해지며 1로 갑니다.<br><b>최고차항의 계수비(1/1)와 같습니다.</b>", "#F59E0B"),
+    # [Round 2] Speed & Signs
+    CardSpec("R2-A", "(1/2)**n", "등비수열 (Geometric)", "aₙ = (1/2)ⁿ",
+             "엄청나게 빠른 속도로 0이 됩니다.<br><b>공비의 절댓값이 1보다 작으면 0으로 수렴합니다.</b>", "#8B5CF6"),
+    CardSpec("R2-B", "n", "무한대 발산", "aₙ = n",
+             "한없이 커지는 상태입니다.<br><b>특정 값에 도달하지 않으므로 양의 무한대로 발산합니다.</b>", "#EC4899"),
+    CardSpec("R2-C", "(-1)**n/n", "교대 조화수열", "aₙ = (-1)ⁿ / n",
+             "부호가 바뀌며 진동하지만,<br><b>폭이 점점 줄어들어 결국 0으로 수렴합니다.</b>", "#06B6D4"),
+    CardSpec("R2-D", "(1 + 1/n)**n", "자연상수 e", "aₙ = (1 + 1/n)ⁿ",
+             "점점 커지지만 3을 넘지 못합니다.<br><b>약 2.718..인 무리수 e로 수렴합니다.</b>", "#6366F1"),
+    # [Round 3] Applications
+    CardSpec("R3-A", "sin(n)/n", "샌드위치 정리", "aₙ = sin(n)/n",
+             "분자는 -1과 1 사이를 오가지만,<br><b>분모가 커져서 0으로 눌려버립니다(Squeeze).</b>", "#14B8A6"),
+    CardSpec("R3-B", "sqrt(n+1) - sqrt(n)", "무리식의 극한", "√n+1 - √n",
+             "계속 작아집니다.<br><b>유리화를 해보면 분모만 커져서 0으로 수렴함을 알 수 있습니다.</b>", "#F97316"),
+    CardSpec("R3-C", "(2*n+1)/n", "계수비 극한", "aₙ = (2n+1)/n",
+             "위에서부터 2로 내려옵니다.<br><b>n의 계수 비인 2/1 = 2로 수렴합니다.</b>", "#84CC16"),
+    CardSpec("R3-D", "0", "0 수열", "aₙ = 0",
+             "아무런 움직임이 없습니다.<br><b>상수수열 0은 당연히 0으로 수렴합니다.</b>", "#64748B"),
+)
+PALETTE = tuple(spec.color for spec in CURATED)
+FALLBACK_ROUNDS = len(CURATED) // SETS_PER_ROUND
+
+
+@dataclass(frozen=True)
+class Deck:
+    text: str    # 브라우저로 보낼 JSON
+    digest: str  # text 의 내용 해시
+
+
+# -----------------------------
+# 만들기
+# -----------------------------
+def _compact(values):
+    # 카드 크기 그림·소수 둘째 자리 표에는 유효숫자 4자리면 충분합니다.
+    return [float(f"{v:.4g}") for v in values]
+
+
+def _card(spec):
+    """카드 세 장(식·표·그래프)에 들어갈 값. 계산할 수 없는 항이 있으면 None"""
+    import numpy as np
+
+    from seqlab.engine import sequence_terms
+    from seqlab.plotting import select_points
+
+    terms = sequence_terms(spec.expr, 1, max(TABLE_TERMS, GRAPH_TERMS))
+    if not np.isfinite(terms).all():
+        return None
+    ns = np.arange(1, len(terms) + 1)
+    idx = select_points(ns, terms, max_points=GRAPH_POINTS)
+    card = asdict(spec)
+    del card["expr"]
+    card.update(table=_compact(terms[:TABLE_TERMS]), x=ns[idx].tolist(), y=_compact(terms[idx]))
+    return card
+
+
+def _catalog_insight(props, limit):
+    if props["convergent"]:
+        return f"n이 커질수록 한 값에 다가갑니다.<br><b>{limit:.4g}(으)로 수렴합니다.</b>"
+    if props["bounded"]:
+        return "유계이지만 한 값으로 모이지 않습니다.<br><b>수렴하지 않으므로 발산(진동)입니다.</b>"
+    return "한없이 커지거나 작아집니다.<br><b>수렴하지 않으므로 발산입니다.</b>"
+
+
+def _catalog_cards(catalog, count, seed, skip):
+    """
+    카탈로그에서 seed 로 count 개를 뽑아 카드 값으로
+    (skip 의 식, 계산할 수 없는 식, 성질이 서로 맞지 않는 행은 건너뜀)
+    """
+    import numpy as np
+
+    from seqlab.catalog import inconsistency
+
+    cards = []
+    rng = np.random.default_rng(seed)
+    for i in rng.permutation(len(catalog)):
+        if len(cards) == count:
+            break
+        source = catalog.source(int(i))
+        if source in skip:
+            continue
+        skip.add(source)
+        props = catalog.properties(int(i))
+        limit = float(catalog.columns["limit"][i])
+        # 카탈로그의 극한값은 만들 때 오차 자릿수로 반올림해 두었으므로 오차 0 으로 봅니다.
+        if inconsistency(props, limit, 0.0) is not None:
+            continue
+        text = html.escape(source.replace("**", "^"))
+        spec = CardSpec(f"C{int(i)}", source, "카탈로그 수열", f"aₙ = {text}",
+                        _catalog_insight(props, limit), PALETTE[len(cards) % len(PALETTE)])
+        card = _card(spec)
+        if card is not None:
+            cards.append(card)
+    return cards
+
+
+def build_deck(rounds=DEFAULT_ROUNDS, seed=0, catalog=None):
+    """반환: {"format", "sets_per_round", "rounds": [[카드 번호, ...], ...], "cards": [...]}"""
+    cards = [_card(spec) for spec in CURATED]
+    cards = [card for card in cards if card is not None]
+    extra = max(0, rounds * SETS_PER_ROUND - len(cards))
+    if extra and catalog is not None and len(catalog):
+        cards += _catalog_cards(catalog, extra, seed, {spec.expr for spec in CURATED})
+    usable = len(cards) - len(cards) % SETS_PER_ROUND
+    order = list(range(usable))
+    return {
+        "format": FORMAT,
+        "sets_per_round": SETS_PER_ROUND,
+        "rounds": [order[i:i + SETS_PER_ROUND] for i in range(0, usable, SETS_PER_ROUND)][:rounds],
+        "cards": cards[:usable],
+    }
+
+
+# -----------------------------
+# 해시·디스크 캐시
+# -----------------------------
+def _catalog_signature(catalog):
+    if catalog is None:
+        return None
+    stat = os.stat(catalog.path)
+    return [len(catalog), stat.st_size, stat.st_mtime_ns]
+
+
+def deck_key(rounds, seed, catalog=None):
+    """묶음을 정하는 입력 전체의 해시 (파일 이름)"""
+    inputs = {
+        "format": FORMAT,
+        "curated": [asdict(spec) for spec in CURATED],
+        "terms": [SETS_PER_ROUND, TABLE_TERMS, GRAPH_TERMS, GRAPH_POINTS],
+        "rounds": rounds,
+        "seed": seed,
+        "catalog": _catalog_signature(catalog),
+    }
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+
+
+def load_deck(rounds=DEFAULT_ROUNDS, seed=0, deck_dir=DECK_DIR):
+    """
+    Deck (같은 입력이면 프로세스 메모리 → data/decks/ 파일 순으로 찾고, 없을 때만 계산)
+    파일 쓰기에 실패해도(읽기 전용 배포 등) 만든 묶음은 그대로 돌려줍니다.
+    """
+    from seqlab.catalog import open_catalog
+
+    catalog = open_catalog()
+    key = deck_key(rounds, seed, catalog)
+
+    def compute():
+        path = os.path.join(deck_dir, f"{key}.json")
+        try:
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+        except FileNotFoundError:
+            deck = build_deck(rounds, seed, catalog)
+            text = json.dumps(deck, ensure_ascii=False, separators=(",", ":"))
+            try:
+                os.makedirs(deck_dir, exist_ok=True)
+                tmp = f"{path}.{os.getpid()}.tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    f.write(text)
+                os.replace(tmp, path)
+            except OSError:
+                pass
+        return Deck(text, hashlib.sha256(text.encode("utf-8")).hexdigest()[:16])
+
+    return DECK_CACHE.get_or_compute((deck_dir, key), compute)
+
+
+def fallback_script(deck_text):
+    """limt.html 에 박아 둘 CURATED 묶음 스크립트 태그"""
+    payload = deck_text.replace("</", "<\\/")
+    return f'<script id="{FALLBACK_ID}" type="application/json">{payload}</script>'
+
+
+def write_fallback(page_path=PAGE_PATH):
+    """
+    limt.html 의 #seqlab-fallback-deck 을 지금 CURATED 로 만든 묶음으로 바꿉니다.
+    반환: 바뀌었으면 True
+    """
+    deck = build_deck(FALLBACK_ROUNDS, catalog=None)
+    tag = fallback_script(json.dumps(deck, ensure_ascii=False, separators=(",", ":")))
+    with open(page_path, encoding="utf-8") as f:
+        page = f.read()
+    pattern = re.compile(rf'<script id="{FALLBACK_ID}" type="application/json">.*?</script>', re.S)
+    if not pattern.search(page):
+        raise ValueError(f"{page_path} 에 #{FALLBACK_ID} 스크립트가 없습니다.")
+    updated = pattern.sub(lambda _: tag, page, count=1)
+    if updated == page:
+        return False
+    with open(page_path, "w", encoding="utf-8") as f:
+        f.write(updated)
+    return True
+
+
+def embed_deck(page_html, deck):
+    """limt.html 의 </head> 앞에 묶음을 JSON 스크립트로 넣습니다 (페이지는 이것을 먼저 찾음)."""
+    # JSON 안의 "</" 가 스크립트 태그를 닫지 않도록 (JSON 에서 "\/" 는 "/" 와 같음)
+    payload = deck.text.replace("</", "<\\/")
+    tag = f'<script id="seqlab-deck" type="application/json" data-digest="{deck.digest}">{payload}</script>\n'
+    return page_html.replace("</head>", tag + "</head>", 1)
+
+
+# -----------------------------
+# 명령줄
+# -----------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m seqlab.decks", description="카드 게임 카드 묶음")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="카드 묶음을 만들어 JSON 으로 씁니다.")
+    build.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    build.add_argument("--seed", type=int, default=0)
+    build.add_argument("--out", default=None, help="따로 쓸 JSON 파일 (기본: data/decks/ 캐시에만)")
+    fallback = sub.add_parser("fallback", help="limt.html 에 박아 둔 CURATED 묶음을 다시 씁니다.")
+    fallback.add_argument("--page", default=PAGE_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == "fallback":
+        changed = write_fallback(args.page)
+        print(f"{args.page}: {'다시 썼습니다' if changed else '이미 최신입니다'} (라운드 {FALLBACK_ROUNDS}개)")
+        return 0
+
+    deck = load_deck(args.rounds, args.seed)
+    data = json.loads(deck.text)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(deck.text)
+    print(f"라운드 {len(data['rounds'])}개, 수열 {len(data['cards'])}개, "
+          f"{len(deck.text.encode('utf-8')) / 1024:.1f} KB, 해시 {deck.digest}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,417 @@
+# -*- coding: utf-8 -*-
+"""
+수열 계산 엔진
+
+일반항 문자열을 한 번만 해석·컴파일해 두고,
+n_min ~ n_max 전체 구간을 NumPy 배열 연산 한 번으로 계산합니다.
+NumPy로 계산할 수 없는 식(factorial, binomial 등)은 항별 계산으로 물러섭니다.
+해석 전에 seqlab.guard로 비용을 검사하며, 항이 너무 커서 정확한 정수 계산이
+비싼 범위나 항별 계산이 정해진 양(PER_TERM_LIMIT 항, PER_TERM_SECONDS 초)을 넘는 범위에서는
+float64(lgamma 기반) 배열 계산만 쓰고, 그것도 안 되면 ExpressionRejected 로 알립니다.
+sin(π·n/2) 처럼 정수 n 에서 되풀이되는 삼각함수는 정확한 값의 표로 계산해
+기존 방식(expr.subs)과 같은 0·계산 불가(NaN) 항을 냅니다.
+"""
+import math
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import numpy as np
+import sympy as sp
+
+from seqlab.cache import LRUCache
+from seqlab.guard import CostReport, ExpressionRejected, check_expression
+from seqlab.segments import SegmentStore
+from seqlab.telemetry import span
+
+# 공통 심볼 (페이지의 sp.symbols('n')과 같은 심볼)
+n = sp.Symbol("n")
+
+# 배열 계산 뒤 유한하지 않은 항을 항별로 다시 확인할 최대 개수
+RECHECK_LIMIT = 64
+# evaluate 한 번에 항별(sympy) 계산을 허락하는 최대 항 수와 시간 (항 하나에 1 ms 가까이 걸리기도 함)
+PER_TERM_LIMIT = 5000
+PER_TERM_SECONDS = 5.0
+# 삼각함수 인수가 π·(a·n + b) 일 때 표로 계산하는 a, b 의 최대 공통 분모
+PERIODIC_DENOMINATOR = 360
+# precise_terms 의 유효 자릿수 (float64 의 약 16자리로는 (1+1/n)^n 의 꼬리 증가분이 반올림 오차에 묻힘)
+PRECISE_DIGITS = 30
+
+# 모든 세션이 함께 쓰는 캐시
+#  - 컴파일 캐시: 공백을 뺀 입력 문자열 → CompiledExpression (해석 실패도 기억)
+#  - 항 캐시: 정규화된 식 → SegmentStore (계산해 둔 n 구간들)
+COMPILED_CACHE = LRUCache(max_entries=1024)
+TERMS_CACHE = LRUCache(max_entries=512, max_bytes=256 * 1024 * 1024)
+
+
+@dataclass(frozen=True)
+class _CompileFailure:
+    """캐시에 넣는 해석 실패 (예외 객체를 그대로 두면 다시 던질 때마다 traceback 이 쌓입니다)"""
+    error_type: type
+    message: str
+
+
+@dataclass(frozen=True)
+class CompiledExpression:
+    source: str
+    key: str
+    expr: sp.Expr
+    vector_func: Optional[Callable]
+    scalar_func: Optional[Callable]
+    float_func: Optional[Callable] = None
+    cost: Optional[CostReport] = None
+
+    def exact_ok(self, n_max):
+        """n_max 까지 항별 정확 계산을 해도 되는지 (비용 검사 결과 기준)"""
+        return self.cost is None or self.cost.exact_ok(n_max)
+
+    @property
+    def is_constant_in_n(self):
+        return n not in self.expr.free_symbols
+
+    @property
+    def has_foreign_symbols(self):
+        return bool(self.expr.free_symbols - {n})
+
+
+def _log_gamma(x):
+    out = np.full(np.shape(x), np.nan)
+    flat = np.ravel(np.asarray(x, dtype=float))
+    for i, v in enumerate(flat):
+        try:
+            out.flat[i] = math.lgamma(v)
+        except (ValueError, OverflowError):
+            pass
+    return out
+
+
+def _np_gamma(x):
+    return np.exp(_log_gamma(x))
+
+
+def _np_factorial(x):
+    return np.exp(_log_gamma(np.asarray(x, dtype=float) + 1))
+
+
+def _np_binomial(a, b):
+    a, b = np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+    return np.exp(_log_gamma(a + 1) - _log_gamma(b + 1) - _log_gamma(a - b + 1))
+
+
+_SQRT5 = math.sqrt(5)
+_PHI = (1 + _SQRT5) / 2
+# 작은 n 의 조화수는 더해서 정확히, 큰 n 은 점근 전개로 (n ≥ 64 에서 잘린 항 < 1e-17)
+_HARMONIC_TABLE = np.concatenate([[0.0], np.cumsum(1.0 / np.arange(1, 65))])
+
+
+def _binet(x, sign, scale):
+    """(φ^x + sign·ψ^x)·scale (ψ = -1/φ), 정수 x 에서. 2^53 안의 값은 반올림해 정확한 정수로."""
+    x = np.asarray(x, dtype=float)
+    with np.errstate(all="ignore"):
+        psi = np.where(np.mod(x, 2) == 0, 1.0, -1.0) * _PHI ** -x
+        out = (_PHI ** x + sign * psi) * scale
+    return np.where(np.abs(out) < 2.0 ** 53, np.round(out), out)
+
+
+def _np_fibonacci(x):
+    return _binet(x, -1, 1 / _SQRT5)
+
+
+def _np_lucas(x):
+    return _binet(x, 1, 1.0)
+
+
+def _np_harmonic(x):
+    x = np.asarray(x, dtype=float)
+    with np.errstate(all="ignore"):
+        inv = 1.0 / x
+        inv2 = inv * inv
+        series = np.log(x) + np.euler_gamma + inv / 2 - inv2 * (1 / 12 - inv2 * (1 / 120 - inv2 / 252))
+    small = (x >= 0) & (x <= 64) & (x == np.floor(x))
+    return np.where(small, _HARMONIC_TABLE[np.where(small, x, 0).astype(int)], series)
+
+
+# float64 경로에서 NumPy에 없는 함수를 대신할 벡터 함수들
+FLOAT_EXTRAS = {
+    "factorial": _np_factorial, "gamma": _np_gamma, "binomial": _np_binomial,
+    "fibonacci": _np_fibonacci, "lucas": _np_lucas, "harmonic": _np_harmonic,
+}
+
+_TRIG = (sp.sin, sp.cos, sp.tan, sp.cot, sp.sec, sp.csc)
+
+
+def _exact_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _periodic_lookup(func, a, b):
+    """
+    func(π·(a·n + b)) 를 정수 n 에서 구하는 벡터 함수 (a, b 는 유리수)
+    값은 a·n + b 를 2로 나눈 나머지에만 달렸으므로 sympy 로 정확히 구해 둔 표에서 꺼냅니다.
+    """
+    d = int(sp.ilcm(a.q, b.q))
+    period = 2 * d
+    step, shift = int(a * d) % period, int(b * d) % period
+    table = np.array([_exact_float(func(sp.pi * sp.Rational(j, d))) for j in range(period)])
+
+    def lookup(x):
+        k = np.asarray(x, dtype=float).astype(np.int64) % period
+        return table[(step * k + shift) % period]
+
+    return lookup
+
+
+def periodic_form(expr):
+    """
+    expr 의 sin(π·n/2), tan(π·n) 같은 항을 표 함수로 바꾼 식과 그 함수들 (lambdify 의 modules 앞에 둠)
+    float64 의 π 로는 sin(π·n) 이 0 대신 1e-16, tan(π/2) 가 NaN 대신 1.6e16 이 됩니다.
+    """
+    tables = {}
+    mapping = {}
+    for term in expr.atoms(*_TRIG):
+        if n not in term.free_symbols:
+            continue
+        ratio = sp.expand(term.args[0] / sp.pi)
+        b, rest = ratio.as_independent(n, as_Add=True)
+        a = sp.simplify(rest / n)
+        if not (a.is_Rational and b.is_Rational) or sp.ilcm(a.q, b.q) > PERIODIC_DENOMINATOR:
+            continue
+        # 같은 항이면 같은 이름이므로 여러 식의 표를 한 사전에 합쳐도 됩니다 (seqlab.batch).
+        name = f"{term.func.__name__}_periodic{abs(hash((a, b)))}"
+        tables[name] = _periodic_lookup(term.func, a, b)
+        mapping[term] = sp.Function(name)(n)
+    return (expr.xreplace(mapping) if mapping else expr), tables
+
+
+def compile_expression(expr_str):
+    """
+    expr_str: '1/n' 같은 문자열
+    반환: CompiledExpression
+    해석할 수 없는 식이면 ValueError, 비용 검사에서 걸리면 ExpressionRejected
+    """
+    with span("sympify"):
+        cost = check_expression(expr_str)
+        try:
+            expr = sp.sympify(expr_str)
+        except Exception as exc:
+            raise ValueError(f"수식을 해석할 수 없습니다: {expr_str!r}") from exc
+    with span("lambdify"):
+        return compile_sympy(expr, source=str(expr_str), cost=cost)
+
+
+def _lambdify_or_none(expr, modules):
+    try:
+        return sp.lambdify(n, expr, modules=modules)
+    except Exception:
+        return None
+
+
+def compile_sympy(expr, source=None, cost=None):
+    expr = sp.sympify(expr)
+    vector_func = scalar_func = float_func = None
+    if not (expr.free_symbols - {n}):
+        form, tables = periodic_form(expr)
+        vector_func = _lambdify_or_none(form, [tables, "numpy"])
+        scalar_func = _lambdify_or_none(form, [tables, "math", "sympy"])
+        float_func = _lambdify_or_none(form, [tables, FLOAT_EXTRAS, "numpy"])
+    return CompiledExpression(
+        source=str(expr) if source is None else source,
+        key=sp.srepr(expr),
+        expr=expr,
+        vector_func=vector_func,
+        scalar_func=scalar_func,
+        float_func=float_func,
+        cost=cost,
+    )
+
+
+def _as_real_array(values, size):
+    """lambdify 결과를 길이 size의 float 배열로 맞춥니다. 실수가 아닌 값은 NaN."""
+    arr = np.asarray(values)
+    if arr.dtype == object:
+        raise TypeError("object 배열은 float로 계산할 수 없습니다.")
+    if np.iscomplexobj(arr):
+        real = np.where(arr.imag == 0, arr.real, np.nan)
+        arr = real
+    arr = np.asarray(arr, dtype=float)
+    if arr.ndim == 0:
+        arr = np.full(size, float(arr))
+    if arr.shape != (size,):
+        raise ValueError("결과 배열의 크기가 n 구간과 맞지 않습니다.")
+    return arr
+
+
+def _exact_term(compiled, k):
+    """기존 방식(expr.subs + float) 그대로 항 하나를 구합니다. 실패하면 NaN."""
+    try:
+        return float(compiled.expr.subs(n, k))
+    except Exception:
+        return np.nan
+
+
+def _term(compiled, k):
+    """항 하나를 스칼라 함수로 구합니다. 실패하면 NaN."""
+    if compiled.scalar_func is None:
+        return _exact_term(compiled, k)
+    try:
+        return float(compiled.scalar_func(k))
+    except Exception:
+        # 정수가 float 범위를 넘거나(sympy 는 inf), math.factorial(-2) 처럼 math 에서만 실패하는 항
+        # (sympy 는 factorial(1)/factorial(-2) = 0) 은 기존 방식으로 다시 구합니다.
+        return _exact_term(compiled, k)
+
+
+def _per_term_rejected():
+    return ExpressionRejected(
+        f"이 식은 항을 하나씩 계산해야 해서 한 번에 {PER_TERM_LIMIT:,}항까지만 계산할 수 있습니다. "
+        "n 최댓값을 줄여 주세요."
+    )
+
+
+def _evaluate_per_term(compiled, n_min, n_max):
+    """NumPy로 계산되지 않는 식을 위한 항별 계산. 실패한 항은 NaN, PER_TERM_SECONDS 를 넘기면 ExpressionRejected."""
+    deadline = time.monotonic() + PER_TERM_SECONDS
+    out = np.empty(n_max - n_min + 1)
+    for i, k in enumerate(range(n_min, n_max + 1)):
+        out[i] = _term(compiled, k)
+        if time.monotonic() > deadline:
+            raise _per_term_rejected()
+    return out
+
+
+def evaluate(compiled, n_min, n_max):
+    """
+    compiled: CompiledExpression
+    n_min ~ n_max: 정수 범위 (양 끝 포함)
+    반환: 길이 n_max - n_min + 1 의 float 배열, 계산할 수 없는 항은 NaN
+    항별 계산이 필요한데 정해진 양을 넘고 float64 로도 계산할 수 없으면 ExpressionRejected
+    """
+    size = n_max - n_min + 1
+    if size <= 0:
+        return np.empty(0)
+    if compiled.has_foreign_symbols:
+        # n 이외의 문자가 남아 있으면 어떤 항도 수로 계산되지 않습니다.
+        return np.full(size, np.nan)
+
+    exact_ok = compiled.exact_ok(n_max)
+    with span("evaluate_vector"):
+        arr = _evaluate_vector(compiled.vector_func, n_min, n_max)
+    if arr is not None:
+        # 1/(n-1)의 n=1 처럼 0으로 나눈 자리는 NumPy에서 inf가 되지만
+        # 항별 계산에서는 NaN이었습니다. 유한하지 않은 항이 적으면 다시 확인합니다.
+        bad = np.flatnonzero(~np.isfinite(arr))
+        if exact_ok and 0 < len(bad) <= RECHECK_LIMIT:
+            for i in bad:
+                arr[i] = _exact_term(compiled, n_min + int(i))
+        return arr
+    rejected = None
+    if exact_ok and size <= PER_TERM_LIMIT:
+        try:
+            with span("evaluate_per_term"):
+                return _evaluate_per_term(compiled, n_min, n_max)
+        except ExpressionRejected as exc:
+            rejected = exc
+    elif exact_ok:
+        rejected = _per_term_rejected()
+    # 항이 너무 크거나 많아 정확한 계산은 비쌉니다: float64 배열 계산만
+    arr = _evaluate_vector(compiled.float_func, n_min, n_max)
+    if arr is None and rejected is not None:
+        raise rejected
+    return arr if arr is not None else np.full(size, np.nan)
+
+
+def _evaluate_vector(func, n_min, n_max):
+    if func is None:
+        return None
+    ns = np.arange(n_min, n_max + 1, dtype=float)
+    try:
+        with np.errstate(all="ignore"):
+            return _as_real_array(func(ns), n_max - n_min + 1)
+    except Exception:
+        return None
+
+
+def precise_terms(compiled, ns):
+    """
+    정수 ns 의 항을 mpmath(PRECISE_DIGITS 자리)로 구한 float 배열
+    float64 에서 넘치는 중간값(2**n/(2**n+1) 등)이나 반올림 오차가 없고, 값 자체가 float 범위를 넘으면 ±inf,
+    실수가 아니거나 계산할 수 없는 항은 NaN 입니다. 항의 크기 상한을 알 수 없는 식(2**2**n 등)은 모두 NaN.
+    """
+    import mpmath
+
+    ns = np.asarray(ns, dtype=np.int64)
+    out = np.full(len(ns), np.nan)
+    if not len(ns) or compiled.has_foreign_symbols:
+        return out
+    if compiled.cost is not None and not math.isfinite(compiled.cost.log10_magnitude(int(ns.max()))):
+        return out
+    func = _lambdify_or_none(compiled.expr, "mpmath")
+    if func is None:
+        return out
+    with mpmath.workdps(PRECISE_DIGITS):
+        for i, k in enumerate(ns):
+            try:
+                value = func(mpmath.mpf(int(k)))
+                if isinstance(value, mpmath.mpc):
+                    if value.imag != 0:
+                        continue
+                    value = value.real
+                out[i] = float(value)
+            except (ArithmeticError, TypeError, ValueError):
+                pass
+    return out
+
+
+def normalize_source(expr_str):
+    """입력 문자열의 공백 차이를 없앤 캐시 키"""
+    return "".join(str(expr_str).split())
+
+
+def get_compiled(expr_str):
+    """
+    compile_expression의 캐시 버전
+    해석할 수 없는 식이면 ValueError (실패 결과도 캐시합니다)
+    """
+    key = normalize_source(expr_str)
+    result = COMPILED_CACHE.get(key)
+    if result is None:
+        try:
+            result = compile_expression(expr_str)
+        except ValueError as exc:
+            result = _CompileFailure(type(exc), str(exc))
+        COMPILED_CACHE.put(key, result)
+    if isinstance(result, _CompileFailure):
+        # 매번 새 예외를 만들어 호출한 스크립트의 프레임이 캐시에 묶이지 않게 합니다.
+        raise result.error_type(result.message)
+    return result
+
+
+def sequence_terms(expr_str, n_min, n_max):
+    """
+    expr_str의 n_min ~ n_max 항을 캐시를 거쳐 돌려줍니다.
+    이미 계산한 구간은 잘라 쓰고, 비어 있는 구간만 새로 계산합니다.
+    반환 배열은 여러 세션이 공유하므로 읽기 전용입니다.
+    해석할 수 없는 식이면 ValueError
+    """
+    compiled = get_compiled(expr_str)
+    store = term_store(compiled)
+    before = store.computed_terms
+    arr = store.get(n_min, n_max)
+    if store.computed_terms != before:
+        TERMS_CACHE.resize(compiled.key)
+    return arr
+
+
+def term_store(compiled):
+    """식 하나의 구간 저장소 (없으면 새로 만듭니다)"""
+    return TERMS_CACHE.get_or_compute(
+        compiled.key,
+        lambda: SegmentStore(lambda lo, hi: evaluate(compiled, lo, hi)),
+    )
+
+
+def cache_stats():
+    return {"compiled": COMPILED_CACHE.stats(), "terms": TERMS_CACHE.stats()}
@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+"""
+활동 기록 내보내기 (CSV / Parquet)
+
+seqlab.store 의 SQLite 파일에서 CHUNK_ROWS 줄씩 읽어 바로 파일에 씁니다.
+한 학기 전체라도 메모리에는 한 덩어리만 올라옵니다.
+- rounds: 라운드마다 한 줄 (물은 질문과 답, 판단, 극한값 추측, 근거)
+- events: 새 라운드·질문·정답 공개 사건마다 한 줄
+- memos:  메모 칸마다 한 줄 (반례 & 일반화 메모 포함)
+Parquet 은 pyarrow 가 있을 때만 씁니다 (쓸 때 불러옴).
+페이지의 내려받기(export_panel)는 모든 반의 이름·메모가 담기므로, 서버에 교사 암호
+SEQLAB_TEACHER_CODE 를 정했을 때만 그 암호를 넣고 쓸 수 있습니다 (정하지 않으면 닫혀 있음).
+
+    python -m seqlab.export rounds --out rounds.csv [--since 2026-03-02] [--until 2026-07-20]
+                                   [--page sequence20] [--class 2-3] [--format parquet]
+"""
+import argparse
+import csv
+import hmac
+import io
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+from seqlab.store import DEFAULT_PATH
+
+# 한 번에 읽어 쓰는 줄 수
+CHUNK_ROWS = 50_000
+# 페이지에서 내려받기를 여는 교사 암호 (비어 있으면 페이지에서는 내려받을 수 없음)
+TEACHER_CODE = os.environ.get("SEQLAB_TEACHER_CODE", "")
+# 표 이름 → 페이지에 보이는 이름
+TABLE_LABELS = {"rounds": "스무고개 라운드", "events": "질문·공개 기록", "memos": "메모·일반화 문장"}
+
+
+def _asked_text(asked):
+    """[["convergent", true], ...] → 'convergent:Y;bounded:N'"""
+    marks = {True: "Y", False: "N", None: "?"}
+    return ";".join(f"{key}:{marks.get(ans, '?')}" for key, ans in json.loads(asked))
+
+
+def _timestamp(ts):
+    return datetime.fromtimestamp(ts).replace(microsecond=0)
+
+
+# 표 이름 → (열 (이름, 형식)들, SELECT 문, 시각 열, 한 줄 변환)
+TABLES = {
+    "rounds": (
+        (("class_id", "string"), ("student", "string"), ("page", "string"), ("round_no", "int64"),
+         ("seq_idx", "int64"), ("q_count", "int64"), ("questions", "string"), ("show_answer", "bool"),
+         ("verdict", "string"), ("guess", "string"), ("reason", "string"), ("updated", "timestamp")),
+        "SELECT class_id, student, page, round_no, seq_idx, q_count, asked, show_answer, verdict, guess, reason, "
+        "updated FROM rounds",
+        "updated",
+        lambda r: r[:6] + (_asked_text(r[6]), bool(r[7])) + r[8:11] + (_timestamp(r[11]),),
+    ),
+    "events": (
+        (("class_id", "string"), ("student", "string"), ("page", "string"), ("round_no", "int64"),
+         ("kind", "string"), ("question", "string"), ("answer", "bool"), ("payload", "string"),
+         ("ts", "timestamp")),
+        "SELECT class_id, student, page, round_no, kind, payload, ts FROM events",
+        "ts",
+        lambda r: r[:5] + _event_fields(r[5]) + (_timestamp(r[6]),),
+    ),
+    "memos": (
+        (("class_id", "string"), ("student", "string"), ("page", "string"), ("key", "string"),
+         ("text", "string"), ("updated", "timestamp")),
+        "SELECT class_id, student, page, key, text, updated FROM memos",
+        "updated",
+        lambda r: r[:5] + (_timestamp(r[5]),),
+    ),
+}
+
+
+def _event_fields(payload):
+    data = json.loads(payload)
+    return data.get("key"), data.get("answer"), payload
+
+
+def _epoch(value, end=False):
+    """date/datetime/'YYYY-MM-DD' → 유닉스 시각 (날짜만 주면 end=True 일 때 그날 끝까지)"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value) if "T" in value or " " in value else date.fromisoformat(value)
+    if isinstance(value, datetime):
+        return value.timestamp()
+    day = datetime(value.year, value.month, value.day)
+    return (day + timedelta(days=1) if end else day).timestamp()
+
+
+def iter_chunks(table, since=None, until=None, pages=None, classes=None, path=DEFAULT_PATH, chunk_rows=CHUNK_ROWS):
+    """
+    table: TABLES 의 이름
+    since, until: 날짜 범위 (양 끝 포함, date·datetime·'YYYY-MM-DD')
+    pages, classes: 이 페이지·반만 (생략하면 전부)
+    반환: 줄 목록(tuple)을 chunk_rows 개씩 내놓는 생성기
+    """
+    columns, select, time_column, convert = TABLES[table]
+    where, params = [], []
+    if since is not None:
+        where.append(f"{time_column} >= ?")
+        params.append(_epoch(since))
+    if until is not None:
+        where.append(f"{time_column} < ?")
+        params.append(_epoch(until, end=True))
+    for column, values in (("page", pages), ("class_id", classes)):
+        if values:
+            where.append(f"{column} IN ({','.join('?' * len(values))})")
+            params.extend(values)
+    sql = select + (" WHERE " + " AND ".join(where) if where else "") + f" ORDER BY {time_column}"
+
+    # 읽기 전용으로 열어, 쓰는 중인 서버를 막지 않습니다 (WAL).
+    conn = sqlite3.connect(f"file:{os.path.abspath(path)}?mode=ro", uri=True)
+    try:
+        cursor = conn.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(chunk_rows)
+            if not rows:
+                break
+            yield [convert(row) for row in rows]
+    finally:
+        conn.close()
+
+
+def export_csv(out, table, **filters):
+    """
+    out: 파일 경로 또는 글자 모드 파일 객체
+    반환: 쓴 줄 수 (머리글 제외)
+    """
+    if isinstance(out, (str, os.PathLike)):
+        # 엑셀에서 한글이 깨지지 않도록 BOM 을 붙입니다.
+        with open(out, "w", encoding="utf-8-sig", newline="") as f:
+            return export_csv(f, table, **filters)
+    writer = csv.writer(out)
+    writer.writerow([name for name, _ in TABLES[table][0]])
+    count = 0
+    for rows in iter_chunks(table, **filters):
+        writer.writerows(rows)
+        count += len(rows)
+    return count
+
+
+def export_parquet(out, table, **filters):
+    """
+    out: 파일 경로 또는 바이너리 파일 객체 (pyarrow 필요)
+    반환: 쓴 줄 수
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ImportError("Parquet 로 내보내려면 pyarrow 가 필요합니다: pip install pyarrow") from exc
+
+    types = {"string": pa.string(), "int64": pa.int64(), "bool": pa.bool_(), "timestamp": pa.timestamp("s")}
+    columns = TABLES[table][0]
+    schema = pa.schema([(name, types[kind]) for name, kind in columns])
+    count = 0
+    with pq.ParquetWriter(out, schema) as writer:
+        for rows in iter_chunks(table, **filters):
+            arrays = [pa.array(values, type=field.type) for field, values in zip(schema, zip(*rows))]
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+            count += len(rows)
+    return count
+
+
+EXPORTERS = {"csv": export_csv, "parquet": export_parquet}
+
+
+def export_file(fmt, table, **filters):
+    """
+    이름 없는 임시 파일에 내보내고 처음으로 되감아 돌려줍니다 (페이지의 내려받기 버튼용).
+    파일을 닫으면 사라집니다.
+    """
+    f = tempfile.TemporaryFile()
+    if fmt == "csv":
+        text = io.TextIOWrapper(f, encoding="utf-8-sig", newline="")
+        export_csv(text, table, **filters)
+        text.flush()
+        text.detach()
+    else:
+        export_parquet(f, table, **filters)
+    f.seek(0)
+    return f
+
+
+def teacher_unlocked(code):
+    """입력한 암호가 TEACHER_CODE 와 같은지 (암호를 정하지 않았으면 언제나 False)"""
+    return bool(TEACHER_CODE) and hmac.compare_digest(code.encode("utf-8"), TEACHER_CODE.encode("utf-8"))
+
+
+def export_panel(page_id, tables=tuple(TABLE_LABELS), wide=False):
+    """
+    반 기록 내려받기 (교사용): 라운드·질문·메모를 날짜·반으로 골라 CSV/Parquet 로
+    page_id: 텔레메트리에 적을 페이지, tables: 고를 표 (앞의 것이 기본값)
+    wide: 본문처럼 넓은 곳이면 True (고르는 칸을 한 줄에), 사이드바면 False
+    """
+    import streamlit as st
+
+    from seqlab import telemetry
+    from seqlab.store import get_store
+
+    @st.fragment
+    @telemetry.traced(page_id, "export_panel")
+    def panel():
+        with st.expander("📦 반 기록 내려받기 (교사용)"):
+            if not TEACHER_CODE:
+                st.caption("서버에 교사 암호(환경 변수 SEQLAB_TEACHER_CODE)를 정하면 여기서 내려받을 수 있습니다.")
+                return
+            code = st.text_input("교사 암호", type="password", key="export_code")
+            if not teacher_unlocked(code):
+                if code:
+                    st.error("암호가 맞지 않습니다.")
+                return
+            if not os.path.exists(DEFAULT_PATH):
+                st.caption("아직 저장된 기록이 없습니다. 반·이름을 적고 활동하면 기록이 쌓입니다.")
+                return
+            col_table, col_format, col_days = st.columns(3) if wide else (st, st, st)
+            table = col_table.selectbox("내용", list(tables), format_func=TABLE_LABELS.get, key="export_table")
+            fmt = col_format.selectbox("형식", list(EXPORTERS), key="export_format")
+            today = date.today()
+            days = col_days.date_input("기간", value=(today - timedelta(days=180), today), key="export_days")
+            classes = st.text_input("반 (쉼표로 여러 반, 비우면 전체)", value=st.session_state.get("class_id", ""),
+                                    key="export_classes")
+            since, until = (tuple(days) + (None, None))[:2] if isinstance(days, (tuple, list)) else (days, days)
+            filters = {
+                "since": since,
+                "until": until,
+                "classes": [c.strip() for c in classes.split(",") if c.strip()] or None,
+            }
+
+            def build():
+                # 아직 쓰이지 않은 기록까지 담기도록 먼저 비웁니다.
+                get_store().flush(timeout=5.0)
+                return export_file(fmt, table, **filters)
+
+            st.download_button(
+                "⬇️ 내려받기",
+                data=build,
+                file_name=f"{table}_{today:%Y%m%d}.{fmt}",
+                mime="text/csv" if fmt == "csv" else "application/octet-stream",
+            )
+
+    panel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m seqlab.export", description="활동 기록 내보내기")
+    parser.add_argument("table", choices=sorted(TABLES))
+    parser.add_argument("--out", required=True, help="내보낼 파일 (형식은 --format 또는 확장자로 정함)")
+    parser.add_argument("--format", choices=sorted(EXPORTERS), default=None)
+    parser.add_argument("--since", help="시작 날짜 (YYYY-MM-DD, 포함)")
+    parser.add_argument("--until", help="끝 날짜 (YYYY-MM-DD, 포함)")
+    parser.add_argument("--page", action="append", dest="pages", help="이 페이지만 (여러 번 줄 수 있음)")
+    parser.add_argument("--class", action="append", dest="classes", help="이 반만 (여러 번 줄 수 있음)")
+    parser.add_argument("--db", default=DEFAULT_PATH)
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("parquet" if args.out.endswith(".parquet") else "csv")
+    started = time.monotonic()
+    count = EXPORTERS[fmt](args.out, args.table, since=args.since, until=args.until,
+                          pages=args.pages, classes=args.classes, path=args.db)
+    print(f"{args.table}: {count:,}줄 → {args.out} ({time.monotonic() - started:.1f}초)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
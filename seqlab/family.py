@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""
+여러 수열을 한 그림에 겹쳐 보는 ⑤ 워크벤치의 계산
+
+식 목록이나 매개변수 가족(예: 1/n**p, p = 0.5, 1, ..., 3)을 (수열 수 × n) 2차원 배열 하나로 구합니다.
+- 가족: 템플릿을 (n, 매개변수) 함수로 한 번 컴파일해 브로드캐스트 한 번으로 모든 행을 계산
+- 목록: 행마다 seqlab.engine 의 항 캐시를 거치므로 다른 모드·세션이 계산해 둔 항을 그대로 씀
+  (가족에서도 계산할 수 없는 항이 나온 행은 엔진으로 다시 구해 항별 확인 규칙을 똑같이 따름)
+극한 추정(seqlab.limits)과 수렴 속도 |a_n - L| ~ C·n^(-p) 의 p 도 한꺼번에 구하고,
+입력이 같으면 FAMILY_CACHE 에서 꺼내므로 다시 실행할 때는 계산하지 않습니다.
+수열 수 × n 개수가 MAX_CELLS 를 넘으면 행을 CHUNK_CELLS 씩 나눠 계산하면서 n 을 골라 남기므로
+(60개 × 10^6 항도 결과는 16 MB 정도) 결과가 캐시 한도에 걸려 매번 다시 계산되지 않습니다.
+"""
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+import sympy as sp
+
+from seqlab.cache import LRUCache
+from seqlab.core import CONVERGES
+from seqlab.engine import FLOAT_EXTRAS, get_compiled, n, normalize_source, periodic_form, sequence_terms
+from seqlab.limits import TAIL_WINDOW, LimitEstimate, estimate_limits
+from seqlab.telemetry import span
+
+# 한 그림에 겹치는 최대 수열 수
+MAX_SERIES = 60
+# 결과에 남기는 최대 칸 수 (수열 수 × n 개수). 넘으면 고르게·로그 간격으로 고른 n 과 꼬리만 남깁니다.
+MAX_CELLS = 2 * 10**6
+# 한 번에 계산하는 최대 칸 수 (중간 배열 하나의 크기 상한)
+CHUNK_CELLS = 4 * 10**6
+
+FAMILY_CACHE = LRUCache(max_entries=64, max_bytes=256 * 1024 * 1024, size_func=lambda r: r.values.nbytes)
+
+
+@dataclass(frozen=True)
+class FamilyResult:
+    labels: Tuple[str, ...]
+    sources: Tuple[str, ...]
+    ns: np.ndarray                       # 남긴 n (항이 많으면 kept_columns 로 고른 것)
+    values: np.ndarray                   # (수열 수, len(ns)), 읽기 전용
+    limits: Tuple[LimitEstimate, ...]
+    rates: np.ndarray                    # 수렴하는 행의 p (|a_n - L| ~ n^-p), 나머지는 NaN
+
+
+# -----------------------------
+# 입력 해석
+# -----------------------------
+def parse_values(text):
+    """
+    '0.5:3:0.5' (시작:끝:간격, 끝 포함) 또는 '1, 2, 3' → float 튜플
+    잘못된 입력이면 ValueError
+    """
+    text = text.strip()
+    if ":" in text:
+        try:
+            start, stop, step = (float(part) for part in text.split(":"))
+        except ValueError:
+            raise ValueError("범위는 '시작:끝:간격' 꼴로 적어 주세요 (예: 0.5:3:0.5).") from None
+        if step <= 0 or stop < start:
+            raise ValueError("간격은 양수, 끝은 시작보다 크거나 같아야 합니다.")
+        count = int(np.floor((stop - start) / step + 1e-9)) + 1
+        if count > MAX_SERIES:
+            raise ValueError(f"한 그림에는 수열을 {MAX_SERIES}개까지 겹칠 수 있습니다.")
+        # 0.1 같은 간격을 더해 생기는 2.2e-16 같은 찌꺼기를 지웁니다.
+        return tuple(round(start + i * step, 10) + 0.0 for i in range(count))
+    try:
+        values = tuple(float(part) for part in text.replace(",", " ").split())
+    except ValueError:
+        raise ValueError("값은 쉼표로 나누어 적어 주세요 (예: 1, 2, 3).") from None
+    if not values:
+        raise ValueError("매개변수 값을 하나 이상 적어 주세요.")
+    if len(values) > MAX_SERIES:
+        raise ValueError(f"한 그림에는 수열을 {MAX_SERIES}개까지 겹칠 수 있습니다.")
+    return values
+
+
+def parse_list(text):
+    """한 줄에 식 하나 (빈 줄·# 주석은 건너뜀) → 정규화된 식 튜플 (중복 제거, 순서 유지)"""
+    sources = []
+    for line in text.splitlines():
+        line = line.split("#", 1)[0].strip()
+        if line and normalize_source(line) not in sources:
+            sources.append(normalize_source(line))
+    if len(sources) > MAX_SERIES:
+        raise ValueError(f"한 그림에는 수열을 {MAX_SERIES}개까지 겹칠 수 있습니다.")
+    return tuple(sources)
+
+
+def family_parameter(template):
+    """템플릿에서 n 이 아닌 문자 하나 (매개변수). 없거나 둘 이상이면 ValueError"""
+    params = sorted(str(s) for s in get_compiled(template).expr.free_symbols - {n})
+    if len(params) != 1:
+        raise ValueError("일반항에 n 말고 매개변수 문자를 하나만 넣어 주세요 (예: 1/n**p, r**n).")
+    return params[0]
+
+
+def family_members(template, values):
+    """
+    템플릿의 매개변수에 값을 넣은 식들 → (매개변수 이름, 이름표 튜플, 식 튜플)
+    식은 엔진 캐시 키로도 쓰이므로 sympy 가 정리한 문자열입니다.
+    """
+    param = family_parameter(template)
+    expr = get_compiled(template).expr
+    symbol = sp.Symbol(param)
+    labels, sources = [], []
+    for value in values:
+        number = sp.Integer(int(value)) if float(value).is_integer() else sp.Float(value)
+        labels.append(f"{param} = {value:g}")
+        sources.append(normalize_source(str(expr.subs(symbol, number))))
+    return param, tuple(labels), tuple(sources)
+
+
+# -----------------------------
+# 계산
+# -----------------------------
+def kept_columns(count, size):
+    """
+    수열 count 개 × n size 개에서 결과에 남길 열 번호
+    MAX_CELLS 이하면 모두, 넘으면 고른 간격·로그 간격으로 고른 열과 꼬리 TAIL_WINDOW 열(극한 추정용)
+    """
+    if count * size <= MAX_CELLS:
+        return np.arange(size)
+    half = max(MAX_CELLS // count, 2 * TAIL_WINDOW) // 2
+    uniform = np.linspace(0, size - 1, half).astype(int)
+    logs = np.geomspace(1, size, half).astype(int) - 1
+    tail = np.arange(max(size - TAIL_WINDOW, 0), size)
+    return np.union1d(np.union1d(uniform, logs), tail)
+
+
+def _row_chunks(count, size):
+    """한 번에 CHUNK_CELLS 칸 이하가 되도록 나눈 행 구간들"""
+    step = max(1, CHUNK_CELLS // size)
+    return [slice(i, min(i + step, count)) for i in range(0, count, step)]
+
+
+def _stack_rows(sources, n_min, n_max, cols, rows=None):
+    """rows 가 없거나 유한하지 않은 항이 있는 행은 엔진(항 캐시)으로 채웁니다 (cols 열만)."""
+    out = np.empty((len(sources), len(cols))) if rows is None else rows
+    for i, source in enumerate(sources):
+        if rows is None or not np.isfinite(rows[i]).all():
+            out[i] = sequence_terms(source, n_min, n_max)[cols]
+    return out
+
+
+def _broadcast_family(template, param, values, n_min, n_max, cols):
+    """템플릿을 (n, 매개변수)로 한 번 컴파일해 행 묶음마다 브로드캐스트하고 cols 열만 남깁니다 (실패하면 None)"""
+    expr = get_compiled(template).expr
+    symbol = sp.Symbol(param)
+    ns = np.arange(n_min, n_max + 1, dtype=float)
+    ps = np.asarray(values, dtype=float)[:, None]
+    out = np.empty((len(values), len(cols)))
+    try:
+        form, tables = periodic_form(expr)
+        func = sp.lambdify((n, symbol), form, modules=[tables, FLOAT_EXTRAS, "numpy"])
+        for rows in _row_chunks(len(values), len(ns)):
+            with np.errstate(all="ignore"):
+                block = np.asarray(func(ns[None, :], ps[rows]))
+            if block.dtype == object:
+                return None
+            if np.iscomplexobj(block):
+                block = np.where(block.imag == 0, block.real, np.nan)
+            # 상수 식이거나 한쪽 축만 쓰는 식이어도 복사 없이 모양을 맞춘 뒤 열을 고릅니다.
+            out[rows] = np.broadcast_to(block, (rows.stop - rows.start, len(ns)))[:, cols]
+    except Exception:
+        return None
+    return out
+
+
+def convergence_rates(values, ns, limits):
+    """
+    수렴하는 행마다 |a_n - L| ~ C·n^(-p) 의 p (수렴하지 않거나 점이 모자라면 NaN)
+    추정한 L 의 작은 오차에 흔들리지 않도록 증가분으로 구합니다: 꼬리 TAIL_WINDOW 항에서
+    log|Δa_n| 을 log n 에 직선으로 맞춘 기울기 -q 를 얻으면, 한 방향으로 다가가는 수열은 p = q - 1,
+    부호가 번갈아 바뀌며 다가가는 수열은 |a_n - L| 이 |Δa_n| 정도이므로 p = q 입니다.
+    모든 행을 마스크 배열 하나로 한꺼번에 맞춥니다. 기하적으로 수렴하면 p 가 매우 크게 나옵니다.
+    """
+    tail = values[:, -TAIL_WINDOW:]
+    # Δa_n = a_(n+1) - a_n 은 n + 1/2 에서의 기울기에 가장 가깝습니다 (범위가 짧아도 p 가 치우치지 않게).
+    x = np.log(np.asarray(ns, dtype=float)[-TAIL_WINDOW:][:-1] + 0.5)[None, :]
+    converges = np.array([est.kind == CONVERGES for est in limits])
+    with np.errstate(all="ignore"):
+        d = np.diff(tail, axis=1)
+        mags = np.abs(d)
+        # 반올림 잡음보다 큰 증가분만 (0으로 가는 수열은 항의 크기 자체가 작으므로 그 크기에 맞춤)
+        scale = np.nanmax(np.abs(tail), axis=1, initial=0.0)[:, None]
+        ok = np.isfinite(mags) & (mags > 1e-13 * scale) & (mags > 0)
+        y = np.where(ok, np.log(np.where(ok, mags, 1.0)), 0.0)
+        w = ok.astype(float)
+        count = w.sum(axis=1)
+        mx = (w * x).sum(axis=1) / count
+        my = (w * y).sum(axis=1) / count
+        sxx = (w * (x - mx[:, None]) ** 2).sum(axis=1)
+        sxy = (w * (x - mx[:, None]) * (y - my[:, None])).sum(axis=1)
+        q = -sxy / sxx
+        signs = np.sign(d)
+        flips = (signs[:, 1:] * signs[:, :-1] < 0).sum(axis=1) / np.maximum(count - 1, 1)
+    p = np.where(flips >= 0.5, q, q - 1)
+    return np.where(converges & (count >= 10) & (sxx > 0), p, np.nan)
+
+
+def _finish(labels, sources, ns, values):
+    with span("family_limits"):
+        limits = tuple(estimate_limits(values, ns))
+        rates = convergence_rates(values, ns, limits)
+    values.setflags(write=False)
+    return FamilyResult(tuple(labels), tuple(sources), ns, values, limits, rates)
+
+
+def evaluate_list(sources, n_min, n_max):
+    """식 목록 → FamilyResult (이름표는 식 그대로)"""
+    sources = tuple(sources)
+
+    def compute():
+        cols = kept_columns(len(sources), n_max - n_min + 1)
+        with span("family_evaluate"):
+            values = _stack_rows(sources, n_min, n_max, cols)
+        return _finish(sources, sources, n_min + cols, values)
+
+    return FAMILY_CACHE.get_or_compute(("list", sources, n_min, n_max), compute)
+
+
+def evaluate_family(template, values, n_min, n_max):
+    """매개변수 가족 → FamilyResult (해석할 수 없는 식이면 ValueError, 비용이 지나치면 ExpressionRejected)"""
+    template = normalize_source(template)
+    values = tuple(values)
+    param, labels, sources = family_members(template, values)
+
+    def compute():
+        # 식마다 비용 검사를 거친 뒤에 한꺼번에 계산합니다.
+        for source in sources:
+            get_compiled(source)
+        cols = kept_columns(len(sources), n_max - n_min + 1)
+        with span("family_evaluate"):
+            rows = _broadcast_family(template, param, values, n_min, n_max, cols)
+            matrix = _stack_rows(sources, n_min, n_max, cols, rows)
+        return _finish(labels, sources, n_min + cols, matrix)
+
+    return FAMILY_CACHE.get_or_compute(("family", template, values, n_min, n_max), compute)
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+입력 식 비용 검사
+
+sympify는 식을 해석하는 순간 상수 부분을 정확한 정수로 계산해 버리므로
+(예: 10**10**10), 해석 전에 Python 구문 트리만 보고 먼저 걸러 냅니다.
+- 허용된 문법(수, 이름, 사칙연산·거듭제곱, 허용 목록의 함수 호출)만 통과
+- 깊이·노드 수·상수 지수 크기 제한 (** 와 Pow(밑, 지수) 모두)
+- 항의 크기(자릿수) 상한을 추정해, 정확한 정수 계산이 너무 비싸면
+  float64 계산만 쓰도록 알려 줍니다 (exact_ok).
+"""
+import ast
+import math
+from dataclasses import dataclass
+
+MAX_SOURCE_LENGTH = 300
+MAX_DEPTH = 50
+MAX_NODES = 300
+# 상수 지수의 절댓값 상한 (10**10**10 같은 탑을 막음)
+MAX_EXPONENT = 10**6
+# 상수 부분이 가질 수 있는 최대 자릿수 (sympify가 정확히 계산하므로)
+MAX_CONSTANT_DIGITS = 10**6
+# 항별 정확 계산(정수 연산)을 허락하는 최대 자릿수
+EXACT_DIGITS = 10**4
+
+_LOG10_2 = math.log10(2)
+_LOG10_E = math.log10(math.e)
+_LOG10_PHI = math.log10((1 + math.sqrt(5)) / 2)
+
+_ALLOWED_BINOPS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.BitXor, ast.Mod, ast.FloorDiv)
+_ALLOWED_UNARY = (ast.UAdd, ast.USub)
+_KNOWN_CONSTANTS = {"E": math.e, "pi": math.pi}
+
+# 쓸 수 있는 함수와 크기 모형 (_Magnitude.visit_Call).
+# 목록에 없는 함수(nextprime, pow 등)는 sympify 가 곧바로 계산해 버릴 수 있으므로 받지 않습니다.
+_BOUNDED_FUNCTIONS = {"sin", "cos", "sign", "asin", "acos", "atan", "acot", "tanh", "frac"}
+_SAME_SIZE_FUNCTIONS = {"Abs", "abs", "re", "im", "floor", "ceiling", "Min", "Max", "Mod", "Rational", "tan", "cot", "sec", "csc"}
+ALLOWED_FUNCTIONS = frozenset(_BOUNDED_FUNCTIONS | _SAME_SIZE_FUNCTIONS | {
+    "Pow", "exp", "sinh", "cosh", "log", "ln", "asinh", "acosh", "sqrt", "cbrt",
+    "factorial", "gamma", "binomial", "harmonic", "fibonacci", "lucas", "catalan",
+})
+
+
+class ExpressionRejected(ValueError):
+    """비용이 너무 크거나 허용되지 않는 식"""
+
+
+def _digits(x):
+    """log10 자릿수 → 실제 값 (너무 크면 inf)"""
+    return 10.0 ** x if x < 300 else math.inf
+
+
+@dataclass(frozen=True)
+class CostReport:
+    source: str
+    tree: ast.AST
+    depth: int
+    nodes: int
+
+    def log10_magnitude(self, n_max):
+        """1 ≤ n ≤ n_max 에서 |a_n| 의 대략적인 log10 상한"""
+        return _Magnitude(max(n_max, 1)).visit(self.tree.body)[0]
+
+    def exact_ok(self, n_max):
+        """n_max 까지 항별 정확 계산을 해도 되는지"""
+        return self.log10_magnitude(n_max) <= EXACT_DIGITS
+
+
+class _Magnitude(ast.NodeVisitor):
+    """
+    노드마다 (log10 상한, 상수값 또는 None)을 돌려주는 추상 해석
+    상수값은 지수 크기를 정확히 보기 위해서만 씁니다.
+    """
+
+    def __init__(self, n_max):
+        self.log_n = math.log10(n_max)
+
+    def visit_Constant(self, node):
+        v = abs(float(node.value)) if not isinstance(node.value, int) or node.value.bit_length() < 1000 else math.inf
+        return (math.log10(v) if v > 0 else -math.inf), v
+
+    def visit_Name(self, node):
+        if node.id == "n":
+            return self.log_n, None
+        if node.id in _KNOWN_CONSTANTS:
+            v = _KNOWN_CONSTANTS[node.id]
+            return math.log10(v), v
+        return 0.0, None
+
+    def visit_UnaryOp(self, node):
+        return self.visit(node.operand)
+
+    def visit_BinOp(self, node):
+        (a, va), (b, vb) = self.visit(node.left), self.visit(node.right)
+        const = va is not None and vb is not None
+        if isinstance(node.op, (ast.Add, ast.Sub)):
+            mag = max(a, b) + _LOG10_2
+            return mag, (_digits(mag) if const else None)
+        if isinstance(node.op, ast.Mult):
+            mag = a + b
+            return mag, (_digits(mag) if const else None)
+        if isinstance(node.op, (ast.Div, ast.FloorDiv, ast.Mod)):
+            return a, (_digits(a) if const else None)
+        return self._power((a, va), (b, vb))
+
+    @staticmethod
+    def _power(base, exponent):
+        """거듭제곱: |b^e| ≤ max(|b|, 1)^|e|"""
+        (a, va), (b, vb) = base, exponent
+        e = vb if vb is not None else _digits(b)
+        mag = max(a, 0.0) * e if e != 0 else 0.0
+        if math.isnan(mag):
+            mag = 0.0
+        return mag, (_digits(mag) if va is not None and vb is not None else None)
+
+    def visit_Call(self, node):
+        args = [self.visit(arg) for arg in node.args]
+        name = node.func.id
+        if name == "Pow" and len(args) == 2:
+            return self._power(*args)
+        const = all(v is not None for _, v in args)
+        a = args[0][0] if args else 0.0
+        if name in ("factorial", "gamma"):
+            x = max(_digits(a), 1.0)
+            mag = x * math.log10(x)
+        elif name == "binomial":
+            mag = _digits(a) * _LOG10_2
+        elif name in ("exp", "sinh", "cosh"):
+            mag = _digits(a) * _LOG10_E
+        elif name in ("fibonacci", "lucas"):
+            mag = _digits(a) * _LOG10_PHI + 1
+        elif name == "catalan":
+            mag = _digits(a) * 2 * _LOG10_2
+        elif name in _BOUNDED_FUNCTIONS:
+            mag = 0.0
+        elif name in ("log", "ln", "asinh", "acosh"):
+            mag = math.log10(max(a, 1.0) * 2.31)
+        elif name == "harmonic":
+            mag = math.log10(max(a, 1.0) * 2.31 + 1)
+        elif name in ("sqrt", "cbrt"):
+            mag = a / 2
+        elif name in _SAME_SIZE_FUNCTIONS:
+            mag = max((m for m, _ in args), default=0.0)
+        else:
+            # 크기 모형이 없는 함수: 상한을 모르므로 정확 계산을 하지 않고, 상수 인수면 받지 않습니다.
+            mag = math.inf
+        return mag, (_digits(mag) if const else None)
+
+    def generic_visit(self, node):
+        return 0.0, None
+
+
+def _walk(node, depth, stats):
+    stats["nodes"] += 1
+    stats["depth"] = max(stats["depth"], depth)
+    if stats["nodes"] > MAX_NODES:
+        raise ExpressionRejected(f"식이 너무 깁니다 (노드 {MAX_NODES}개 초과).")
+    if stats["depth"] > MAX_DEPTH:
+        raise ExpressionRejected(f"식이 너무 깊게 중첩되어 있습니다 (깊이 {MAX_DEPTH} 초과).")
+
+    if isinstance(node, ast.Expression):
+        _walk(node.body, depth + 1, stats)
+    elif isinstance(node, ast.BinOp):
+        if not isinstance(node.op, _ALLOWED_BINOPS):
+            raise ExpressionRejected("허용되지 않는 연산이 들어 있습니다.")
+        _walk(node.left, depth + 1, stats)
+        _walk(node.right, depth + 1, stats)
+    elif isinstance(node, ast.UnaryOp):
+        if not isinstance(node.op, _ALLOWED_UNARY):
+            raise ExpressionRejected("허용되지 않는 연산이 들어 있습니다.")
+        _walk(node.operand, depth + 1, stats)
+    elif isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name) or node.keywords or node.func.id.startswith("_"):
+            raise ExpressionRejected("함수는 sin(n), log(n)처럼 이름(인수) 꼴로만 쓸 수 있습니다.")
+        if node.func.id not in ALLOWED_FUNCTIONS:
+            raise ExpressionRejected(
+                f"{node.func.id} 함수는 쓸 수 없습니다 (쓸 수 있는 함수: {', '.join(sorted(ALLOWED_FUNCTIONS))})."
+            )
+        for arg in node.args:
+            if isinstance(arg, ast.Starred):
+                raise ExpressionRejected("허용되지 않는 문법이 들어 있습니다.")
+            _walk(arg, depth + 1, stats)
+    elif isinstance(node, ast.Name):
+        if node.id.startswith("_"):
+            raise ExpressionRejected("밑줄(_)로 시작하는 이름은 쓸 수 없습니다.")
+    elif isinstance(node, ast.Constant):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise ExpressionRejected("식에는 수와 n만 쓸 수 있습니다.")
+    else:
+        raise ExpressionRejected("허용되지 않는 문법이 들어 있습니다.")
+
+
+class _ConstantLimits(ast.NodeVisitor):
+    """n과 무관한 상수 부분이 sympify 단계에서 폭발하지 않는지 검사합니다."""
+
+    def __init__(self):
+        self.mag = _Magnitude(1)
+
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, (ast.Pow, ast.BitXor)):
+            self._check_exponent(node.right)
+        self._check_constant(node)
+
+    def visit_Call(self, node):
+        self.generic_visit(node)
+        if node.func.id == "Pow" and len(node.args) == 2:
+            self._check_exponent(node.args[1])
+        self._check_constant(node)
+
+    def _check_exponent(self, node):
+        _, exponent = self.mag.visit(node)
+        if exponent is not None and exponent > MAX_EXPONENT:
+            raise ExpressionRejected(f"지수가 너무 큽니다 (상수 지수는 {MAX_EXPONENT:,} 이하).")
+
+    def _check_constant(self, node):
+        mag, value = self.mag.visit(node)
+        if value is not None and mag > MAX_CONSTANT_DIGITS:
+            raise ExpressionRejected(f"상수 부분이 너무 큰 수가 됩니다 (약 10^{mag:.3g}).")
+
+
+def _parse_sympy_notation(source):
+    """
+    'n!' 처럼 Python 문법은 아니지만 sympify가 받아 주는 표기는
+    계산하지 않고(evaluate=False) 해석한 뒤 그 문자열을 다시 구문 트리로 만듭니다.
+    """
+    import sympy as sp
+
+    try:
+        expr = sp.sympify(source, evaluate=False)
+        return ast.parse(str(expr), mode="eval")
+    except Exception:
+        return None
+
+
+def check_expression(expr_str):
+    """
+    expr_str을 sympify 하기 전에 검사합니다.
+    반환: CostReport, 허용할 수 없으면 ExpressionRejected
+    """
+    source = str(expr_str)
+    if len(source) > MAX_SOURCE_LENGTH:
+        raise ExpressionRejected(f"식이 너무 깁니다 ({MAX_SOURCE_LENGTH}자 이하로 입력해 주세요).")
+    try:
+        tree = ast.parse(source.strip(), mode="eval")
+    except (SyntaxError, ValueError):
+        tree = _parse_sympy_notation(source)
+        if tree is None:
+            # 문법 오류는 평소처럼 '해석할 수 없음'으로 처리되도록 sympify에 맡깁니다.
+            return None
+    stats = {"nodes": 0, "depth": 0}
+    _walk(tree, 0, stats)
+    _ConstantLimits().visit(tree)
+    return CostReport(source=source, tree=tree, depth=stats["depth"], nodes=stats["nodes"])
@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+"""
+수열 가속(convergence acceleration)을 이용한 극한 추정
+
+꼬리 몇 항의 평균 대신, 항 배열 전체에 다음 변환을 벡터 연산으로 적용합니다.
+- Aitken Δ² (반복 적용)
+- Richardson 외삽 (h = 1/n 에 대한 다항 외삽, Neville 방식)
+- Wynn ε 알고리즘 (Shanks 변환)
+증가분 Δa_n 의 부호와 감소 속도를 보고 수렴 / ±∞ 발산 / 진동을 가리고,
+ln n, 1/ln n, 1/n^0.05 처럼 유한한 항으로는 가를 수 없을 만큼 느린 수열은 판단을 미룹니다(UNKNOWN).
+변환 함수들은 마지막 축을 따라 계산하므로 2차원 배열(수열 × n)에도 그대로 쓸 수 있습니다.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+# 판정 이름은 numpy 없이 쓸 수 있도록 seqlab.core 에 둡니다.
+from seqlab.core import CONVERGES, DIVERGES_NEG, DIVERGES_POS, OSCILLATES, UNKNOWN
+
+# 판단에 쓰는 꼬리 항 수
+TAIL_WINDOW = 400
+# 가속 변환에 넣는 마지막 항 수 (너무 많으면 반올림 오차가 커집니다)
+ACCEL_WINDOW = 24
+# 증가분의 부호가 이 비율 이상 바뀌면 '오르내리는' 수열로 봅니다.
+ALTERNATION_RATIO = 0.2
+# 진동 폭이 n^-p 로 줄어들 때, 이 p보다 크면 수렴으로 봅니다.
+OSCILLATION_DECAY = 0.3
+# 한 방향으로 움직이는 수열의 |Δa_n| ~ n^-p 에서, p 가 1 + DIVERGE_MARGIN/ln n 이하면 발산.
+# ln n 은 p = 1 이지만 ln ln n 은 p ≈ 1 + 1/ln n, 1/ln n 은 p ≈ 1 + 2/ln n 이라 p 하나로는 가를 수 없으므로
+# 수렴은 p 를 n → ∞ 로 옮긴 값(p∞)이 1 + SLOW_MARGIN 이상일 때만 봅니다. 꼬리의 n 범위가 좁아
+# p 가 어떻게 변하는지 보이지 않으면 p ≥ 1 + CONVERGE_MARGIN/ln n 을 씁니다. 그 사이는 판단 보류.
+DIVERGE_MARGIN = 0.3
+CONVERGE_MARGIN = 3.0
+SLOW_MARGIN = 0.1
+# 이 p 보다 느리면(|a_n - L| ~ n^-(p-1), 1/√n 등) 외삽한 거리 전체를 오차로 봅니다.
+# (처음 50항으로 옮긴 p∞ 가 1/n 은 1.75, 1/√n 은 1.4 정도)
+SUBLINEAR_RATE = 1.6
+# 반올림 잡음으로 보는 증가분의 크기 (항의 크기에 대한 비)
+ROUNDING_NOISE = 1e-13
+# 꼬리의 n 범위가 좁으면(ln(n_끝/n_처음) < 1) p 추정이 흔들리므로,
+# 진동 폭이 이 비율(× max(1, |항|)) 이하일 때만 수렴으로 봅니다.
+NARROW_AMPLITUDE = 1e-3
+
+
+@dataclass(frozen=True)
+class LimitEstimate:
+    kind: str
+    value: float
+    error: float
+    method: str
+
+    @property
+    def confidence(self):
+        """'high' / 'medium' / 'low' (수렴으로 판단한 경우의 상대 오차 기준)"""
+        if self.kind != CONVERGES or not np.isfinite(self.error):
+            return "low"
+        rel = self.error / max(1.0, abs(self.value))
+        if rel < 1e-6:
+            return "high"
+        if rel < 1e-2:
+            return "medium"
+        return "low"
+
+
+# -----------------------------
+# 가속 변환
+# -----------------------------
+def aitken(x):
+    """Aitken Δ²: 길이가 2 줄어든 배열. 분모가 0인 자리는 원래 값을 씁니다."""
+    x = np.asarray(x, dtype=float)
+    d1 = x[..., 1:] - x[..., :-1]
+    d2 = d1[..., 1:] - d1[..., :-1]
+    with np.errstate(all="ignore"):
+        out = x[..., 2:] - d1[..., 1:] ** 2 / d2
+    return np.where(np.isfinite(out), out, x[..., 2:])
+
+
+def richardson(x, n, order):
+    """
+    a_n ≈ L + c1/n + c2/n² + ... (order 차) 를 가정한 Richardson 외삽
+    연속한 order+1 항마다 추정값 하나: 길이가 order 줄어든 배열
+    """
+    t = np.asarray(x, dtype=float)
+    h = 1.0 / np.asarray(n, dtype=float)
+    with np.errstate(all="ignore"):
+        for j in range(1, order + 1):
+            h_lo, h_hi = h[..., :-j], h[..., j:]
+            t = (h_lo * t[..., 1:] - h_hi * t[..., :-1]) / (h_lo - h_hi)
+    return t
+
+
+def wynn_epsilon(x, max_order=None):
+    """
+    Wynn ε 표의 짝수 열(Shanks 변환 결과)을 차례로 돌려줍니다.
+    반환: [ε_0, ε_2, ε_4, ...] 각 열은 길이가 2씩 줄어든 배열
+    """
+    x = np.asarray(x, dtype=float)
+    length = x.shape[-1]
+    if max_order is None:
+        max_order = length - 1
+    prev = np.zeros(x.shape[:-1] + (length + 1,))
+    cur = x
+    columns = [x]
+    with np.errstate(all="ignore"):
+        for k in range(1, min(max_order, length - 1) + 1):
+            nxt = prev[..., 1:cur.shape[-1]] + 1.0 / (cur[..., 1:] - cur[..., :-1])
+            prev, cur = cur, nxt
+            if k % 2 == 0:
+                columns.append(cur)
+    return columns
+
+
+# -----------------------------
+# 추정
+# -----------------------------
+def _stable_last(seqs):
+    """여러 추정값 수열 중, 마지막 두 값의 차이가 가장 작은 것의 마지막 값"""
+    best, best_change = np.nan, np.inf
+    for s in seqs:
+        s = np.asarray(s, dtype=float)
+        if s.shape[-1] < 2 or not np.all(np.isfinite(s[-2:])):
+            continue
+        change = abs(s[-1] - s[-2])
+        if change < best_change:
+            best, best_change = float(s[-1]), change
+    return best
+
+
+def _aitken_estimate(x, ns):
+    iterates, cur = [], x
+    while cur.shape[-1] >= 4 and len(iterates) < 5:
+        cur = aitken(cur)
+        iterates.append(cur)
+    return _stable_last(iterates)
+
+
+def _richardson_estimate(x, ns):
+    return _stable_last([richardson(x, ns, order) for order in range(1, 7) if len(x) > order + 1])
+
+
+def _wynn_estimate(x, ns):
+    return _stable_last(wynn_epsilon(x)[1:])
+
+
+METHODS = {
+    "aitken": _aitken_estimate,
+    "richardson": _richardson_estimate,
+    "wynn_epsilon": _wynn_estimate,
+}
+
+
+def _method_estimate(name, x, ns):
+    """
+    마지막 ACCEL_WINDOW 항으로 구한 추정값과, 꼬리를 1/4 만큼 앞당겨 구한
+    추정값의 차이를 오차로 삼습니다. (방법이 제대로 수렴했다면 둘은 거의 같습니다.)
+    """
+    func = METHODS[name]
+    shift = max(len(x) // 4, 1)
+    value = func(x[-ACCEL_WINDOW:], ns[-ACCEL_WINDOW:])
+    earlier = func(x[:-shift][-ACCEL_WINDOW:], ns[:-shift][-ACCEL_WINDOW:])
+    error = abs(value - earlier) if np.isfinite(earlier) else np.inf
+    return value, error
+
+
+def _best_estimate(x, ns, methods, monotone_p=None):
+    """methods 중 오차가 가장 작은 추정 (value, error, method)"""
+    results = []
+    for name in methods:
+        value, error = _method_estimate(name, x, ns)
+        if np.isfinite(value):
+            results.append((value, error, name))
+    if not results:
+        return float(x[-1]), float(abs(x[-1] - x[-2])), "last_term"
+    value, error, name = min(results, key=lambda r: r[1])
+    if monotone_p is not None and monotone_p > 1:
+        # 대수적 수렴 a_n ≈ L + C n^{-(p-1)} 이면 L ≈ a_N + Δa_N · N / (p - 1)
+        # 느린 수렴에서 외삽이 지나치게 자신하지 않도록 교차 확인합니다. 참값이 power_tail 쪽에 있기 쉬우므로
+        # (1/n^1.05 등) 그 거리의 두 배까지 덮습니다.
+        power_tail = x[-1] + (x[-1] - x[-2]) / (ns[-1] - ns[-2]) * ns[-1] / (monotone_p - 1)
+        error = max(error, 2 * abs(value - power_tail))
+        if monotone_p < SUBLINEAR_RATE:
+            error = max(error, abs(value - x[-1]))
+    return float(value), float(error), name
+
+
+def _increment_exponent(ns, slopes, ok):
+    """
+    n 하나당 증가분 slopes ~ n^-p 의 p 와, p(n) = p∞ + c/ln n 으로 보고 앞·뒤 절반(로그 간격)의 p 로 옮긴 p∞
+    ok: 반올림 잡음보다 큰 증가분 (맞추는 데 쓸 자리)
+    꼬리의 n 범위가 좁으면(ln(n_끝/n_처음) < 1) 두 절반의 p 차이가 잡음이므로 p∞ 대신 None
+    """
+    def fit(mask):
+        return -float(np.polyfit(np.log(ns[mask]), np.log(slopes[mask]), 1)[0])
+
+    p = fit(ok)
+    if np.log(ns[-1] / ns[0]) < 1.0:
+        return p, None
+    early = ok & (ns <= np.sqrt(ns[0] * ns[-1]))
+    late = ok & ~early
+    if early.sum() < 3 or late.sum() < 3:
+        return p, None
+    inv_early, inv_late = 1 / np.mean(np.log(ns[early])), 1 / np.mean(np.log(ns[late]))
+    p_early, p_late = fit(early), fit(late)
+    c = (p_early - p_late) / (inv_early - inv_late)
+    return p, p_late - c * inv_late
+
+
+def _decay_exponent(ns, mags, windows=8):
+    """|Δa_n| 의 구간별 최댓값이 n^-p 로 줄어든다고 보고 p를 추정합니다."""
+    size = max(len(mags) // windows, 2)
+    usable = len(mags) // size * size
+    if usable < 2 * size:
+        return 0.0
+    peak = mags[-usable:].reshape(-1, size).max(axis=1)
+    centers = ns[-usable:].reshape(-1, size).mean(axis=1)
+    ok = peak > 0
+    if ok.sum() < 2:
+        return np.inf
+    return -float(np.polyfit(np.log(centers[ok]), np.log(peak[ok]), 1)[0])
+
+
+def estimate_limit(values, n=None):
+    """
+    values: 항 배열 (NaN 허용)
+    n: 각 항의 번호 (생략하면 1, 2, 3, ...)
+    반환: LimitEstimate(kind, value, error, method)
+    """
+    x = np.asarray(values, dtype=float)
+    ns = np.arange(1, len(x) + 1, dtype=float) if n is None else np.asarray(n, dtype=float)
+    ok = np.isfinite(x)
+    x, ns = x[ok][-TAIL_WINDOW:], ns[ok][-TAIL_WINDOW:]
+    if len(x) < 10:
+        return LimitEstimate(UNKNOWN, np.nan, np.nan, "too_few_terms")
+
+    size = float(np.max(np.abs(x)))
+    scale = max(1.0, size)
+    noise = ROUNDING_NOISE * size
+    d = np.diff(x)
+    mags = np.abs(d)
+    # 꼬리 전체의 움직임이 항 크기의 반올림 잡음 안이어야 상수 (1e-10 근처의 1/n² 은 상수가 아님)
+    if np.ptp(x) <= noise:
+        return LimitEstimate(CONVERGES, float(x[-1]), float(np.ptp(x)), "constant_tail")
+
+    signs = np.sign(d[mags > noise])
+    flips = np.count_nonzero(signs[1:] != signs[:-1]) / max(len(signs) - 1, 1)
+
+    if flips >= ALTERNATION_RATIO:
+        # 오르내리는 수열: 진동 폭이 충분히 빨리 줄어들면 수렴
+        amplitude = float(np.ptp(x[-len(x) // 4:])) / 2
+        wide = np.log(ns[-1] / ns[0]) >= 1.0
+        if _decay_exponent(ns[1:], mags) > OSCILLATION_DECAY and (wide or amplitude <= NARROW_AMPLITUDE * scale):
+            value, error, method = _best_estimate(x, ns, ["wynn_epsilon", "aitken"])
+            return LimitEstimate(CONVERGES, value, error, method)
+        return LimitEstimate(OSCILLATES, np.nan, amplitude, "alternating_increments")
+
+    # 결국 한 방향으로 움직이는 수열: |Δa_n| ~ n^-p 의 p로 판단
+    # (n 이 띄엄띄엄 주어지면 증가분을 n 간격으로 나눠 n 하나당 증가분으로 봅니다.)
+    nz = mags > noise
+    if nz.sum() < 3:
+        return LimitEstimate(CONVERGES, float(x[-1]), float(mags[-1]), "last_term")
+    slopes = mags / np.diff(ns)
+    p, p_inf = _increment_exponent(ns[1:], slopes, nz)
+    direction = float(np.sign(np.median(d)))
+    log_n = np.log(max(float(np.median(ns)), 3.0))
+    if p <= 1.0 + DIVERGE_MARGIN / log_n:
+        kind = DIVERGES_POS if direction > 0 else DIVERGES_NEG
+        return LimitEstimate(kind, np.inf * direction, np.nan, f"increment_decay(p={p:.2f})")
+    ratios = slopes[nz][1:] / slopes[nz][:-1]
+    if np.ptp(ratios[-10:]) < 1e-3 and ratios[-1] < 0.95:
+        # 기하적 수렴 (r^n 꼴): Aitken / Wynn 이 정확합니다.
+        value, error, method = _best_estimate(x, ns, ["aitken", "wynn_epsilon"])
+        return LimitEstimate(CONVERGES, value, error, method)
+    slow = p < 1.0 + CONVERGE_MARGIN / log_n if p_inf is None else p_inf < 1.0 + SLOW_MARGIN
+    if slow:
+        # ln ln n (발산)과 1/ln n, 1/n^0.05 (수렴)처럼 증가분만으로는 가를 수 없는 느린 수열
+        return LimitEstimate(UNKNOWN, np.nan, np.nan, f"slow_increment_decay(p={p:.2f})")
+    rate = p if p_inf is None else min(p, p_inf)
+    value, error, method = _best_estimate(x, ns, ["richardson", "wynn_epsilon"], monotone_p=rate)
+    return LimitEstimate(CONVERGES, value, error, method)
+
+
+def estimate_limits(values, n=None):
+    """
+    values: 2차원 배열 (수열 × n), 행마다 estimate_limit
+    판정에는 꼬리 TAIL_WINDOW 항만 쓰므로 행이 많아도 n 범위가 넓어도 비용은 행 수에 비례합니다.
+    반환: [LimitEstimate, ...]
+    """
+    values = np.asarray(values, dtype=float)
+    ns = np.arange(1, values.shape[-1] + 1, dtype=float) if n is None else np.asarray(n, dtype=float)
+    tail = slice(-TAIL_WINDOW, None)
+    return [estimate_limit(row[tail], ns[tail]) for row in values]
+
+
+def round_limit(value, error):
+    """
+    극한 추정값을 오차(2배) 안에 드는 가장 짧은 소수로 반올림합니다 (그 안에 0 이 있으면 0).
+    0.99999999995 ± 5e-11 은 1.0 이 됩니다. 오차 자릿수까지 내려가도 안 되면 그 자릿수에서 반올림합니다.
+    error 가 0(기호 계산으로 구한 값)이거나 유한하지 않으면 그대로 둡니다.
+    """
+    value = float(value)
+    if not np.isfinite(value) or not np.isfinite(error) or error <= 0:
+        return value
+    reach = 2 * error  # properties._snap_limit 과 같은 여유
+    if abs(value) <= reach:
+        return 0.0
+    last = -int(np.floor(np.log10(error)))
+    for digits in range(-int(np.floor(np.log10(abs(value)))), last):
+        rounded = round(value, digits)
+        if abs(rounded - value) <= reach:
+            return rounded + 0.0
+    return round(value, last) + 0.0
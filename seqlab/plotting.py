@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+항이 많은 수열을 위한 그래프 도우미
+
+모든 점을 브라우저로 보내는 대신, 모양을 지키는 LTTB
+(Largest-Triangle-Three-Buckets) 방식으로 화면 픽셀 수 정도의 점만 골라 보냅니다.
+점이 많으면 WebGL(Scattergl) 트레이스를 쓰고, n축 로그 스케일도 고를 수 있습니다.
+항이 몇 개든 그래프 데이터 크기와 그리는 시간은 거의 일정합니다.
+"""
+import numpy as np
+import plotly.graph_objects as go
+
+from seqlab.telemetry import span
+
+# 트레이스 하나에 보내는 최대 점 수 (넓은 화면의 가로 픽셀 수 정도)
+MAX_POINTS = 2000
+# 원래 항 수가 이보다 많으면 WebGL 트레이스를 씁니다.
+WEBGL_THRESHOLD = 1000
+# 보내는 점이 이 이하일 때만 점 표시(marker)를 그립니다.
+MARKER_THRESHOLD = 120
+
+
+def lttb_indices(x, y, n_out, edges=None):
+    """
+    LTTB로 고른 점의 인덱스 (처음과 끝 점은 항상 포함)
+    edges: 가운데 구간들의 경계 인덱스 (생략하면 점 개수로 고르게 나눔)
+    """
+    size = len(x)
+    if n_out >= size or n_out < 3:
+        return np.arange(size)
+    if edges is None:
+        edges = np.linspace(1, size - 1, n_out - 1).astype(int)
+    edges = np.unique(np.clip(edges, 1, size - 1))
+
+    chosen = np.empty(len(edges) + 1, dtype=np.int64)
+    chosen[0] = 0
+    prev = 0
+    for i in range(len(edges) - 1):
+        lo, hi = edges[i], edges[i + 1]
+        if hi <= lo:
+            chosen[i + 1] = lo
+            continue
+        # 다음 구간의 평균점 (마지막 구간이면 끝 점)
+        if i + 2 < len(edges):
+            nlo, nhi = edges[i + 1], edges[i + 2]
+            cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        else:
+            cx, cy = x[-1], y[-1]
+        px_, py_ = x[prev], y[prev]
+        area = np.abs((px_ - cx) * (y[lo:hi] - py_) - (px_ - x[lo:hi]) * (cy - py_))
+        prev = lo + int(np.argmax(area))
+        chosen[i + 1] = prev
+    chosen[-1] = size - 1
+    return np.unique(chosen)
+
+
+def select_points(x, y, max_points=MAX_POINTS, log_x=False):
+    """
+    그래프에 남길 점의 인덱스: 유한한 점만 남긴 뒤 LTTB로 max_points 개 이하로 고릅니다.
+    log_x: n축 로그 스케일일 때, 로그 간격으로 구간을 나누어 화면 기준으로 고르게 고릅니다.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    ok = np.isfinite(x) & np.isfinite(y)
+    if log_x:
+        ok &= x > 0
+    keep = np.flatnonzero(ok)
+    if len(keep) <= max_points:
+        return keep
+    x, y = x[keep], y[keep]
+    if log_x:
+        lx = np.log10(x)
+        bounds = np.linspace(lx[1], lx[-1], max_points - 1)
+        edges = np.searchsorted(lx, bounds)
+        return keep[lttb_indices(lx, y, max_points, edges=edges)]
+    return keep[lttb_indices(x, y, max_points)]
+
+
+def downsample(x, y, max_points=MAX_POINTS, log_x=False):
+    """select_points로 고른 (x, y)"""
+    idx = select_points(x, y, max_points=max_points, log_x=log_x)
+    return np.asarray(x, dtype=float)[idx], np.asarray(y, dtype=float)[idx]
+
+
+def line_figure(x, series, max_points=MAX_POINTS, log_x=False, title=None,
+                x_title="n", y_title=None, legend_title=None):
+    """
+    series: {이름: y 배열} (같은 x를 공유)
+    반환: plotly Figure (트레이스마다 점 수가 max_points 이하)
+    """
+    total = len(x)
+    trace_cls = go.Scattergl if total > WEBGL_THRESHOLD else go.Scatter
+    with span("downsample"):
+        points = {name: downsample(x, y, max_points=max_points, log_x=log_x) for name, y in series.items()}
+    with span("figure"):
+        fig = go.Figure()
+        for name, (xs, ys) in points.items():
+            mode = "lines+markers" if len(xs) <= MARKER_THRESHOLD else "lines"
+            fig.add_trace(trace_cls(x=xs, y=ys, mode=mode, name=name))
+        fig.update_layout(
+            title=title,
+            xaxis_title=x_title,
+            yaxis_title=y_title if y_title is not None else (next(iter(series)) if len(series) == 1 else None),
+            legend_title_text=legend_title,
+            showlegend=len(series) > 1,
+        )
+    if log_x:
+        fig.update_xaxes(type="log")
+    return fig
+
+
+def animated_line_figure(x, frames, log_x=False, title=None, x_title="n", y_title=None, slider_prefix=""):
+    """
+    frames: {프레임 이름: {트레이스 이름: y 배열}} (프레임마다 트레이스 이름이 같아야 함)
+    모든 프레임을 그림 안에 담아, 슬라이더·재생 버튼이 서버 왕복 없이 브라우저에서 바뀝니다.
+    프레임 수 × 점 수가 그대로 전송되므로 x는 select_points로 미리 줄여서 넘기세요.
+    """
+    x = np.asarray(x, dtype=float)
+
+    def traces(series):
+        return [go.Scatter(x=x, y=np.asarray(y, dtype=float), mode="lines", name=name) for name, y in series.items()]
+
+    # 모든 프레임이 같은 y 범위를 쓰도록 미리 정합니다 (프레임마다 축이 흔들리지 않게).
+    ys = np.concatenate([np.asarray(y, dtype=float) for series in frames.values() for y in series.values()])
+    ys = ys[np.isfinite(ys)]
+    y_range = [float(ys.min()), float(ys.max())] if len(ys) else None
+    if y_range is not None and y_range[0] == y_range[1]:
+        y_range = [y_range[0] - 1, y_range[1] + 1]
+
+    names = list(frames)
+    fig = go.Figure(
+        data=traces(frames[names[0]]),
+        frames=[go.Frame(data=traces(series), name=name) for name, series in frames.items()],
+    )
+    fig.update_layout(
+        title=title,
+        xaxis_title=x_title,
+        yaxis_title=y_title,
+        yaxis_range=y_range,
+        updatemenus=[{
+            "type": "buttons",
+            "showactive": False,
+            "x": 0, "y": -0.15, "xanchor": "left",
+            "buttons": [
+                {"label": "▶", "method": "animate",
+                 "args": [None, {"frame": {"duration": 300, "redraw": True}, "fromcurrent": True}]},
+                {"label": "⏸", "method": "animate",
+                 "args": [[None], {"frame": {"duration": 0}, "mode": "immediate"}]},
+            ],
+        }],
+        sliders=[{
+            "active": 0,
+            "x": 0.1, "len": 0.9, "y": -0.1,
+            "currentvalue": {"prefix": slider_prefix},
+            "steps": [
+                {"label": name, "method": "animate",
+                 "args": [[name], {"frame": {"duration": 0, "redraw": True}, "mode": "immediate"}]}
+                for name in names
+            ],
+        }],
+    )
+    if log_x:
+        fig.update_xaxes(type="log")
+    return fig
+
+
+def overlay_figure(x, labels, values, max_points=MAX_POINTS, log_x=False, log_y=False, title=None,
+                   x_title="n", y_title=None, y_range=None, colorscale="Viridis"):
+    """
+    values: 2차원 배열 (수열 × n), 행마다 labels 의 이름
+    수열이 수십 개여도 그림 하나(WebGL)로 그리고, 전체 점 수가 max_points 의 몇 배를 넘지 않도록
+    행마다 보내는 점 수를 나눕니다. 색은 행 순서대로 colorscale 에서 고르게 뽑습니다 (가족의 매개변수 순서).
+    """
+    from plotly.colors import sample_colorscale
+
+    values = np.asarray(values, dtype=float)
+    count = len(values)
+    per_series = max(200, 4 * max_points // max(count, 1))
+    colors = sample_colorscale(colorscale, [i / max(count - 1, 1) for i in range(count)])
+    with span("downsample"):
+        points = [downsample(x, row, max_points=per_series, log_x=log_x) for row in values]
+    with span("figure"):
+        fig = go.Figure([
+            go.Scattergl(x=xs, y=ys, mode="lines", name=name, line=dict(width=1.5, color=color))
+            for name, (xs, ys), color in zip(labels, points, colors)
+        ])
+        fig.update_layout(
+            title=title,
+            xaxis_title=x_title,
+            yaxis_title=y_title,
+            showlegend=count > 1,
+            legend=dict(font=dict(size=10)),
+        )
+    if log_x:
+        fig.update_xaxes(type="log")
+    if log_y:
+        fig.update_yaxes(type="log")
+    if y_range is not None:
+        fig.update_yaxes(range=list(y_range))
+    return fig
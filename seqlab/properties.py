@@ -0,0 +1,344 @@
+# -*- coding: utf-8 -*-
+"""
+수열 성질 자동 판정 (스무고개 질문의 답)
+
+식 하나로부터 수렴·유계·단조·부호 변화와 변형 수열(|a_n|, n·a_n, 부분수열, a_n/n)의
+수렴 여부를 정합니다.
+- 기호 계산: 작업 프로세스의 sympy.limit (seqlab.symbolic, 제한 시간 있음)
+- 수치 근거: n = 1 ~ EVIDENCE_TERMS 항을 배열로 계산해 꼬리를 봅니다 (seqlab.limits)
+  꼬리와 float64 에서 넘친 항은 정밀 계산(seqlab.engine.precise_terms)으로 다시 구합니다.
+기호 계산이 분명한 답(유한값, ±∞, 유계 구간, 끝이 ∞ 인 구간)을 주면 그것을, 아니면 수치 근거를 씁니다.
+결과는 식마다 한 번만 계산해 캐시합니다.
+"""
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+import numpy as np
+import sympy as sp
+
+from seqlab.cache import LRUCache
+from seqlab.core import PROPERTY_KEYS
+from seqlab.engine import get_compiled, n, precise_terms, sequence_terms
+from seqlab.limits import CONVERGES, DIVERGES_NEG, DIVERGES_POS, TAIL_WINDOW, estimate_limit
+from seqlab.symbolic import JOB_TIMEOUT, OK, get_service
+
+# 수치 근거로 쓰는 항 수
+EVIDENCE_TERMS = 100_000
+# 뒤쪽 절반의 최대 |a_n| 이 앞쪽 절반의 이 배수를 넘으면 유계가 아니라고 봅니다.
+BOUNDED_GROWTH = 1.01
+# 수렴·발산 판정에 쓰는 n 범위의 배율 (n = N/JUDGE_SPAN ~ N)
+JUDGE_SPAN = 10
+# float64 에서 넘친 항 가운데 정밀 계산으로 다시 구할 최대 개수 (로그 간격)
+PRECISE_SAMPLES = 256
+# 극한 추정값이 수열의 최대 |a_n| 의 이 비율 이하이면 0 으로 적습니다 (n**-2 의 1e-10 같은 꼬리값 대신).
+# n ≤ EVIDENCE_TERMS 의 항으로는 1/n 처럼 줄어드는 수열과 이보다 작은 극한을 가릴 수 없습니다.
+ZERO_TOLERANCE = 1.0 / EVIDENCE_TERMS
+# 기호 계산 결과를 기다리는 최대 시간 (초, 작업 제한 시간 + 여유)
+SYMBOLIC_WAIT = JOB_TIMEOUT + 4.0
+
+PROPERTY_CACHE = LRUCache(max_entries=4096)
+
+# 기호 극한의 판정
+_FINITE = "finite"
+_INFINITE = "infinite"
+_BOUNDED_NO_LIMIT = "bounded_no_limit"
+_UNBOUNDED_NO_LIMIT = "unbounded_no_limit"
+_NO_LIMIT = "no_limit"
+
+
+@dataclass(frozen=True)
+class SequenceProperties:
+    source: str
+    latex: str
+    limit_value: Optional[float]
+    limit_error: Optional[float]         # 기호 계산으로 구한 극한이면 0
+    convergent: bool
+    bounded: bool
+    monotone: bool
+    sign_changes: bool
+    abs_conv: bool
+    piecewise2: bool
+    n_times_conv: bool
+    even_subseq_conv: bool
+    odd_subseq_conv: bool
+    with_1_over_n_conv: bool
+
+    def as_dict(self):
+        return asdict(self)
+
+
+def derived_expressions(expr):
+    """수렴 여부를 물어보는 변형 수열들 {성질 이름: 식}"""
+    m = sp.Symbol("m", integer=True, positive=True)
+    # 정수 심볼로 바꿔 넣어야 (-1)**(2m) = 1 처럼 정리된 뒤 다시 n으로 돌립니다.
+    even = expr.subs(n, 2 * m).subs(m, n)
+    odd = expr.subs(n, 2 * m - 1).subs(m, n)
+    return {
+        "convergent": expr,
+        "abs_conv": sp.Abs(expr),
+        "n_times_conv": n * expr,
+        "even_subseq_conv": even,
+        "odd_subseq_conv": odd,
+        "with_1_over_n_conv": expr / n,
+    }
+
+
+def _is_piecewise2(expr):
+    """짝수·홀수 항이 다른 식을 따르는지: (-1)^(n의 식), Piecewise, Mod(n, 2) 꼴"""
+    for node in sp.preorder_traversal(expr):
+        if isinstance(node, sp.Pow) and node.base == -1 and node.exp.has(n):
+            return True
+        if isinstance(node, (sp.Piecewise, sp.Mod)) and node.has(n):
+            return True
+    return False
+
+
+def _symbolic_verdict(result):
+    """(판정, 극한값) — 기호 계산으로 분명히 말할 수 없으면 (None, None)"""
+    if result is None or result.status != OK:
+        return None, None
+    if result.text == "nan":
+        return _NO_LIMIT, None
+    try:
+        value = sp.sympify(result.text)
+    except Exception:
+        return None, None
+    if isinstance(value, sp.AccumBounds):
+        # sin(n)**-2 → AccumBounds(0, oo): 끝이 ∞ 이면 드물게 튀는 항이 있어 수치 근거로는 놓치기 쉽습니다.
+        finite = value.min.is_finite and value.max.is_finite
+        return (_BOUNDED_NO_LIMIT if finite else _UNBOUNDED_NO_LIMIT), None
+    if value in (sp.oo, -sp.oo):
+        return _INFINITE, None
+    if value.is_number and value.is_finite and value.is_real:
+        return _FINITE, float(value)
+    return None, None
+
+
+def _numeric_terms(expr):
+    """
+    n = 1 ~ EVIDENCE_TERMS 의 항 (n 번째 항이 [n - 1] 자리)
+    float64 배열 계산에서 넘쳐 NaN/inf 가 된 항(2**n/(2**n+1) 의 n > 1023 등)은 로그 간격으로
+    PRECISE_SAMPLES 개까지, 꼬리 TAIL_WINDOW 항은 모두 정밀 계산으로 바꿉니다.
+    꼬리의 증가분이 float64 반올림 오차보다 작은 (1+1/n)**n 같은 수열도 판단할 수 있게 하려는 것입니다.
+    끝내 값을 알 수 없는 항은 NaN, 값이 float 범위를 넘는 항은 ±inf 입니다.
+    """
+    # 문자열을 거쳐야 비용 검사(seqlab.guard)를 받고 항 캐시도 함께 씁니다.
+    try:
+        compiled = get_compiled(str(expr))
+        terms = np.array(sequence_terms(compiled.source, 1, EVIDENCE_TERMS))
+    except ValueError:
+        return np.full(EVIDENCE_TERMS, np.nan)
+    bad = np.flatnonzero(~np.isfinite(terms[:-TAIL_WINDOW]))
+    if len(bad):
+        picks = np.unique(np.geomspace(bad[0] + 1, bad[-1] + 1, PRECISE_SAMPLES).astype(np.int64)) - 1
+        # 판정에 쓰는 항(_judge_ns)도 빠짐없이 다시 구합니다.
+        picks = np.intersect1d(np.union1d(picks, _judge_ns(EVIDENCE_TERMS) - 1), bad)
+        terms[picks] = precise_terms(compiled, picks + 1)
+    tail = np.arange(EVIDENCE_TERMS - TAIL_WINDOW, EVIDENCE_TERMS)
+    precise = precise_terms(compiled, tail + 1)
+    terms[tail] = np.where(np.isnan(precise), terms[tail], precise)
+    return terms
+
+
+def _judge_ns(count):
+    """판정에 쓰는 n: count/JUDGE_SPAN ~ count 에서 로그 간격으로 TAIL_WINDOW 개"""
+    return np.unique(np.geomspace(count / JUDGE_SPAN, count, TAIL_WINDOW).astype(np.int64))
+
+
+def _numeric_estimate(terms):
+    """
+    꼬리 TAIL_WINDOW 항만 보는 추정(estimate_limit)은 n 범위가 아주 좁아서(ln(n_끝/n_처음) ≈ 0.004)
+    진동 폭이 천천히 줄어드는 (-1)^n cos(n)/√n, 증가분이 들쭉날쭉한 1/(2n + cos 2n) 이나 2n + sin(2n - 1)
+    같은 수열을 잘못 가립니다. 판정은 마지막 JUDGE_SPAN 배 구간(n = N/JUDGE_SPAN ~ N)에서 로그 간격으로 고른
+    항들로 하고, 둘 다 수렴이라 하면 값은 더 정확한 꼬리 추정을 씁니다.
+    """
+    est = estimate_limit(terms)
+    ns = _judge_ns(len(terms))
+    wide = estimate_limit(terms[ns - 1], ns)
+    return est if est.kind == CONVERGES and wide.kind == CONVERGES else wide
+
+
+def _cross_checked_error(est, terms):
+    """
+    전체 추정의 오차를 짝수·홀수 부분수열 추정과 어긋나는 만큼 키웁니다.
+    짝·홀 항이 다른 식을 따르는 수열은 섞인 꼬리에서 두 꼬리 사이 값을 아주 작은 오차로 내놓습니다
+    (n/(n+1) 과 n²/(n²+1) 을 번갈아 놓으면 0.999995 ± 5e-9).
+    """
+    error = float(est.error)
+    for key in ("even_subseq_conv", "odd_subseq_conv"):
+        sub = _numeric_estimate(terms[key])
+        if sub.kind == CONVERGES:
+            error = max(error, abs(sub.value - est.value) + float(sub.error))
+    return error
+
+
+def _settles(terms, value):
+    """
+    수렴 판정의 교차 확인: 뒤쪽 절반에서 |a_n - L| 의 최댓값이 그 앞 1/4 구간보다 커지지 않아야 합니다.
+    꼬리 몇백 항만 보는 추정은 sin(n)**-2/n 처럼 드물게 크게 튀는 항을 놓칩니다.
+    """
+    quarter = len(terms) // 4
+    with np.errstate(all="ignore"):
+        gaps = np.abs(terms - value)
+    early, late = gaps[quarter:2 * quarter], gaps[2 * quarter:]
+    if np.isinf(late).any():
+        return False
+    early, late = early[np.isfinite(early)], late[np.isfinite(late)]
+    if not len(early) or not len(late):
+        return True
+    return bool(late.max() <= BOUNDED_GROWTH * early.max() + 1e-12 * max(1.0, abs(value)))
+
+
+def _converges(verdict, terms):
+    if verdict in (_FINITE, _INFINITE, _BOUNDED_NO_LIMIT, _UNBOUNDED_NO_LIMIT, _NO_LIMIT):
+        return verdict == _FINITE
+    est = _numeric_estimate(terms)
+    return est.kind == CONVERGES and _settles(terms, est.value)
+
+
+def _finite_tail(terms):
+    """유한한 항들의 뒤쪽 절반 (2**n 처럼 일찍 넘쳐 버리는 수열도 판단할 수 있게)"""
+    finite = terms[np.isfinite(terms)]
+    return finite[len(finite) // 2:]
+
+
+def _eventually_monotone(terms):
+    tail = _finite_tail(terms)
+    if len(tail) < 3:
+        return False
+    d = np.diff(tail)
+    tol = 1e-12 * max(1.0, float(np.max(np.abs(tail))))
+    return bool(np.all(d >= -tol) or np.all(d <= tol))
+
+
+def _sign_changes_often(terms):
+    signs = np.sign(_finite_tail(terms))
+    signs = signs[signs != 0]
+    return bool(np.count_nonzero(signs[1:] != signs[:-1]) >= 2)
+
+
+def _bounded(verdict, terms):
+    if verdict in (_FINITE, _BOUNDED_NO_LIMIT):
+        return True
+    if verdict in (_INFINITE, _UNBOUNDED_NO_LIMIT):
+        return False
+    if np.isinf(terms).any():
+        return False
+    if estimate_limit(terms).kind in (DIVERGES_POS, DIVERGES_NEG):
+        return False
+    if _grows_steadily(terms):
+        return False
+    # 진동하며 커지는 수열(n·sin n 등): 뒤쪽 절반의 최대 |a_n| 이 앞쪽보다 뚜렷이 크면 유계가 아닙니다.
+    # (값을 알 수 없는 NaN 항은 빼고 봅니다.)
+    half = len(terms) // 2
+    early, late = np.abs(terms[:half]), np.abs(terms[half:])
+    early, late = early[np.isfinite(early)], late[np.isfinite(late)]
+    if not len(late):
+        return False
+    return bool(late.max() <= BOUNDED_GROWTH * max(early.max(initial=0.0), 1e-300))
+
+
+def _grows_steadily(terms):
+    """
+    |a_n| 의 상위 사분위수가 마지막 세 자릿수 구간(n = 10²~10³, ~10⁴, ~10⁵)마다 줄지 않는 폭으로 늘어나는지.
+    log(n)²/sin(n)² 처럼 앞쪽에 아주 큰 항(sin n ≈ 0)이 있으면 최댓값 비교로는 유계처럼 보이지만,
+    사분위수는 log n 처럼 자릿수마다 꾸준히 커집니다 (한 값으로 다가가는 수열은 늘어나는 폭이 줄어듦).
+    중앙값이 아닌 것은 짝·홀 한쪽이 0 으로 가는 수열에서 중앙값이 0 근처의 잡음이 되기 때문입니다.
+    """
+    mags = np.abs(terms)
+    levels = [np.nanpercentile(mags[10 ** k - 1:10 ** (k + 1) - 1], 75)
+              for k in (2, 3, 4) if 10 ** (k + 1) <= len(mags)]
+    if len(levels) < 3 or not np.all(np.isfinite(levels)):
+        return False
+    first, second = np.diff(levels)
+    return bool(first > 0 and second >= 0.9 * first and second >= 0.1 * levels[-1])
+
+
+def _snap_limit(value, error, terms):
+    """오차(2배)·꼬리의 진동 폭 안이거나 수열 크기에 비해 아주 작은 추정값은 0 (1e-22, -3.9e-9 같은 값 대신)"""
+    finite = terms[np.isfinite(terms)]
+    amplitude = float(np.ptp(_finite_tail(terms)[-TAIL_WINDOW:])) / 2
+    scale = float(np.max(np.abs(finite))) if len(finite) else 1.0
+    error = error if np.isfinite(error) else 0.0
+    if abs(value) <= max(2 * error, amplitude, ZERO_TOLERANCE * scale, 1e-12):
+        return 0.0
+    return float(value)
+
+
+def _infer(expr, source, symbolic=True):
+    derived = derived_expressions(expr)
+    futures = {}
+    if symbolic:
+        # 기호 계산은 한꺼번에 맡겨 작업 프로세스들이 동시에 풀게 합니다.
+        service = get_service()
+        futures = {key: service.submit("limit", sp.srepr(e)) for key, e in derived.items()}
+    terms = {key: _numeric_terms(e) for key, e in derived.items()}
+
+    verdicts = {key: (None, None) for key in derived}
+    for key, fut in futures.items():
+        try:
+            verdicts[key] = _symbolic_verdict(fut.result(timeout=SYMBOLIC_WAIT))
+        except Exception:
+            pass
+
+    answers = {key: _converges(verdicts[key][0], terms[key]) for key in derived}
+    # n·a_n 이 수렴하면 a_n → 0 이므로, a_n 이 수렴하지 않는데 n·a_n 이 수렴한다는 수치 근거는 버립니다.
+    answers["n_times_conv"] = answers["n_times_conv"] and answers["convergent"]
+    if verdicts["convergent"][0] == _FINITE:
+        # 기호 계산으로 수렴이 확실하면 |a_n|, 부분수열, a_n/n 도 수렴합니다.
+        answers.update(abs_conv=True, even_subseq_conv=True, odd_subseq_conv=True, with_1_over_n_conv=True)
+    limit_value = limit_error = None
+    if answers["convergent"]:
+        limit_value, limit_error = verdicts["convergent"][1], 0.0
+        if limit_value is None:
+            est = _numeric_estimate(terms["convergent"])
+            limit_error = _cross_checked_error(est, terms)
+            limit_value = _snap_limit(est.value, limit_error, terms["convergent"])
+
+    a_terms = terms["convergent"]
+    return SequenceProperties(
+        source=source,
+        latex=sp.latex(expr),
+        limit_value=limit_value,
+        limit_error=limit_error,
+        bounded=answers["convergent"] or _bounded(verdicts["convergent"][0], a_terms),
+        monotone=_eventually_monotone(a_terms),
+        sign_changes=_sign_changes_often(a_terms),
+        piecewise2=_is_piecewise2(expr),
+        **answers,
+    )
+
+
+def infer_properties(expr_str, symbolic=True):
+    """
+    expr_str: '1/n' 같은 문자열
+    symbolic: False 이면 수치 근거만 씁니다 (카탈로그를 대량으로 만들 때)
+    반환: SequenceProperties (식마다 한 번만 계산해 캐시)
+    해석할 수 없는 식이면 ValueError
+    """
+    compiled = get_compiled(expr_str)
+    return PROPERTY_CACHE.get_or_compute(
+        (compiled.key, symbolic),
+        lambda: _infer(compiled.expr, compiled.source, symbolic),
+    )
+
+
+def catalog_entry(expr_str, preview_n, explain, name=None):
+    """
+    스무고개 SEQUENCES 항목 하나 (식에서 성질을 자동으로 채움)
+    반환: dict (name, expr, preview_n, preview, seq, explain, limit_value, PROPERTY_KEYS 의 참/거짓)
+    preview: 앞 preview_n 항 배열 (항마다 함수를 부르지 않고 엔진에서 한 번에 계산)
+    """
+    props = infer_properties(expr_str)
+    compiled = get_compiled(expr_str)
+    entry = {
+        "name": name or props.source.replace("**", "^"),
+        "expr": f"a_n = {props.latex}",
+        "preview_n": preview_n,
+        "preview": sequence_terms(compiled.source, 1, preview_n),
+        "seq": compiled.scalar_func,
+        "limit_value": props.limit_value,
+        "explain": explain,
+    }
+    entry.update({key: getattr(props, key) for key in PROPERTY_KEYS})
+    return entry
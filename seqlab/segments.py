@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+구간(segment) 단위 항 저장소
+
+식 하나에 대해 이미 계산한 n 구간들을 기억해 두고,
+새 요청에서는 비어 있는 구간만 계산한 뒤 이어 붙입니다.
+예) 1..50 을 계산한 뒤 1..5000 을 요청하면 51..5000 만 새로 계산합니다.
+"""
+import bisect
+import threading
+
+import numpy as np
+
+
+class SegmentStore:
+    """
+    compute(lo, hi): lo ~ hi (양 끝 포함) 항을 float 배열로 돌려주는 함수
+    저장된 구간은 서로 겹치지 않고, 맞닿으면 하나로 합쳐집니다.
+    """
+
+    def __init__(self, compute):
+        self._compute = compute
+        self._starts = []
+        self._arrays = []
+        self._lock = threading.Lock()
+        self.computed_terms = 0
+        self.served_terms = 0
+
+    @property
+    def nbytes(self):
+        return sum(arr.nbytes for arr in self._arrays)
+
+    def segments(self):
+        """저장된 구간 목록 [(시작, 끝), ...]"""
+        with self._lock:
+            return [(s, s + len(a) - 1) for s, a in zip(self._starts, self._arrays)]
+
+    def get(self, n_min, n_max):
+        """n_min ~ n_max 항 (읽기 전용 배열)"""
+        if n_max < n_min:
+            return np.empty(0)
+        with self._lock:
+            for lo, hi in self._gaps(n_min, n_max):
+                arr = np.asarray(self._compute(lo, hi), dtype=float)
+                self.computed_terms += len(arr)
+                self._insert(lo, arr)
+            i = bisect.bisect_right(self._starts, n_min) - 1
+            start, arr = self._starts[i], self._arrays[i]
+            self.served_terms += n_max - n_min + 1
+            return arr[n_min - start:n_max - start + 1]
+
+    def _gaps(self, n_min, n_max):
+        gaps = []
+        cur = n_min
+        i = max(bisect.bisect_right(self._starts, n_min) - 1, 0)
+        for start, arr in zip(self._starts[i:], self._arrays[i:]):
+            end = start + len(arr) - 1
+            if end < cur:
+                continue
+            if start > n_max:
+                break
+            if start > cur:
+                gaps.append((cur, start - 1))
+            cur = end + 1
+            if cur > n_max:
+                break
+        if cur <= n_max:
+            gaps.append((cur, n_max))
+        return gaps
+
+    def _insert(self, lo, arr):
+        i = bisect.bisect_left(self._starts, lo)
+        self._starts.insert(i, lo)
+        self._arrays.insert(i, arr)
+        # 앞뒤로 맞닿은 구간을 합쳐, 연속된 범위는 항상 하나의 배열이 되게 합니다.
+        j = i
+        if j > 0 and self._starts[j - 1] + len(self._arrays[j - 1]) == lo:
+            j -= 1
+        k = i + 1
+        while k < len(self._starts) and self._starts[k] == self._starts[k - 1] + len(self._arrays[k - 1]):
+            k += 1
+        if k - j > 1:
+            merged = np.concatenate(self._arrays[j:k])
+            merged.setflags(write=False)
+            self._starts[j:k] = [self._starts[j]]
+            self._arrays[j:k] = [merged]
+        else:
+            arr.setflags(write=False)
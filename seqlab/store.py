@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+"""
+반·학생별 활동 기록 저장소 (SQLite, WAL)
+
+페이지는 기록을 메모리에 모아 두기만 하고 곧바로 돌아갑니다 (디스크를 기다리지 않음).
+쓰기 전담 스레드 하나가 FLUSH_INTERVAL 동안, 또는 사건이 BATCH_SIZE 개 찰 때까지 모은 것을
+한 트랜잭션으로 씁니다. 같은 라운드·같은 메모를 여러 번 고친 것은 마지막 것만 씁니다.
+- rounds: 라운드 하나 = 한 줄 (진행 상황·판단·근거를 덮어씀)
+- memos:  메모 칸 하나 = 한 줄
+- events: 새 라운드·질문·정답 공개 같은 사건 기록 (덧붙이기만 함)
+WAL 모드라 읽기는 쓰기를 막지 않고, 같은 기계의 여러 서버 프로세스가 한 파일을 함께 쓸 수 있습니다.
+아직 쓰이지 않은 기록도 읽기에 반영됩니다 (같은 프로세스 안에서).
+"""
+import atexit
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+DEFAULT_PATH = os.environ.get(
+    "SEQLAB_DB",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "classroom.db"),
+)
+# 쓰기 스레드가 기록을 모으는 최대 시간 (초)
+FLUSH_INTERVAL = 0.5
+# 한 트랜잭션에 쓰는 최대 기록 수
+BATCH_SIZE = 500
+# 쓰이기를 기다리는 사건 기록의 최대 수 (넘치면 버리고 셉니다)
+MAX_PENDING = 100_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rounds (
+    class_id    TEXT    NOT NULL,
+    student     TEXT    NOT NULL,
+    page        TEXT    NOT NULL,
+    round_no    INTEGER NOT NULL,
+    seq_idx     INTEGER,
+    asked       TEXT    NOT NULL DEFAULT '[]',
+    q_count     INTEGER NOT NULL DEFAULT 0,
+    show_answer INTEGER NOT NULL DEFAULT 0,
+    verdict     TEXT    NOT NULL DEFAULT '',
+    guess       TEXT    NOT NULL DEFAULT '',
+    reason      TEXT    NOT NULL DEFAULT '',
+    updated     REAL    NOT NULL,
+    PRIMARY KEY (class_id, student, page, round_no)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS rounds_by_class ON rounds (class_id, page, updated);
+
+CREATE TABLE IF NOT EXISTS memos (
+    class_id TEXT NOT NULL,
+    student  TEXT NOT NULL,
+    page     TEXT NOT NULL,
+    key      TEXT NOT NULL,
+    text     TEXT NOT NULL,
+    updated  REAL NOT NULL,
+    PRIMARY KEY (class_id, student, page, key)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS events (
+    id       INTEGER PRIMARY KEY,
+    class_id TEXT    NOT NULL,
+    student  TEXT    NOT NULL,
+    page     TEXT    NOT NULL,
+    round_no INTEGER,
+    kind     TEXT    NOT NULL,
+    payload  TEXT    NOT NULL DEFAULT '{}',
+    ts       REAL    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_by_student ON events (class_id, student, ts);
+CREATE INDEX IF NOT EXISTS events_by_round ON events (class_id, page, round_no);
+"""
+
+_UPSERT = {
+    "rounds": """
+        INSERT INTO rounds (class_id, student, page, round_no, seq_idx, asked, q_count, show_answer,
+                            verdict, guess, reason, updated)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (class_id, student, page, round_no) DO UPDATE SET
+            seq_idx = excluded.seq_idx, asked = excluded.asked, q_count = excluded.q_count,
+            show_answer = excluded.show_answer, verdict = excluded.verdict, guess = excluded.guess,
+            reason = excluded.reason, updated = excluded.updated
+    """,
+    "memos": """
+        INSERT INTO memos (class_id, student, page, key, text, updated) VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT (class_id, student, page, key) DO UPDATE SET
+            text = excluded.text, updated = excluded.updated
+    """,
+}
+_INSERT_EVENT = """
+    INSERT INTO events (class_id, student, page, round_no, kind, payload, ts) VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+@dataclass(frozen=True)
+class RoundRecord:
+    class_id: str
+    student: str
+    page: str
+    round_no: int
+    seq_idx: Optional[int]
+    asked: Tuple[Tuple[str, Optional[bool]], ...]  # (질문 이름, 답) 물은 차례대로
+    q_count: int
+    show_answer: bool
+    verdict: str = ""
+    guess: str = ""
+    reason: str = ""
+
+    def _row(self, updated):
+        asked = json.dumps([list(item) for item in self.asked], ensure_ascii=False, separators=(",", ":"))
+        return (self.class_id, self.student, self.page, self.round_no, self.seq_idx, asked, self.q_count,
+                int(self.show_answer), self.verdict, self.guess, self.reason, updated)
+
+    @classmethod
+    def _from_row(cls, row):
+        (class_id, student, page, round_no, seq_idx, asked, q_count, show_answer,
+         verdict, guess, reason, _updated) = row
+        return cls(class_id, student, page, round_no, seq_idx, tuple(tuple(item) for item in json.loads(asked)),
+                   q_count, bool(show_answer), verdict, guess, reason)
+
+
+def _connect(path):
+    conn = sqlite3.connect(path, timeout=30.0, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    # WAL에서는 NORMAL 이어도 정전 때 마지막 트랜잭션만 잃을 뿐 파일이 깨지지 않습니다.
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=30000")
+    return conn
+
+
+class SessionStore:
+    """
+    쓰기는 모아 두고 바로 돌아가며(save_round, save_memo, log_event),
+    읽기는 호출한 스레드의 연결로 곧바로 읽습니다 (latest_round, memos, class_rounds, events).
+    """
+
+    def __init__(self, path=DEFAULT_PATH, flush_interval=FLUSH_INTERVAL, batch_size=BATCH_SIZE):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.dropped = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = _connect(path)
+        conn.executescript(SCHEMA)
+        conn.close()
+
+        # 아직 쓰이지 않은 덮어쓰기 기록 {(표, 기본 키): 행} — 같은 키는 마지막 것만 남고,
+        # 쓰일 때까지 읽기에서 DB보다 먼저 봅니다.
+        self._pending = {}
+        self._dirty = set()
+        self._events = []
+        self._waiters = []
+        self._stopping = False
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self._writer = threading.Thread(target=self._run, name="seqlab-store", daemon=True)
+        self._writer.start()
+
+    # -----------------------------
+    # 쓰기 (모아 두기만 함)
+    # -----------------------------
+    def _upsert(self, table, row, key_len):
+        key = (table,) + row[:key_len]
+        with self._cond:
+            self._pending[key] = row
+            self._dirty.add(key)
+            self._cond.notify()
+
+    def save_round(self, record):
+        self._upsert("rounds", record._row(time.time()), 4)
+
+    def save_memo(self, class_id, student, page, key, text):
+        self._upsert("memos", (class_id, student, page, key, text, time.time()), 4)
+
+    def log_event(self, class_id, student, page, kind, round_no=None, **payload):
+        row = (class_id, student, page, round_no, kind,
+               json.dumps(payload, ensure_ascii=False, separators=(",", ":")), time.time())
+        with self._cond:
+            if len(self._events) >= MAX_PENDING:
+                self.dropped += 1
+                return
+            self._events.append(row)
+            self._cond.notify()
+
+    def flush(self, timeout=None):
+        """지금까지 넣은 기록이 모두 쓰일 때까지 기다립니다 (관리·시험용)."""
+        done = threading.Event()
+        with self._cond:
+            self._waiters.append(done)
+            self._cond.notify()
+        return done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        self._writer.join(timeout)
+
+    # -----------------------------
+    # 쓰기 스레드
+    # -----------------------------
+    def _has_work(self):
+        return self._dirty or self._events or self._waiters
+
+    def _run(self):
+        conn = _connect(self.path)
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._has_work() or self._stopping)
+                # 처음 기록이 들어온 뒤 조금 더 모읍니다 (닫거나 flush 를 기다리는 중이면 바로 씀).
+                deadline = time.monotonic() + self.flush_interval
+                while not (self._stopping or self._waiters or len(self._events) >= self.batch_size):
+                    wait = deadline - time.monotonic()
+                    if wait <= 0:
+                        break
+                    self._cond.wait(wait)
+                upserts = {key: self._pending[key] for key in self._dirty}
+                events, waiters = self._events, self._waiters
+                self._dirty, self._events, self._waiters = set(), [], []
+                stopping = self._stopping
+            self._write(conn, upserts, events)
+            for done in waiters:
+                done.set()
+            if stopping:
+                break
+        conn.close()
+
+    def _write(self, conn, upserts, events):
+        if upserts or events:
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                for table, sql in _UPSERT.items():
+                    rows = [row for key, row in upserts.items() if key[0] == table]
+                    if rows:
+                        conn.executemany(sql, rows)
+                if events:
+                    conn.executemany(_INSERT_EVENT, events)
+                conn.execute("COMMIT")
+            except sqlite3.Error as exc:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                self.dropped += len(upserts) + len(events)
+                print(f"seqlab.store: 기록 {len(upserts) + len(events)}개를 쓰지 못했습니다: {exc}", file=sys.stderr)
+
+        with self._cond:
+            for key, row in upserts.items():
+                # 그사이 더 새로운 기록이 들어왔으면 남겨 둡니다.
+                if self._pending.get(key) is row:
+                    del self._pending[key]
+
+    # -----------------------------
+    # 읽기
+    # -----------------------------
+    def _reader(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = _connect(self.path)
+        return conn
+
+    def _pending_rows(self, table, prefix):
+        with self._cond:
+            return [row for key, row in self._pending.items() if key[0] == table and key[1:len(prefix) + 1] == prefix]
+
+    def latest_round(self, class_id, student, page):
+        """이 학생의 가장 최근 라운드 (없으면 None)"""
+        row = self._reader().execute(
+            "SELECT * FROM rounds WHERE class_id = ? AND student = ? AND page = ? ORDER BY round_no DESC LIMIT 1",
+            (class_id, student, page),
+        ).fetchone()
+        rows = self._pending_rows("rounds", (class_id, student, page)) + ([row] if row else [])
+        if not rows:
+            return None
+        return RoundRecord._from_row(max(rows, key=lambda r: (r[3], r[-1])))
+
+    def class_rounds(self, class_id, page):
+        """한 반의 모든 라운드 기록 (학생, 라운드 순)"""
+        rows = {r[:4]: r for r in self._reader().execute(
+            "SELECT * FROM rounds WHERE class_id = ? AND page = ? ORDER BY student, round_no",
+            (class_id, page),
+        )}
+        for row in self._pending_rows("rounds", (class_id,)):
+            if row[2] == page:
+                rows[row[:4]] = row
+        return [RoundRecord._from_row(rows[key]) for key in sorted(rows)]
+
+    def memos(self, class_id, student, page):
+        """{메모 칸 이름: 내용}"""
+        found = {key: text for key, text in self._reader().execute(
+            "SELECT key, text FROM memos WHERE class_id = ? AND student = ? AND page = ?",
+            (class_id, student, page),
+        )}
+        for row in self._pending_rows("memos", (class_id, student, page)):
+            found[row[3]] = row[4]
+        return found
+
+    def events(self, class_id, student, limit=200):
+        """이 학생의 최근 사건 기록 [(페이지, 라운드, 종류, dict, 시각), ...] 최근 것부터"""
+        rows = self._reader().execute(
+            "SELECT page, round_no, kind, payload, ts FROM events WHERE class_id = ? AND student = ? "
+            "ORDER BY ts DESC LIMIT ?",
+            (class_id, student, limit),
+        )
+        return [(page, round_no, kind, json.loads(payload), ts) for page, round_no, kind, payload, ts in rows]
+
+
+_STORE = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_store():
+    """프로세스 전체에서 하나만 쓰는 저장소 (처음 부를 때 엶)"""
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = SessionStore()
+            atexit.register(_STORE.close)
+        return _STORE
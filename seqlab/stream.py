@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+아주 긴 수열을 위한 스트리밍 계산
+
+10^8 항 이상은 한꺼번에 배열로 만들 수 없으므로,
+고정 크기 블록으로 나누어 계산하고 전체 수열 없이도 갱신되는 요약값만 남깁니다.
+"""
+import warnings
+
+import numpy as np
+
+from seqlab.cache import LRUCache
+from seqlab.engine import evaluate, get_compiled
+
+# 블록 하나의 항 수 (float64 기준 8 MB)
+DEFAULT_BLOCK_SIZE = 1 << 20
+
+# 요약은 작으므로 항목 수로만 제한합니다.
+SUMMARY_CACHE = LRUCache(max_entries=128)
+
+
+def iter_blocks(compiled, n_min, n_max, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    (블록 시작 n, 항 배열)을 차례로 내보내는 제너레이터
+    한 번에 block_size 개의 항만 메모리에 둡니다.
+    """
+    for lo in range(n_min, n_max + 1, block_size):
+        hi = min(lo + block_size - 1, n_max)
+        yield lo, evaluate(compiled, lo, hi)
+
+
+class StreamSummary:
+    """
+    블록을 하나씩 받아 갱신되는 요약값
+    - 최솟값/최댓값 (과 그때의 n)
+    - 꼬리(마지막 tail_size 항)의 평균
+    - 부호 변화 횟수 (0은 건너뜀)
+    - 증가/감소 횟수와 단조성 위반 횟수
+    - 그래프용 구간별 최소·최대·평균 (envelope)
+    """
+
+    def __init__(self, tail_size=4096, buckets_per_block=64):
+        self.tail_size = tail_size
+        self.buckets_per_block = buckets_per_block
+        self.count = 0
+        self.nan_count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self.argmin = None
+        self.argmax = None
+        self.sign_changes = 0
+        self.increases = 0
+        self.decreases = 0
+        self.tail = np.empty(0)
+        self.tail_n = np.empty(0, dtype=np.int64)
+        self._last_sign = 0
+        self._last_value = np.nan
+        self._envelope = []
+
+    @property
+    def finite_count(self):
+        return self.count - self.nan_count
+
+    @property
+    def max_abs(self):
+        if self.finite_count == 0:
+            return np.nan
+        return max(abs(self.min), abs(self.max))
+
+    @property
+    def tail_mean(self):
+        return float(np.mean(self.tail)) if len(self.tail) else np.nan
+
+    @property
+    def monotone_violations(self):
+        """우세한 방향을 거스른 걸음 수 (단조 수열이면 0)"""
+        return min(self.increases, self.decreases)
+
+    def update(self, n_start, values):
+        values = np.asarray(values, dtype=float)
+        ns = np.arange(n_start, n_start + len(values))
+        self.count += len(values)
+
+        finite = np.isfinite(values)
+        self.nan_count += int(len(values) - finite.sum())
+        vals = values[finite]
+        vns = ns[finite]
+        if len(vals) == 0:
+            return
+
+        i_min, i_max = int(np.argmin(vals)), int(np.argmax(vals))
+        if vals[i_min] < self.min:
+            self.min, self.argmin = float(vals[i_min]), int(vns[i_min])
+        if vals[i_max] > self.max:
+            self.max, self.argmax = float(vals[i_max]), int(vns[i_max])
+
+        signs = np.sign(vals)
+        signs = signs[signs != 0]
+        if len(signs):
+            self.sign_changes += int(np.count_nonzero(signs[1:] != signs[:-1]))
+            if self._last_sign and signs[0] != self._last_sign:
+                self.sign_changes += 1
+            self._last_sign = signs[-1]
+
+        steps = np.diff(vals, prepend=self._last_value)
+        self.increases += int(np.count_nonzero(steps > 0))
+        self.decreases += int(np.count_nonzero(steps < 0))
+        self._last_value = vals[-1]
+
+        self.tail = np.concatenate([self.tail, vals])[-self.tail_size:]
+        self.tail_n = np.concatenate([self.tail_n, vns])[-self.tail_size:]
+
+        self._envelope.append(self._bucketize(ns, values))
+
+    def _bucketize(self, ns, values):
+        size = -(-len(values) // self.buckets_per_block)
+        pad = size * self.buckets_per_block - len(values)
+        grid = np.concatenate([values, np.full(pad, np.nan)]).reshape(-1, size)
+        n_grid = np.concatenate([ns, np.full(pad, ns[-1])]).reshape(-1, size)
+        # 모두 NaN인 구간은 NaN으로 남깁니다 (경고 없이).
+        with np.errstate(all="ignore"), warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            return (
+                n_grid.mean(axis=1),
+                np.nanmin(grid, axis=1),
+                np.nanmax(grid, axis=1),
+                np.nanmean(grid, axis=1),
+            )
+
+    def envelope(self):
+        """그래프용 배열 dict: n(구간 중심), min, max, mean"""
+        if not self._envelope:
+            empty = np.empty(0)
+            return {"n": empty, "min": empty, "max": empty, "mean": empty}
+        cols = list(zip(*self._envelope))
+        return {
+            name: np.concatenate(col)
+            for name, col in zip(["n", "min", "max", "mean"], cols)
+        }
+
+
+def summarize(expr_str, n_min, n_max, block_size=DEFAULT_BLOCK_SIZE, tail_size=4096, progress=None):
+    """
+    expr_str의 n_min ~ n_max 항을 블록 단위로 흘려 보내며 StreamSummary를 만듭니다.
+    progress: (계산한 항 수, 전체 항 수)를 받는 콜백 (선택)
+    같은 요청의 결과는 캐시합니다. 해석할 수 없는 식이면 ValueError
+    """
+    compiled = get_compiled(expr_str)
+    key = (compiled.key, n_min, n_max, block_size, tail_size)
+    summary = SUMMARY_CACHE.get(key)
+    if summary is not None:
+        return summary
+
+    summary = StreamSummary(tail_size=tail_size)
+    total = n_max - n_min + 1
+    for lo, block in iter_blocks(compiled, n_min, n_max, block_size):
+        summary.update(lo, block)
+        if progress is not None:
+            progress(lo + len(block) - n_min, total)
+    return SUMMARY_CACHE.put(key, summary)
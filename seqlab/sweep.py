@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+a' = k·a + c 의 매개변수 훑기(sweep)
+
+k 값 여러 개 × c 값 여러 개 × n 전체를 브로드캐스팅 한 번으로 계산하고,
+격자 칸마다 꼬리 평균·꼬리 폭·최대 절댓값 같은 요약만 남깁니다.
+극한은 a(n) 자체의 추정(seqlab.limits)에서 k·L + c 로 구합니다.
+k×c×n 배열이 메모리 예산을 넘지 않도록 k 방향과 n 방향으로 잘라(tile) 계산합니다.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from seqlab.limits import CONVERGES, DIVERGES_NEG, DIVERGES_POS, LimitEstimate, estimate_limit
+
+# 한 번에 만드는 k×c×n 타일의 최대 크기 (바이트, CPU 캐시에 가까울수록 빠릅니다)
+MEMORY_BUDGET = 8 * 1024 * 1024
+# 꼬리 요약에 쓰는 마지막 항 수
+TAIL_TERMS = 400
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    ks: np.ndarray
+    cs: np.ndarray
+    base: LimitEstimate     # a(n) 자체의 극한 추정
+    tail_mean: np.ndarray   # (k, c) 꼬리 평균
+    tail_width: np.ndarray  # (k, c) 꼬리 진폭 (최대 - 최소) / 2
+    max_abs: np.ndarray     # (k, c) n 전체에서의 최대 |a'|
+
+    @property
+    def kind(self):
+        """
+        (k, c) 칸마다 seqlab.limits 의 종류 문자열
+        a' = k·a + c 는 k ≠ 0 이면 a와 같은 운명이고 (발산 방향은 k의 부호를 따름),
+        k = 0 이면 상수 c로 수렴합니다.
+        """
+        k = self.ks[:, None] * np.ones((1, len(self.cs)))
+        if self.base.kind in (DIVERGES_POS, DIVERGES_NEG):
+            sign = 1.0 if self.base.kind == DIVERGES_POS else -1.0
+            kind = np.where(k * sign > 0, DIVERGES_POS, DIVERGES_NEG)
+        else:
+            kind = np.full(k.shape, self.base.kind, dtype=object)
+        return np.where(k == 0, CONVERGES, kind)
+
+    @property
+    def limit(self):
+        """수렴하는 칸의 극한 추정값 k·L + c, 나머지는 NaN"""
+        base = self.base.value if self.base.kind == CONVERGES else np.nan
+        with np.errstate(all="ignore"):
+            value = self.ks[:, None] * base + self.cs[None, :]
+        value = np.where(self.ks[:, None] == 0, self.cs[None, :], value)
+        return np.where(self.kind == CONVERGES, value, np.nan)
+
+
+def _tiles(size, step):
+    for lo in range(0, size, step):
+        yield slice(lo, min(lo + step, size))
+
+
+def _tile_shape(n_k, n_c, n_n, budget):
+    """k 방향 타일 크기와 n 방향 조각 크기 (k_step · n_c · n_step · 8 ≤ budget)"""
+    cells = max(budget // 8, 1)
+    n_step = max(min(n_n, cells // max(n_c, 1)), 1)
+    k_step = max(min(n_k, cells // max(n_c * n_step, 1)), 1)
+    return k_step, n_step
+
+
+def _reduce(seq, ks, cs, budget, reducers):
+    """
+    k×c×len(seq) 를 타일 단위로 만들어 reducers의 누적값을 돌려줍니다.
+    reducers: {이름: (ufunc, 초기값)} — 마지막 축을 ufunc.reduce 로 줄이고 타일끼리 같은 ufunc로 합칩니다.
+    """
+    k_step, n_step = _tile_shape(len(ks), len(cs), len(seq), budget)
+    out = {name: np.full((len(ks), len(cs)), init) for name, (_, init) in reducers.items()}
+    with np.errstate(all="ignore"):
+        for k_sl in _tiles(len(ks), k_step):
+            for n_sl in _tiles(len(seq), n_step):
+                block = ks[k_sl, None, None] * seq[None, None, n_sl] + cs[None, :, None]
+                for name, (ufunc, _) in reducers.items():
+                    part = ufunc.reduce(_prepare(name, block), axis=-1)
+                    out[name][k_sl] = ufunc(out[name][k_sl], part)
+    return out
+
+
+def _prepare(name, block):
+    if name == "max_abs":
+        return np.abs(block)
+    if name == "sum":
+        return np.where(np.isfinite(block), block, 0.0)
+    return block
+
+
+def sweep_grid(seq, ks, cs, n=None, tail=TAIL_TERMS, budget=MEMORY_BUDGET):
+    """
+    seq: a(n) 항 배열 (NaN 허용)
+    ks, cs: k 값, c 값 배열
+    n: 각 항의 번호 (생략하면 1, 2, 3, ...)
+    반환: SweepResult (칸마다 a' = k·a + c 의 요약)
+    """
+    seq = np.asarray(seq, dtype=float)
+    ks = np.asarray(ks, dtype=float)
+    cs = np.asarray(cs, dtype=float)
+
+    # NaN은 fmax/fmin 이 건너뜁니다.
+    whole = _reduce(seq, ks, cs, budget, {"max_abs": (np.fmax, -np.inf)})
+
+    tail_seq = seq[-tail:]
+    count = int(np.isfinite(tail_seq).sum())
+    red = _reduce(tail_seq, ks, cs, budget, {
+        "sum": (np.add, 0.0),
+        "max": (np.fmax, -np.inf),
+        "min": (np.fmin, np.inf),
+    })
+    tail_mean = red["sum"] / count if count else np.full(red["sum"].shape, np.nan)
+
+    return SweepResult(
+        ks=ks,
+        cs=cs,
+        base=estimate_limit(seq, n),
+        tail_mean=tail_mean,
+        tail_width=(red["max"] - red["min"]) / 2,
+        max_abs=np.where(np.isfinite(whole["max_abs"]), whole["max_abs"], np.nan),
+    )
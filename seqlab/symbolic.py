@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+"""
+기호 계산(sympy.limit / simplify) 서비스
+
+sympy.limit 은 학생 입력에 따라 수십 초씩 멈추지 않기도 하므로,
+Streamlit 스크립트 스레드가 아니라 별도 작업 프로세스에서 돌립니다.
+- 작업마다 제한 시간이 있고, 넘기면 그 작업 프로세스를 끝내고 새로 띄웁니다.
+- 결과(시간 초과 포함)는 정규화된 식 기준으로 캐시합니다.
+- submit()은 바로 Future를 돌려주므로 페이지는 기다리지 않고 먼저 그려집니다.
+
+작업 프로세스는 multiprocessing 의 spawn 이 아니라 이 모듈을 진입점으로 직접 띄웁니다
+(python -m seqlab.symbolic --worker FD). Streamlit 은 세션마다 페이지 스크립트를 '__main__' 으로 바꿔 끼우므로,
+spawn 처럼 시작할 때 '__main__' 을 다시 실행하는 방식은 페이지를 또 돌리거나 다른 세션의 모듈과 엉킵니다.
+"""
+import atexit
+import os
+import queue
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from multiprocessing.connection import Connection, wait
+
+from seqlab.cache import LRUCache
+
+# 작업 하나의 제한 시간(초)
+JOB_TIMEOUT = 8.0
+# 작업 프로세스 수
+POOL_SIZE = 2
+# 작업 프로세스 하나의 메모리 상한 (바이트, 지원하는 OS에서만)
+WORKER_MEMORY_LIMIT = 1024 * 1024 * 1024
+
+OK = "ok"
+TIMEOUT = "timeout"
+ERROR = "error"
+
+KINDS = ("limit", "simplify")
+
+READY = "ready"
+
+
+@dataclass(frozen=True)
+class SymbolicResult:
+    status: str
+    text: str = ""
+    latex: str = ""
+    seconds: float = 0.0
+
+
+# -----------------------------
+# 작업 프로세스 쪽
+# -----------------------------
+def _compute(kind, expr_srepr):
+    import sympy as sp
+
+    expr = sp.sympify(expr_srepr)
+    if kind == "limit":
+        result = sp.limit(expr, sp.Symbol("n"), sp.oo)
+    elif kind == "simplify":
+        result = sp.simplify(expr)
+    else:
+        raise ValueError(f"알 수 없는 작업 종류: {kind}")
+    return str(result), sp.latex(result)
+
+
+def _worker_main(conn):
+    try:
+        import resource
+
+        resource.setrlimit(resource.RLIMIT_AS, (WORKER_MEMORY_LIMIT, WORKER_MEMORY_LIMIT))
+    except (ImportError, ValueError, OSError):
+        pass
+
+    # sympy를 먼저 불러 둔 뒤 준비되었음을 알립니다 (불러오는 시간은 제한 시간에 넣지 않음).
+    import sympy  # noqa: F401
+
+    conn.send(READY)
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            # 서버 프로세스가 끝났습니다.
+            return
+        if job is None:
+            return
+        job_id, kind, expr_srepr = job
+        try:
+            text, latex = _compute(kind, expr_srepr)
+            conn.send((job_id, OK, text, latex))
+        except BaseException as exc:  # MemoryError, RecursionError 포함
+            conn.send((job_id, ERROR, f"{type(exc).__name__}: {exc}", ""))
+
+
+def _worker_entry(argv):
+    """python -m seqlab.symbolic --worker FD  (Windows 는 --worker - 로 공유 소켓을 표준 입력으로 받음)"""
+    if len(argv) != 2 or argv[0] != "--worker":
+        print("seqlab.symbolic 은 서버가 작업 프로세스로 띄우는 모듈입니다.", file=sys.stderr)
+        return 2
+    if argv[1] == "-":
+        sock = socket.fromshare(sys.stdin.buffer.read())
+    else:
+        sock = socket.socket(fileno=int(argv[1]))
+    # Connection 이 소켓 번호를 넘겨받아 닫으므로 socket 객체는 떼어 냅니다.
+    _worker_main(Connection(sock.detach()))
+    return 0
+
+
+# -----------------------------
+# 서버(페이지) 쪽
+# -----------------------------
+_PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class _Worker:
+    def __init__(self):
+        parent, child = socket.socketpair()
+        command = [sys.executable, "-m", "seqlab.symbolic", "--worker"]
+        try:
+            if hasattr(socket.socket, "share"):  # Windows: 파일 번호를 물려줄 수 없음
+                self.proc = subprocess.Popen(command + ["-"], cwd=_PACKAGE_ROOT, stdin=subprocess.PIPE)
+                self.proc.stdin.write(child.share(self.proc.pid))
+                self.proc.stdin.close()
+            else:
+                fd = child.fileno()
+                self.proc = subprocess.Popen(command + [str(fd)], cwd=_PACKAGE_ROOT, pass_fds=(fd,))
+        finally:
+            child.close()
+        self.conn = Connection(parent.detach())
+        self.ready = False
+        self.job = None
+        self.deadline = None
+        self.started = None
+
+    def kill(self):
+        self.proc.kill()
+        try:
+            self.proc.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            pass
+        self.conn.close()
+
+
+class SymbolicService:
+    """
+    제한 시간이 있는 작업 프로세스 풀
+    submit(kind, expr_srepr) → concurrent.futures.Future[SymbolicResult]
+    """
+
+    def __init__(self, pool_size=POOL_SIZE, timeout=JOB_TIMEOUT, cache_entries=1024):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.cache = LRUCache(max_entries=cache_entries)
+        self._pending = queue.Queue()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._workers = []
+        self._next_id = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="seqlab-symbolic", daemon=True)
+        self._thread.start()
+
+    def submit(self, kind, expr_srepr):
+        if kind not in KINDS:
+            raise ValueError(f"알 수 없는 작업 종류: {kind}")
+        key = (kind, expr_srepr)
+        with self._lock:
+            cached = self.cache.get(key)
+            if cached is not None:
+                fut = Future()
+                fut.set_result(cached)
+                return fut
+            if key in self._inflight:
+                return self._inflight[key]
+            fut = Future()
+            self._inflight[key] = fut
+            self._next_id += 1
+            self._pending.put((self._next_id, key))
+            return fut
+
+    def shutdown(self):
+        self._closed = True
+        self._thread.join(timeout=2)
+        for w in self._workers:
+            w.kill()
+        self._workers = []
+
+    def _finish(self, key, result):
+        with self._lock:
+            self.cache.put(key, result)
+            fut = self._inflight.pop(key, None)
+        if fut is not None:
+            fut.set_result(result)
+
+    def _run(self):
+        while not self._closed:
+            try:
+                self._step()
+            except Exception:
+                # 한 번의 실패로 서비스 전체가 멈추지 않도록 잠시 쉬었다가 계속합니다.
+                time.sleep(0.5)
+
+    def _step(self):
+        while len(self._workers) < self.pool_size:
+            self._workers.append(_Worker())
+
+        for w in self._workers:
+            if w.ready and w.job is None:
+                try:
+                    job_id, key = self._pending.get_nowait()
+                except queue.Empty:
+                    break
+                w.job = (job_id, key)
+                w.started = time.monotonic()
+                w.deadline = w.started + self.timeout
+                w.conn.send((job_id, key[0], key[1]))
+
+        watched = [w for w in self._workers if w.job is not None or not w.ready]
+        if not watched:
+            time.sleep(0.05)
+            return
+
+        for conn in wait([w.conn for w in watched], timeout=0.05):
+            w = next(w for w in watched if w.conn is conn)
+            try:
+                msg = conn.recv()
+            except (EOFError, OSError):
+                # 작업 프로세스가 죽었습니다 (메모리 초과 등).
+                self._replace(w, SymbolicResult(ERROR, "작업 프로세스가 종료되었습니다."))
+                continue
+            if msg == READY:
+                w.ready = True
+                continue
+            job_id, status, text, latex = msg
+            key = w.job[1]
+            seconds = time.monotonic() - w.started
+            w.job = None
+            self._finish(key, SymbolicResult(status, text, latex, seconds))
+
+        now = time.monotonic()
+        for w in list(self._workers):
+            if w.job is not None and now > w.deadline:
+                self._replace(w, SymbolicResult(TIMEOUT, seconds=self.timeout))
+
+    def _replace(self, worker, result):
+        worker.kill()
+        self._workers.remove(worker)
+        if worker.job is not None:
+            self._finish(worker.job[1], result)
+
+
+_SERVICE = None
+_SERVICE_LOCK = threading.Lock()
+
+
+def get_service():
+    """프로세스 전체에서 하나만 쓰는 서비스 (처음 부를 때 시작)"""
+    global _SERVICE
+    with _SERVICE_LOCK:
+        if _SERVICE is None:
+            _SERVICE = SymbolicService()
+            atexit.register(_SERVICE.shutdown)
+        return _SERVICE
+
+
+def submit_limit(compiled):
+    """n → ∞ 극한 작업을 맡기고 Future를 돌려줍니다."""
+    return get_service().submit("limit", compiled.key)
+
+
+def submit_simplify(compiled):
+    return get_service().submit("simplify", compiled.key)
+
+
+if __name__ == "__main__":
+    sys.exit(_worker_entry(sys.argv[1:]))
@@ -0,0 +1,365 @@
+# -*- coding: utf-8 -*-
+"""
+다시 실행(rerun)마다 어디에 시간이 드는지 재는 계측
+
+페이지는 맨 위에서 begin_rerun(페이지), 맨 아래에서 end_rerun() 을 부르고,
+그 사이 무거운 곳을 span(이름) 으로 감쌉니다. payload(이름, 바이트) 는 브라우저로
+보내는 큰 덩어리(components.html 등)의 크기를 적습니다.
+fragment 만 다시 실행될 때는 traced(페이지, 이름) 를 붙인 함수가 기록 하나가 됩니다.
+
+- 끄면(SEQLAB_TELEMETRY=0) span 은 아무것도 하지 않는 공용 객체를 돌려줄 뿐입니다.
+- 켜도 SAMPLE_RATE 비율의 rerun 만 잽니다 (나머지는 꺼진 것과 같음).
+- 모은 값은 프로세스 안의 히스토그램에 더하고, 쓰기 스레드가 FLUSH_INTERVAL 마다
+  rerun 한 줄씩의 JSONL(크기가 차면 돌려 씀)과 Prometheus 텍스트 파일로 씁니다.
+st.stop() 이나 오류로 end_rerun 에 닿지 못한 rerun 은 마지막으로 잰 시점까지로 "stopped" 로 남습니다.
+
+    SEQLAB_TELEMETRY=0                끄기
+    SEQLAB_TELEMETRY_SAMPLE=0.2       rerun 5개 중 1개만
+    SEQLAB_TELEMETRY_DIR=/var/seqlab  파일 위치 (기본: data/telemetry)
+"""
+import atexit
+import bisect
+import json
+import os
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Dict, List
+
+ENABLED = os.environ.get("SEQLAB_TELEMETRY", "1").lower() not in ("0", "off", "false", "no")
+SAMPLE_RATE = float(os.environ.get("SEQLAB_TELEMETRY_SAMPLE", "1.0"))
+DIRECTORY = os.environ.get(
+    "SEQLAB_TELEMETRY_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "telemetry"),
+)
+FLUSH_INTERVAL = 5.0
+JSONL_NAME = "reruns.jsonl"
+PROM_NAME = "seqlab.prom"
+# JSONL 은 이 크기를 넘으면 reruns.jsonl.1 … .BACKUPS 로 밀어냅니다.
+MAX_BYTES = 10 * 1024 * 1024
+BACKUPS = 5
+# 쓰기 전에 쌓아 두는 최대 줄 수 (넘치면 버리고 셉니다)
+MAX_PENDING = 50_000
+
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BYTES_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+class Histogram:
+    """Prometheus 식 누적 버킷 히스토그램 (잠금은 부르는 쪽에서)"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+@dataclass
+class Rerun:
+    """rerun 하나의 기록 (한 스레드만 고침)"""
+    page: str
+    kind: str
+    thread: threading.Thread
+    started: float
+    wall: float
+    last: float = 0.0
+    spans: Dict[str, float] = field(default_factory=dict)
+    payloads: Dict[str, int] = field(default_factory=dict)
+
+    def as_dict(self, status, seconds):
+        return {
+            "ts": round(self.wall, 3),
+            "page": self.page,
+            "kind": self.kind,
+            "status": status,
+            "ms": round(seconds * 1e3, 3),
+            "spans": {name: round(s * 1e3, 3) for name, s in self.spans.items()},
+            "bytes": self.payloads,
+        }
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class _Span:
+    __slots__ = ("record", "name", "started")
+
+    def __init__(self, record, name):
+        self.record = record
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        now = time.perf_counter()
+        spans = self.record.spans
+        spans[self.name] = spans.get(self.name, 0.0) + (now - self.started)
+        self.record.last = now
+        return False
+
+
+_local = threading.local()
+
+
+def _current():
+    return getattr(_local, "record", None)
+
+
+def span(name):
+    """with span("sympify"): ... — 재는 rerun 안에서만 시간을 더합니다."""
+    record = getattr(_local, "record", None) if ENABLED else None
+    if record is None:
+        return _NO_SPAN
+    return _Span(record, name)
+
+
+def payload(name, nbytes):
+    """브라우저로 보내는 덩어리 크기 (같은 이름은 더함)"""
+    record = getattr(_local, "record", None) if ENABLED else None
+    if record is not None:
+        record.payloads[name] = record.payloads.get(name, 0) + int(nbytes)
+        record.last = time.perf_counter()
+
+
+def begin_rerun(page, kind="script"):
+    """
+    이 스레드의 rerun 기록을 시작합니다 (표본에 들지 않으면 아무것도 재지 않음).
+    끝나지 않은 앞 기록이 남아 있으면 "stopped" 로 닫습니다.
+    """
+    if not ENABLED:
+        return
+    stale = _current()
+    if stale is not None:
+        COLLECTOR.finish(stale, "stopped")
+    if SAMPLE_RATE < 1.0 and random.random() >= SAMPLE_RATE:
+        _local.record = None
+        return
+    now = time.perf_counter()
+    record = Rerun(page, kind, threading.current_thread(), now, time.time(), last=now)
+    _local.record = record
+    COLLECTOR.track(record)
+
+
+def end_rerun():
+    record = _current()
+    if record is not None:
+        _local.record = None
+        COLLECTOR.finish(record, "ok")
+
+
+def traced(page, name):
+    """
+    fragment 용 장식자: 페이지 rerun 안에서 불리면 span(name) 으로,
+    fragment 만 다시 실행될 때는 그 자체로 rerun 기록 하나(kind=name)로 잽니다.
+    """
+    def decorate(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return func(*args, **kwargs)
+            if _current() is not None:
+                with span(name):
+                    return func(*args, **kwargs)
+            begin_rerun(page, kind=name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                end_rerun()
+        return wrapper
+    return decorate
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels.items()) + "}"
+
+
+class Collector:
+    """히스토그램을 모으고 JSONL·Prometheus 파일로 쓰는 프로세스 전역 수집기"""
+
+    def __init__(self, directory=DIRECTORY, flush_interval=FLUSH_INTERVAL):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._active: Dict[int, Rerun] = {}
+        self._lines: List[str] = []
+        self._reruns: Dict[tuple, int] = {}
+        self._rerun_seconds: Dict[str, Histogram] = {}
+        self._span_seconds: Dict[tuple, Histogram] = {}
+        self._payload_bytes: Dict[tuple, Histogram] = {}
+        self._changed = False
+        self._writer = None
+        self._wake = threading.Event()
+
+    def track(self, record):
+        with self._lock:
+            self._active[id(record)] = record
+        if self._writer is None:
+            self._start()
+
+    def finish(self, record, status):
+        seconds = (time.perf_counter() if status == "ok" else record.last) - record.started
+        line = json.dumps(record.as_dict(status, seconds), ensure_ascii=False, separators=(",", ":"))
+        page = record.page
+        with self._lock:
+            if self._active.pop(id(record), None) is None:
+                return  # 이미 닫힘
+            key = (page, record.kind, status)
+            self._reruns[key] = self._reruns.get(key, 0) + 1
+            hist = self._rerun_seconds.get(page)
+            if hist is None:
+                hist = self._rerun_seconds[page] = Histogram(SECONDS_BUCKETS)
+            hist.observe(seconds)
+            for name, s in record.spans.items():
+                hist = self._span_seconds.get((page, name))
+                if hist is None:
+                    hist = self._span_seconds[(page, name)] = Histogram(SECONDS_BUCKETS)
+                hist.observe(s)
+            for name, nbytes in record.payloads.items():
+                hist = self._payload_bytes.get((page, name))
+                if hist is None:
+                    hist = self._payload_bytes[(page, name)] = Histogram(BYTES_BUCKETS)
+                hist.observe(nbytes)
+            if len(self._lines) < MAX_PENDING:
+                self._lines.append(line)
+            else:
+                self.dropped += 1
+            self._changed = True
+
+    def snapshot(self):
+        """{"reruns": {(페이지, 종류, 상태): 수}, "rerun_seconds": {...}, "span_seconds": {...}, "payload_bytes": {...}}"""
+        with self._lock:
+            return {
+                "reruns": dict(self._reruns),
+                "rerun_seconds": dict(self._rerun_seconds),
+                "span_seconds": dict(self._span_seconds),
+                "payload_bytes": dict(self._payload_bytes),
+            }
+
+    def prometheus_text(self):
+        out = []
+
+        def histogram(metric, help_text, series):
+            out.append(f"# HELP {metric} {help_text}")
+            out.append(f"# TYPE {metric} histogram")
+            for labels, hist in sorted(series.items()):
+                labels = dict(labels)
+                cumulative = 0
+                for bound, count in zip(hist.buckets, hist.counts):
+                    cumulative += count
+                    out.append(f"{metric}_bucket{_labels(**labels, le=repr(float(bound)))} {cumulative}")
+                out.append(f"{metric}_bucket{_labels(**labels, le='+Inf')} {hist.count}")
+                out.append(f"{metric}_sum{_labels(**labels)} {hist.sum!r}")
+                out.append(f"{metric}_count{_labels(**labels)} {hist.count}")
+
+        with self._lock:
+            out.append("# HELP seqlab_reruns_total 잰 rerun 수")
+            out.append("# TYPE seqlab_reruns_total counter")
+            for (page, kind, status), count in sorted(self._reruns.items()):
+                out.append(f"seqlab_reruns_total{_labels(page=page, kind=kind, status=status)} {count}")
+            histogram("seqlab_rerun_seconds", "rerun 한 번 전체 시간",
+                      {(("page", p),): h for p, h in self._rerun_seconds.items()})
+            histogram("seqlab_span_seconds", "rerun 안 구간별 시간",
+                      {(("page", p), ("span", s)): h for (p, s), h in self._span_seconds.items()})
+            histogram("seqlab_payload_bytes", "브라우저로 보낸 덩어리 크기",
+                      {(("page", p), ("name", n)): h for (p, n), h in self._payload_bytes.items()})
+            out.append("# HELP seqlab_telemetry_dropped_total 쓰지 못하고 버린 JSONL 줄 수")
+            out.append("# TYPE seqlab_telemetry_dropped_total counter")
+            out.append(f"seqlab_telemetry_dropped_total {self.dropped}")
+        return "\n".join(out) + "\n"
+
+    # -----------------------------
+    # 쓰기 스레드
+    # -----------------------------
+    def _start(self):
+        with self._lock:
+            if self._writer is not None:
+                return
+            self._writer = threading.Thread(target=self._run, name="seqlab-telemetry", daemon=True)
+        self._writer.start()
+        atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def _close_stopped(self):
+        """end_rerun 없이 끝난 스크립트 스레드의 기록을 닫습니다."""
+        with self._lock:
+            stale = [r for r in self._active.values() if not r.thread.is_alive()]
+        for record in stale:
+            self.finish(record, "stopped")
+
+    def flush(self):
+        self._close_stopped()
+        with self._lock:
+            lines, self._lines = self._lines, []
+            changed, self._changed = self._changed, False
+        if not changed:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            if lines:
+                self._append(lines)
+            self._write_prometheus()
+        except OSError as exc:
+            print(f"seqlab.telemetry: 기록을 쓰지 못했습니다: {exc}", file=sys.stderr)
+
+    def _append(self, lines):
+        path = os.path.join(self.directory, JSONL_NAME)
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = 0
+        if size and size >= MAX_BYTES:
+            for i in range(BACKUPS - 1, 0, -1):
+                if os.path.exists(f"{path}.{i}"):
+                    os.replace(f"{path}.{i}", f"{path}.{i + 1}")
+            os.replace(path, f"{path}.1")
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+    def _write_prometheus(self):
+        # 긁어 가는 쪽이 반쯤 쓰인 파일을 보지 않도록 다른 이름으로 쓰고 바꿉니다.
+        path = os.path.join(self.directory, PROM_NAME)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp, path)
+
+
+COLLECTOR = Collector()
+
+
+def configure(enabled=None, sample_rate=None, directory=None):
+    """실행 중에 켜고 끄기·표본 비율·파일 위치를 바꿉니다 (부하 시험 등)."""
+    global ENABLED, SAMPLE_RATE
+    if enabled is not None:
+        ENABLED = enabled
+    if sample_rate is not None:
+        SAMPLE_RATE = sample_rate
+    if directory is not None:
+        COLLECTOR.directory = directory
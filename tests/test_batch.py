@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""
+seqlab.batch: ③ 연산 모드의 일괄 계산
+
+- 엔진과 같은 항을 내는지 (공통 부분식을 나눠 계산해도)
+- 변환 매개변수 k, c 가 사용자가 식에 적은 k, c 와 섞이지 않는지
+"""
+import numpy as np
+import sympy as sp
+
+from seqlab.batch import evaluate_batch, related_expressions
+from seqlab.engine import get_compiled, sequence_terms
+
+
+def _batch(a, b, use_k, k_value=2.0, c_value=0.5, extras=()):
+    exprs = related_expressions(get_compiled(a).expr, get_compiled(b).expr, use_k, extras)
+    return evaluate_batch(exprs, 1, 200, k_value=k_value, c_value=c_value)
+
+
+def test_matches_engine_terms():
+    series = _batch("1/n", "(-1)**n", True, extras=("a/b",))
+    a, b = sequence_terms("1/n", 1, 200), sequence_terms("(-1)**n", 1, 200)
+    np.testing.assert_allclose(series["ab"], a * b, rtol=1e-14)
+    np.testing.assert_allclose(series["a'b"], 2.0 * a * b, rtol=1e-14)
+    np.testing.assert_allclose(series["a/b"], a / b, rtol=1e-14)
+
+
+def test_user_symbols_do_not_take_parameter_values():
+    # 사용자가 적은 k, c 는 모르는 문자이므로 엔진처럼 NaN (k_value, c_value 가 몰래 들어가지 않음)
+    for source, use_k in (("k/n", True), ("c + 1/n", False)):
+        series = _batch(source, "n", use_k)
+        assert np.isnan(sequence_terms(source, 1, 200)).all()
+        assert all(np.isnan(series[name]).all() for name in ("a", "a'", "ab", "a'b"))
+        assert not np.isnan(series["b"]).any()
+
+
+def test_parameters_are_dummies():
+    expr = related_expressions(sp.Symbol("k") / sp.Symbol("n"), sp.Integer(1), True)["a'"]
+    assert len(expr.free_symbols) == 3
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""
+seqlab.bundle: 카드 게임 오프라인 묶음
+
+Tailwind 는 content 에 적힌 파일에서 찾은 클래스만 CSS 에 넣으므로,
+카드 HTML 을 만드는 seqlab.decks 의 클래스(text-lg·text-xl)까지 빠짐없이 넘기는지 봅니다.
+"""
+import os
+import stat
+import sys
+
+from seqlab import bundle, decks
+
+
+def test_css_content_covers_deck_classes(tmp_path, monkeypatch):
+    # 넘겨받은 --content 를 그대로 적어 두는 가짜 tailwindcss
+    fake = tmp_path / "tailwindcss"
+    fake.write_text(
+        f"#!{sys.executable}\n"
+        "import sys\n"
+        "args = sys.argv[1:]\n"
+        "open(args[args.index('-o') + 1], 'w').write(args[args.index('--content') + 1])\n",
+        encoding="utf-8",
+    )
+    fake.chmod(fake.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("TAILWIND", str(fake))
+
+    out = tmp_path / "tailwind.min.css"
+    bundle.build_css(str(out))
+    content = out.read_text(encoding="utf-8").split(",")
+    assert os.path.abspath(decks.__file__) in content
+    assert bundle.SOURCE in content
+    classes = {"text-lg", "text-xl"}
+    found = set()
+    for path in content:
+        text = open(path, encoding="utf-8").read()
+        found |= {name for name in classes if name in text}
+    assert found == classes
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+seqlab.cache.LRUCache: 여러 세션이 함께 쓰는 캐시
+
+- 가장 오래 쓰지 않은 항목부터 내보내는지 (get 도 '씀'으로 침)
+- 바이트 한도 (덮어쓰기·resize 포함)
+- 여러 스레드가 동시에 써도 항목 수·바이트 수·적중 통계가 맞는지
+"""
+import threading
+
+import numpy as np
+
+from seqlab.cache import LRUCache
+
+
+def _array(nbytes):
+    """nbytes 바이트 배열 (8 의 배수)"""
+    return np.zeros(nbytes // 8)
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(max_entries=3)
+    for key in "abc":
+        cache.put(key, key)
+    assert cache.get("a") == "a"           # a 를 최근으로
+    cache.put("d", "d")                    # 가장 오래된 b 가 나감
+    assert list(cache._data) == ["c", "a", "d"]
+    assert "b" not in cache
+    cache.put("c", "c2")                   # 덮어쓰기도 최근으로
+    cache.put("e", "e")
+    assert list(cache._data) == ["d", "c", "e"]
+    assert cache.stats().evictions == 2
+
+
+def test_get_or_compute_counts_hits_and_misses():
+    cache = LRUCache(max_entries=4)
+    calls = []
+    for _ in range(3):
+        assert cache.get_or_compute("x", lambda: calls.append(1) or 42) == 42
+    stats = cache.stats()
+    assert (len(calls), stats.hits, stats.misses) == (1, 2, 1)
+    assert stats.hit_rate == 2 / 3
+
+
+def test_byte_cap():
+    cache = LRUCache(max_entries=100, max_bytes=1000)
+    for i in range(5):
+        cache.put(i, _array(320))
+    assert list(cache._data) == [2, 3, 4]
+    assert cache.stats().nbytes == 960
+    # 덮어쓰면 예전 크기를 빼고 새 크기를 더합니다.
+    cache.put(4, _array(80))
+    assert cache.stats().nbytes == 720
+    cache.put(5, _array(400))
+    assert list(cache._data) == [3, 4, 5] and cache.stats().nbytes == 800
+    # 한도보다 큰 값 하나는 남지 않습니다.
+    cache.put("big", _array(2000))
+    assert "big" not in cache and cache.stats().nbytes <= 1000
+
+
+def test_resize_keeps_the_grown_entry():
+    cache = LRUCache(max_entries=100, max_bytes=1000)
+    cache.put("a", _array(400))
+    cache.put("b", _array(400))
+    cache._data["b"] = _array(800)         # 제자리에서 커진 값 (항 캐시의 구간 저장소처럼)
+    cache.resize("b")
+    assert list(cache._data) == ["b"]
+    assert cache.stats().nbytes == 800
+
+
+def test_custom_size_func():
+    cache = LRUCache(max_entries=10, max_bytes=10, size_func=len)
+    cache.put("a", "x" * 6)
+    cache.put("b", "x" * 6)
+    assert list(cache._data) == ["b"]
+
+
+def test_thread_safety():
+    cache = LRUCache(max_entries=50, max_bytes=40 * 800)
+    gets = 2000
+    errors = []
+
+    def work(seed):
+        rng = np.random.default_rng(seed)
+        try:
+            for key in rng.integers(0, 200, size=gets):
+                if cache.get(int(key)) is None:
+                    cache.put(int(key), _array(800))
+        except Exception as exc:        # pragma: no cover - 실패하면 아래에서 드러남
+            errors.append(exc)
+
+    threads = [threading.Thread(target=work, args=(seed,)) for seed in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = cache.stats()
+    assert not errors
+    assert stats.hits + stats.misses == 8 * gets
+    assert stats.entries == len(cache._sizes) <= 40
+    assert stats.nbytes == sum(cache._sizes.values()) == 800 * stats.entries
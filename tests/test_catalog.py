@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+seqlab.catalog: 저장소에 커밋한 스무고개 카탈로그
+
+학생에게 정답으로 보여 주는 파일이므로, 지금 코드의 형식·기호 계산으로 만든 것인지와
+행마다 성질끼리 모순이 없는지를 봅니다.
+"""
+import numpy as np
+import pytest
+
+from seqlab.catalog import DEFAULT_PATH, Catalog, inconsistency
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    return Catalog(DEFAULT_PATH)
+
+
+def test_built_with_symbolic_limits(catalog):
+    assert catalog.header["meta"]["symbolic"] is True
+    assert len(catalog) > 0
+
+
+def test_rows_are_consistent(catalog):
+    limits = np.asarray(catalog.columns["limit"])
+    for i in range(len(catalog)):
+        assert inconsistency(catalog.properties(i), float(limits[i]), 0.0) is None, catalog.source(i)
+
+
+def test_limits_are_rounded(catalog):
+    """0.99999999995 처럼 정수에 붙은 수치 추정값 대신 반올림한 값이 들어 있어야 합니다."""
+    limits = np.asarray(catalog.columns["limit"])
+    finite = limits[np.isfinite(limits)]
+    gap = np.abs(finite - np.round(finite))
+    assert not np.any((gap > 0) & (gap < 1e-6))
+
+
+@pytest.mark.parametrize("source, convergent, bounded", [
+    ("sin(n)**(-2)", False, False),
+    ("1/sin(n)", False, False),
+    ("(-1)**n", False, True),
+    ("1/n", True, True),
+])
+def test_known_rows(catalog, source, convergent, bounded):
+    from seqlab.engine import normalize_source
+
+    sources = {catalog.source(i): i for i in range(len(catalog))}
+    key = normalize_source(source)
+    if key not in sources:
+        pytest.skip(f"{source} 은(는) 같은 값의 다른 식으로 들어 있습니다.")
+    props = catalog.properties(sources[key])
+    assert props["convergent"] == convergent
+    assert props["bounded"] == bounded
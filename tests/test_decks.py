@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+seqlab.decks: 카드 게임 묶음
+
+- limt.html 에 박아 둔 기본 묶음이 CURATED 와 같은지
+- 카탈로그에서 뽑은 카드의 설명(수렴·극한값)이 카탈로그 성질과 맞는지
+"""
+import json
+import re
+import shutil
+
+import pytest
+
+from seqlab.catalog import inconsistency, open_catalog
+from seqlab.decks import CURATED, FALLBACK_ID, PAGE_PATH, SETS_PER_ROUND, build_deck, write_fallback
+
+
+def test_fallback_deck_is_current(tmp_path):
+    page = tmp_path / "limt.html"
+    shutil.copy(PAGE_PATH, page)
+    assert not write_fallback(str(page)), "python -m seqlab.decks fallback 으로 limt.html 을 다시 쓰세요."
+
+
+def test_fallback_deck_has_curated_rounds():
+    text = open(PAGE_PATH, encoding="utf-8").read()
+    payload = re.search(rf'<script id="{FALLBACK_ID}" type="application/json">(.*?)</script>', text, re.S).group(1)
+    deck = json.loads(payload)
+    assert [card["id"] for card in deck["cards"]] == [spec.id for spec in CURATED]
+    assert len(deck["rounds"]) == len(CURATED) // SETS_PER_ROUND
+
+
+def test_catalog_cards_are_consistent():
+    catalog = open_catalog()
+    if catalog is None:
+        pytest.skip("카탈로그 파일이 없습니다 (python -m seqlab.catalog build).")
+    deck = build_deck(rounds=10, seed=0, catalog=catalog)
+    drawn = [card for card in deck["cards"] if card["id"].startswith("C")]
+    assert drawn
+    for card in drawn:
+        i = int(card["id"][1:])
+        props = catalog.properties(i)
+        limit = float(catalog.columns["limit"][i])
+        assert inconsistency(props, limit, 0.0) is None
+        assert ("수렴합니다" in card["insight"]) == props["convergent"]
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+seqlab.engine: 배열 계산이 기존 방식(항마다 expr.subs 후 float)과 같은 항을 내는지
+
+- 0 으로 떨어져야 할 삼각함수 항(sin(π·n)), 계산할 수 없는 항(tan(π/2) = zoo)
+- math 에서만 실패하는 항(factorial(-2)), float64 로 대신하는 함수(harmonic, fibonacci)
+- 항별 계산의 양 제한 (PER_TERM_LIMIT, PER_TERM_SECONDS)
+"""
+import dataclasses
+import math
+
+import numpy as np
+import pytest
+import sympy as sp
+
+from seqlab import engine
+from seqlab.engine import compile_expression, evaluate, n
+from seqlab.guard import ExpressionRejected
+
+PARITY_CASES = (
+    "1/n",
+    "(-1)**n",
+    "1/(n-1)",
+    "log(n-1)",
+    "sqrt(n-3)",
+    "sin(pi*n)",
+    "cos(pi*n)",
+    "tan(pi*n/2)",
+    "1/tan(pi*n/2)",
+    "1/sin(pi*n)",
+    "sin(pi*n/3+1/2)",
+    "sin(pi*n/6)*cos(pi*n/4)",
+    "tan(n)",
+    "factorial(n)/factorial(n-3)",
+    "binomial(2*n,n)/4**n",
+    "harmonic(n)",
+    "fibonacci(n)/fibonacci(n+1)",
+    "floor(n/2)",
+    "(-2)**(1/n)",
+)
+
+
+def _baseline(source, n_min, n_max):
+    """기존 페이지의 generate_sequence 와 같은 계산"""
+    expr = sp.sympify(source)
+    out = []
+    for k in range(n_min, n_max + 1):
+        try:
+            out.append(float(expr.subs(n, k)))
+        except Exception:
+            out.append(np.nan)
+    return np.array(out)
+
+
+@pytest.mark.parametrize("source", PARITY_CASES)
+def test_matches_baseline_terms(source):
+    got = evaluate(compile_expression(source), 1, 40)
+    want = _baseline(source, 1, 40)
+    np.testing.assert_allclose(got, want, rtol=1e-12, atol=0)
+
+
+@pytest.mark.parametrize("source", ("harmonic(n)", "fibonacci(n)/fibonacci(n+1)", "lucas(n)/fibonacci(n)"))
+def test_float_extras_match_exact_terms(source):
+    compiled = compile_expression(source)
+    ns = np.arange(1, 301, dtype=float)
+    got = engine._as_real_array(compiled.float_func(ns), len(ns))
+    np.testing.assert_allclose(got, _baseline(source, 1, 300), rtol=1e-12)
+
+
+def test_long_ranges_skip_per_term_evaluation():
+    compiled = compile_expression("harmonic(n)")
+    arr = evaluate(compiled, 1, 10**6)
+    assert arr[-1] == pytest.approx(math.log(10**6) + np.euler_gamma + 0.5e-6, rel=1e-12)
+
+
+def test_per_term_limit(monkeypatch):
+    monkeypatch.setattr(engine, "PER_TERM_LIMIT", 100)
+    compiled = dataclasses.replace(compile_expression("catalan(n)"), float_func=None)
+    assert np.isfinite(evaluate(compiled, 1, 100)).all()
+    with pytest.raises(ExpressionRejected):
+        evaluate(compiled, 1, 101)
+
+
+def test_per_term_deadline(monkeypatch):
+    monkeypatch.setattr(engine, "PER_TERM_SECONDS", 0.0)
+    compiled = compile_expression("catalan(n)")
+    # float64 경로가 있으면 그쪽으로, 없으면 거절
+    assert np.isfinite(evaluate(compiled, 1, 50)).all()
+    with pytest.raises(ExpressionRejected):
+        evaluate(dataclasses.replace(compiled, float_func=None), 1, 50)
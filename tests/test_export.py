@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+"""
+seqlab.export: 페이지의 교사용 내려받기는 교사 암호가 있어야 열립니다.
+"""
+import pytest
+
+from seqlab import export
+
+
+@pytest.mark.parametrize("configured, code, unlocked", [
+    ("", "", False),
+    ("", "anything", False),
+    ("s3cret", "", False),
+    ("s3cret", "wrong", False),
+    ("s3cret", "s3cret", True),
+    ("교사암호", "교사암호", True),
+])
+def test_teacher_unlocked(monkeypatch, configured, code, unlocked):
+    monkeypatch.setattr(export, "TEACHER_CODE", configured)
+    assert export.teacher_unlocked(code) is unlocked
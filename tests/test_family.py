@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+seqlab.family: 워크벤치의 (수열 × n) 계산
+
+- 항이 많으면 고른 n 만 남겨 결과가 FAMILY_CACHE 한도보다 훨씬 작은지
+- 남긴 열의 값이 엔진(항별 확인 규칙)과 같은지, 극한 추정이 참값을 덮는지
+"""
+import numpy as np
+import pytest
+
+from seqlab import family
+from seqlab.core import CONVERGES
+from seqlab.engine import sequence_terms
+from seqlab.limits import TAIL_WINDOW, round_limit
+
+
+def test_kept_columns_are_bounded_and_keep_the_tail():
+    size = 10**6
+    cols = family.kept_columns(family.MAX_SERIES, size)
+    assert family.MAX_SERIES * len(cols) <= 2 * family.MAX_CELLS
+    assert cols[0] == 0 and cols[-1] == size - 1
+    np.testing.assert_array_equal(cols[-TAIL_WINDOW:], np.arange(size - TAIL_WINDOW, size))
+    np.testing.assert_array_equal(family.kept_columns(3, 1000), np.arange(1000))
+
+
+def test_large_family_fits_the_cache():
+    values = family.parse_values("0.05:3:0.05")
+    result = family.evaluate_family("1/n**p", values, 1, 10**6)
+    assert result.values.shape == (len(values), len(result.ns))
+    assert result.values.nbytes <= 8 * 2 * family.MAX_CELLS
+    assert result.values.nbytes < family.FAMILY_CACHE.max_bytes // 8
+    # 수렴한다고 본 행은 오차 안에 0 이 있어 0 으로 적힙니다 (1.78e-09 같은 가짜 극한이 아님).
+    for est in result.limits:
+        if est.kind == CONVERGES:
+            assert abs(est.value) <= est.error
+            assert round_limit(est.value, est.error) == 0.0
+
+
+@pytest.mark.parametrize("template, values", [("1/n**p", (0.5, 1, 2)), ("sin(pi*n/p)", (2, 3, 6)), ("p", (1, 2))])
+def test_family_rows_match_engine(template, values, monkeypatch):
+    monkeypatch.setattr(family, "MAX_CELLS", 1500)
+    monkeypatch.setattr(family, "CHUNK_CELLS", 1200)
+    family.FAMILY_CACHE.clear()
+    result = family.evaluate_family(template, values, 1, 1000)
+    assert len(result.ns) < 1000
+    for row, source in zip(result.values, result.sources):
+        # 매개변수가 든 sin(π·n/p) 는 브로드캐스트에서 0 대신 1e-16 정도가 나옵니다.
+        np.testing.assert_allclose(row, sequence_terms(source, 1, 1000)[result.ns - 1], rtol=1e-12, atol=1e-12)
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+seqlab.guard: sympify 전에 거르는 식
+
+걸러 내지 못하면 sympify·get_compiled 가 수십 초 이상 멈추는 식들입니다.
+"""
+import pytest
+
+from seqlab.guard import ExpressionRejected, check_expression
+
+# sympify 가 상수 부분을 정확히 계산하거나, 알 수 없는 함수가 큰 정수를 만드는 식
+REJECTED = (
+    "10**10**10",
+    "Pow(10,10**10)",
+    "n + Pow(10,10**8)",
+    "factorial(n)*Pow(3,10**9)",
+    "Pow(2,2**40)",
+    "fibonacci(10**9)",
+    "nextprime(10**2000)",
+    "pow(10,10**10)",
+    "(lambda: 1)()",
+)
+
+ACCEPTED = (
+    "1/n",
+    "n!",
+    "(1+1/n)**n",
+    "Pow(n,2)/(n+1)",
+    "factorial(n)/factorial(n-3)",
+    "tan(pi*n/2)",
+    "harmonic(n)",
+)
+
+
+@pytest.mark.parametrize("source", REJECTED)
+def test_rejects_costly_expressions(source):
+    with pytest.raises(ExpressionRejected):
+        check_expression(source)
+
+
+@pytest.mark.parametrize("source", ACCEPTED)
+def test_accepts_ordinary_expressions(source):
+    assert check_expression(source) is not None
+
+
+@pytest.mark.parametrize("source, n_max, exact", [
+    ("1/n", 10**8, True),
+    ("harmonic(n)", 10**6, True),
+    ("Pow(2,n)", 10**3, True),
+    ("Pow(2,n)", 10**6, False),
+    ("2**n", 10**6, False),
+    ("fibonacci(n)/fibonacci(n+1)", 50, True),
+    ("fibonacci(n)/fibonacci(n+1)", 10**8, False),
+    ("factorial(n)", 10**6, False),
+])
+def test_exact_ok_follows_term_size(source, n_max, exact):
+    assert check_expression(source).exact_ok(n_max) is exact
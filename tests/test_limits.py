@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+seqlab.limits: 수치 극한 추정
+
+- 0 으로 가는 수열의 꼬리(1e-10 등)를 '상수'로 잘못 보지 않는지
+- ln n, 1/ln n 처럼 유한한 항으로는 가를 수 없는 느린 수열은 판단을 미루는지 (UNKNOWN)
+- 느리게 수렴하는 수열(1/√n 등)의 오차 범위가 참값을 덮는지
+"""
+import math
+
+import numpy as np
+import pytest
+
+from seqlab.core import CONVERGES, DIVERGES_POS, UNKNOWN
+from seqlab.engine import sequence_terms
+from seqlab.limits import estimate_limit, round_limit
+
+
+def _estimate(source, n_max):
+    return estimate_limit(sequence_terms(source, 1, n_max))
+
+
+@pytest.mark.parametrize("source, n_max, limit", [
+    ("1/n**2", 10**5, 0.0),
+    ("1/n**2", 50, 0.0),
+    ("1/n", 50, 0.0),
+    ("1/n", 10**6, 0.0),
+    ("n/(n+1)", 50, 1.0),
+    ("n**3/(n**3+1)", 10**5, 1.0),
+    ("(1+1/n)**n", 50, math.e),
+    ("log(n)/n", 50, 0.0),
+    ("log(n)/n", 10**4, 0.0),
+    ("1/sqrt(n)", 50, 0.0),
+    ("1/sqrt(n)", 10**6, 0.0),
+])
+def test_error_covers_limit(source, n_max, limit):
+    est = _estimate(source, n_max)
+    assert est.kind == CONVERGES
+    # 항 자체의 반올림(n³/(n³+1) = 1 - 1e-15 등)은 추정이 알 수 없으므로 그만큼은 봐 줍니다.
+    assert abs(est.value - limit) <= est.error + 1e-12
+
+
+def test_tiny_tail_is_not_a_constant():
+    est = _estimate("1/n**2", 10**5)
+    assert est.method != "constant_tail"
+    assert round_limit(est.value, est.error) == 0.0
+
+
+def test_constant_sequence():
+    est = estimate_limit(np.full(50, 3.0))
+    assert (est.kind, est.value, est.error) == (CONVERGES, 3.0, 0.0)
+
+
+@pytest.mark.parametrize("source, n_max", [
+    ("1/n**0.05", 10**6),
+    ("1/log(n)", 50),
+    ("1/log(n)", 10**6),
+    ("log(log(n))", 50),
+    ("log(log(n))", 10**6),
+])
+def test_slow_sequences_are_undetermined(source, n_max):
+    assert _estimate(source, n_max).kind == UNKNOWN
+
+
+@pytest.mark.parametrize("source, n_max", [("log(n)", 50), ("log(n)", 10**6), ("sqrt(n)", 50), ("n", 50)])
+def test_diverges(source, n_max):
+    assert _estimate(source, n_max).kind == DIVERGES_POS
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+seqlab.plotting.select_points: 그래프에 보낼 점 고르기 (LTTB)
+
+- 처음·끝 점은 항상 남고, 고른 점 수는 max_points 이하
+- NaN·inf (계산할 수 없는 항)는 건너뛰며, 빈 구간 양쪽의 점도 남음
+- 드물게 튀는 항(봉우리)을 놓치지 않음, n축 로그 스케일
+"""
+import numpy as np
+import pytest
+
+from seqlab.plotting import downsample, lttb_indices, select_points
+
+
+def _sequence(size):
+    ns = np.arange(1, size + 1, dtype=float)
+    return ns, np.sin(ns / 50.0) / np.sqrt(ns)
+
+
+@pytest.mark.parametrize("log_x", [False, True])
+@pytest.mark.parametrize("size, max_points", [(10, 2000), (5000, 2000), (100_000, 500), (100_000, 3)])
+def test_bound_and_endpoints(size, max_points, log_x):
+    ns, ys = _sequence(size)
+    idx = select_points(ns, ys, max_points=max_points, log_x=log_x)
+    assert len(idx) <= max_points
+    assert idx[0] == 0 and idx[-1] == size - 1
+    assert (np.diff(idx) > 0).all()
+
+
+def test_short_sequences_are_kept_whole():
+    ns, ys = _sequence(50)
+    np.testing.assert_array_equal(select_points(ns, ys, max_points=50), np.arange(50))
+
+
+def test_skips_nan_gaps():
+    ns, ys = _sequence(20_000)
+    ys[:10] = np.nan                    # 앞쪽의 계산할 수 없는 항
+    ys[5000:7000] = np.nan              # 가운데 빈 구간
+    ys[9000] = np.inf
+    ys[-5:] = np.nan                    # 끝쪽
+    for log_x in (False, True):
+        idx = select_points(ns, ys, max_points=400, log_x=log_x)
+        assert len(idx) <= 400
+        assert np.isfinite(ys[idx]).all()
+        assert idx[0] == 10 and idx[-1] == len(ys) - 6
+
+
+def test_all_nan():
+    ns = np.arange(1, 101, dtype=float)
+    assert len(select_points(ns, np.full(100, np.nan))) == 0
+
+
+def test_keeps_spikes():
+    ns = np.arange(1, 100_001, dtype=float)
+    ys = 1.0 / ns
+    ys[[12_345, 67_890]] = [50.0, -50.0]
+    idx = select_points(ns, ys, max_points=300)
+    assert {12_345, 67_890} <= set(idx.tolist())
+
+
+def test_log_x_drops_nonpositive_n_and_spreads_points():
+    ns = np.arange(-5, 100_001, dtype=float)
+    ys = np.log(np.abs(ns) + 1)
+    idx = select_points(ns, ys, max_points=200, log_x=True)
+    assert (ns[idx] > 0).all() and ns[idx[0]] == 1
+    # 로그 간격이므로 n ≤ 100 에도 점이 넉넉히 남습니다 (고른 간격이면 거의 없음).
+    assert (ns[idx] <= 100).sum() >= 20
+
+
+def test_lttb_small_outputs_return_everything():
+    x = np.arange(10.0)
+    np.testing.assert_array_equal(lttb_indices(x, x, 2), np.arange(10))
+    np.testing.assert_array_equal(lttb_indices(x, x, 20), np.arange(10))
+
+
+def test_downsample_returns_chosen_points():
+    ns, ys = _sequence(10_000)
+    xs, vs = downsample(ns, ys, max_points=100)
+    assert len(xs) == len(vs) <= 100
+    np.testing.assert_array_equal(vs, ys[(xs - 1).astype(int)])
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+seqlab.properties 골든 사례
+
+스무고개의 정답이 되는 성질이므로, 틀리기 쉬웠던 식들의 답을 고정해 둡니다.
+- 기호 계산(sympy.limit, 작업 프로세스)을 쓰는 기본 경로
+- 수치 근거만 쓰는 경로 (카탈로그를 빠르게 만들 때): float64 에서 넘치거나 반올림 오차가 증가분을 덮는 식
+"""
+import math
+
+import pytest
+
+from seqlab.core import PROPERTY_KEYS
+from seqlab.properties import infer_properties
+
+# 식 → 고정할 성질 (적지 않은 성질은 검사하지 않음)
+SYMBOLIC_CASES = {
+    # 드물게 크게 튀는 항: sympy 는 AccumBounds(0, oo) 를 돌려줍니다.
+    "sin(n)**-2": dict(convergent=False, bounded=False, n_times_conv=False, with_1_over_n_conv=False),
+    "(-1)**n*cos(n)/((-1)**n*cos(n)+1)": dict(convergent=False, bounded=False),
+    "2**n/(2**n+1)": dict(convergent=True, bounded=True, monotone=True),
+    "(2**n+1)/2**n": dict(convergent=True, bounded=True, monotone=True),
+    "(1+1/n)**n": dict(convergent=True, bounded=True, monotone=True),
+    "sin(n)/n": dict(convergent=True, bounded=True, even_subseq_conv=True, odd_subseq_conv=True),
+    "1/(n+cos(n))": dict(convergent=True, even_subseq_conv=True, odd_subseq_conv=True, n_times_conv=True),
+    "1/log(n+1)": dict(convergent=True, n_times_conv=False),
+    "(-1)**n": dict(convergent=False, bounded=True, sign_changes=True, piecewise2=True,
+                    even_subseq_conv=True, odd_subseq_conv=True, with_1_over_n_conv=True),
+    "n*sin(n)": dict(convergent=False, bounded=False),
+}
+SYMBOLIC_LIMITS = {
+    "2**n/(2**n+1)": 1.0,
+    "(2**n+1)/2**n": 1.0,
+    "(1+1/n)**n": math.e,
+    "sin(n)/n": 0.0,
+    "1/log(n+1)": 0.0,
+    "log(n)/(log(n)+1)": 1.0,
+    "n**-2": 0.0,
+}
+
+NUMERIC_CASES = {
+    # float64 에서 2**n 이 넘쳐 n > 1023 의 항이 NaN 이 되는 식
+    "2**n/(2**n+1)": dict(convergent=True, bounded=True),
+    "(2**n+1)/2**n": dict(convergent=True, bounded=True),
+    # 꼬리의 증가분(~1e-10)이 float64 반올림 오차와 비슷한 식
+    "(1+1/n)**n": dict(convergent=True, bounded=True, monotone=True),
+    # 증가분이 들쭉날쭉해 꼬리 몇백 항의 기울기가 흔들리는 식
+    "1/(n+cos(n))": dict(convergent=True, even_subseq_conv=True, odd_subseq_conv=True),
+    "n+sin(n)": dict(convergent=False, bounded=False, even_subseq_conv=False, odd_subseq_conv=False),
+    "2**n": dict(convergent=False, bounded=False, monotone=True),
+    "n*sin(n)": dict(convergent=False, bounded=False),
+    "(-1)**n*cos(n)/sqrt(n)": dict(convergent=True, bounded=True, sign_changes=True),
+    "(-1)**n": dict(convergent=False, bounded=True, even_subseq_conv=True, odd_subseq_conv=True),
+    # 앞쪽의 아주 큰 항(sin n ≈ 0) 때문에 최댓값으로는 유계처럼 보이는 식 (sympy 도 풀지 못함)
+    "log(n)**2/sin(n)**2": dict(convergent=False, bounded=False),
+    "log(n)/(log(n)+1)*sin(n)": dict(convergent=False, bounded=True),
+    # 홀수 항이 0 으로 가 |a_n| 의 중앙값이 잡음이 되는 식
+    "(1+(-1)**n)/2*(sin(n))+(1-(-1)**n)/2*((1/2)**n)": dict(convergent=False, bounded=True),
+}
+NUMERIC_LIMITS = {
+    "2**n/(2**n+1)": (1.0, 1e-9),
+    "(1+1/n)**n": (math.e, 1e-6),
+    # 0 으로 가는 수열은 꼬리값(1e-10 등) 대신 0 으로 적습니다.
+    "n**-2": (0.0, 0.0),
+    "n**-1.5": (0.0, 0.0),
+    "1/sqrt(n)": (0.0, 0.0),
+    "1/(n+cos(n))": (0.0, 0.0),
+}
+
+
+# 짝·홀 항이 다른 식을 따르는 수열: 섞인 꼬리의 추정(0.999995 ± 5e-9)을 믿으면 안 됩니다.
+INTERLEAVED = (
+    "(1+(-1)**n)/2*(n/(n+1))+(1-(-1)**n)/2*(n**2/(n**2+1))",
+    "(1+(-1)**n)/2*(log(n)/n)+(1-(-1)**n)/2*(sin(n)/n)",
+)
+
+
+def _check(props, expected):
+    got = {key: getattr(props, key) for key in expected}
+    assert got == expected
+
+
+def _check_consistent(props):
+    """수렴하면 유계이고 |a_n|·짝수·홀수 부분수열·a_n/n 도 수렴, n·a_n 이 수렴하면 a_n 도 수렴"""
+    if props.convergent:
+        assert props.bounded and props.abs_conv and props.even_subseq_conv
+        assert props.odd_subseq_conv and props.with_1_over_n_conv
+        assert props.limit_value is not None
+    if props.n_times_conv:
+        assert props.convergent and props.limit_value == 0.0
+
+
+@pytest.mark.parametrize("source", sorted(SYMBOLIC_CASES))
+def test_symbolic_properties(source):
+    props = infer_properties(source)
+    _check(props, SYMBOLIC_CASES[source])
+    _check_consistent(props)
+
+
+@pytest.mark.parametrize("source", sorted(SYMBOLIC_LIMITS))
+def test_symbolic_limits(source):
+    props = infer_properties(source)
+    assert props.convergent
+    assert props.limit_value == pytest.approx(SYMBOLIC_LIMITS[source], abs=1e-12)
+    assert props.limit_error == 0.0
+
+
+@pytest.mark.parametrize("source", sorted(NUMERIC_CASES))
+def test_numeric_properties(source):
+    props = infer_properties(source, symbolic=False)
+    _check(props, NUMERIC_CASES[source])
+    _check_consistent(props)
+
+
+@pytest.mark.parametrize("source", sorted(NUMERIC_LIMITS))
+def test_numeric_limits(source):
+    value, tolerance = NUMERIC_LIMITS[source]
+    props = infer_properties(source, symbolic=False)
+    assert props.convergent
+    if value == 0.0:
+        assert props.limit_value == 0.0
+    else:
+        assert props.limit_value == pytest.approx(value, rel=tolerance)
+
+
+def test_property_keys_are_fields():
+    props = infer_properties("1/n", symbolic=False)
+    assert all(isinstance(getattr(props, key), bool) for key in PROPERTY_KEYS)
+
+
+@pytest.mark.parametrize("source", INTERLEAVED)
+def test_interleaved_limit_error_covers_truth(source):
+    props = infer_properties(source, symbolic=False)
+    assert props.convergent
+    limit = 1.0 if "n**2" in source else 0.0
+    assert abs(props.limit_value - limit) <= props.limit_error
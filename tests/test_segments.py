@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+seqlab.segments.SegmentStore: 이미 계산한 n 구간을 기억해 빈 구간만 계산하는 저장소
+
+compute 가 받은 구간을 적어 두고, 겹치거나 맞닿은 요청에서 빈 곳만 계산하는지,
+구간이 합쳐지거나 따로 남는지, 돌려준 항이 n 과 맞는지를 봅니다.
+"""
+import numpy as np
+import pytest
+
+from seqlab.segments import SegmentStore
+
+
+@pytest.fixture
+def store():
+    calls = []
+
+    def compute(lo, hi):
+        calls.append((lo, hi))
+        return np.arange(lo, hi + 1, dtype=float)
+
+    s = SegmentStore(compute)
+    s.calls = calls
+    return s
+
+
+def _check(arr, n_min, n_max):
+    np.testing.assert_array_equal(arr, np.arange(n_min, n_max + 1))
+
+
+def test_extends_to_the_right(store):
+    _check(store.get(1, 50), 1, 50)
+    _check(store.get(1, 5000), 1, 5000)
+    assert store.calls == [(1, 50), (51, 5000)]
+    assert store.segments() == [(1, 5000)]
+    assert (store.computed_terms, store.served_terms) == (5000, 5050)
+
+
+def test_inside_existing_range_computes_nothing(store):
+    store.get(1, 100)
+    _check(store.get(20, 30), 20, 30)
+    _check(store.get(100, 100), 100, 100)
+    assert store.calls == [(1, 100)]
+
+
+def test_separate_ranges_stay_split(store):
+    store.get(10, 20)
+    store.get(1, 5)
+    store.get(30, 40)
+    assert store.segments() == [(1, 5), (10, 20), (30, 40)]
+    # 맞닿으면 합쳐집니다 (21 은 20 바로 다음).
+    store.get(21, 25)
+    assert store.segments() == [(1, 5), (10, 25), (30, 40)]
+
+
+def test_fills_every_gap_and_merges(store):
+    store.get(1, 5)
+    store.get(10, 12)
+    store.get(20, 25)
+    store.calls.clear()
+    _check(store.get(3, 30), 3, 30)
+    assert store.calls == [(6, 9), (13, 19), (26, 30)]
+    assert store.segments() == [(1, 30)]
+
+
+def test_overlap_on_the_left(store):
+    store.get(50, 60)
+    store.calls.clear()
+    _check(store.get(40, 55), 40, 55)
+    assert store.calls == [(40, 49)]
+    assert store.segments() == [(40, 60)]
+
+
+def test_returns_read_only_views(store):
+    arr = store.get(1, 10)
+    with pytest.raises(ValueError):
+        arr[0] = 0.0
+    store.get(11, 20)                      # 합친 뒤에도 읽기 전용
+    with pytest.raises(ValueError):
+        store.get(1, 20)[0] = 0.0
+
+
+def test_empty_request(store):
+    assert len(store.get(5, 4)) == 0
+    assert store.calls == [] and store.segments() == []
+
+
+def test_nbytes_follows_segments(store):
+    store.get(1, 10)
+    store.get(21, 30)
+    assert store.nbytes == 20 * 8
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+seqlab.store.SessionStore: 반·학생별 활동 기록 (SQLite, WAL)
+
+- 아직 쓰이지 않은 기록도 읽기에 보이고, flush·close 뒤에는 파일에 남는지
+- 서버가 다시 켜진 뒤(새 SessionStore) 마지막 라운드·메모를 되찾는지 (페이지의 복원)
+- 같은 라운드·메모를 여러 번 고치면 마지막 것만, 사건 기록은 쌓이기만 하는지
+"""
+import sqlite3
+
+import pytest
+
+from seqlab import store as store_module
+from seqlab.store import RoundRecord, SessionStore
+
+PAGE = "sequence20"
+
+
+def _round(round_no, **fields):
+    values = dict(seq_idx=7, asked=(("convergent", True), ("bounded", None)), q_count=2, show_answer=False)
+    values.update(fields)
+    return RoundRecord("2-3", "kim", PAGE, round_no, **values)
+
+
+@pytest.fixture
+def db(tmp_path):
+    return str(tmp_path / "sub" / "classroom.db")
+
+
+@pytest.fixture
+def store(db):
+    s = SessionStore(db, flush_interval=0.05)
+    yield s
+    s.close()
+
+
+def test_creates_wal_database(store, db):
+    conn = sqlite3.connect(db)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    tables = {name for name, in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert {"rounds", "memos", "events"} <= tables
+
+
+def test_pending_rounds_are_readable_before_flush(db):
+    s = SessionStore(db, flush_interval=60.0)
+    try:
+        s.save_round(_round(1))
+        assert s.latest_round("2-3", "kim", PAGE) == _round(1)
+        assert sqlite3.connect(db).execute("SELECT COUNT(*) FROM rounds").fetchone()[0] == 0
+        assert s.flush(timeout=5.0)
+        assert sqlite3.connect(db).execute("SELECT COUNT(*) FROM rounds").fetchone()[0] == 1
+    finally:
+        s.close()
+
+
+def test_restores_latest_round_and_memos_after_restart(db):
+    s = SessionStore(db, flush_interval=60.0)
+    s.save_round(_round(1))
+    s.save_round(_round(2, q_count=1, asked=(("monotone", False),)))
+    s.save_round(_round(2, q_count=3, show_answer=True, verdict="수렴", guess="0", reason="1/n 꼴"))
+    s.save_memo("2-3", "kim", PAGE, "note", "첫 메모")
+    s.save_memo("2-3", "kim", PAGE, "note", "고친 메모")
+    s.close()                                   # 닫을 때 남은 기록을 씁니다.
+
+    again = SessionStore(db)
+    try:
+        record = again.latest_round("2-3", "kim", PAGE)
+        assert record == _round(2, q_count=3, show_answer=True, verdict="수렴", guess="0", reason="1/n 꼴")
+        assert again.memos("2-3", "kim", PAGE) == {"note": "고친 메모"}
+        assert again.latest_round("2-3", "lee", PAGE) is None
+        assert again.latest_round("2-3", "kim", "sequence_lab") is None
+    finally:
+        again.close()
+    assert sqlite3.connect(db).execute("SELECT COUNT(*) FROM rounds").fetchone()[0] == 2
+
+
+def test_pending_overrides_written_rows(store):
+    store.save_round(_round(1, q_count=1))
+    store.save_memo("2-3", "kim", PAGE, "note", "old")
+    assert store.flush(timeout=5.0)
+    store.flush_interval = 60.0
+    store.save_round(_round(1, q_count=5))
+    store.save_memo("2-3", "kim", PAGE, "note", "new")
+    assert store.latest_round("2-3", "kim", PAGE).q_count == 5
+    assert store.memos("2-3", "kim", PAGE) == {"note": "new"}
+
+
+def test_class_rounds_merges_pending_and_filters_page(store):
+    store.save_round(_round(1))
+    store.save_round(RoundRecord("2-3", "lee", PAGE, 1, 3, (), 0, False))
+    store.save_round(RoundRecord("2-3", "lee", "other", 1, 3, (), 0, False))
+    store.save_round(RoundRecord("1-1", "park", PAGE, 1, 3, (), 0, False))
+    assert store.flush(timeout=5.0)
+    store.save_round(_round(2))
+    rounds = store.class_rounds("2-3", PAGE)
+    assert [(r.student, r.round_no) for r in rounds] == [("kim", 1), ("kim", 2), ("lee", 1)]
+
+
+def test_events_are_appended(store):
+    store.log_event("2-3", "kim", PAGE, "round_start", 1, seq_idx=4)
+    store.log_event("2-3", "kim", PAGE, "question", 1, key="convergent", answer=True)
+    store.log_event("2-3", "kim", PAGE, "question", 1, key="convergent", answer=True)
+    assert store.flush(timeout=5.0)
+    events = store.events("2-3", "kim")
+    assert [kind for _, _, kind, _, _ in events] == ["question", "question", "round_start"]
+    assert events[-1][:4] == (PAGE, 1, "round_start", {"seq_idx": 4})
+    assert store.events("2-3", "lee") == []
+
+
+def test_drops_events_beyond_max_pending(db, monkeypatch):
+    monkeypatch.setattr(store_module, "MAX_PENDING", 3)
+    s = SessionStore(db, flush_interval=60.0, batch_size=1000)
+    try:
+        for i in range(5):
+            s.log_event("2-3", "kim", PAGE, "question", 1, i=i)
+        assert s.dropped == 2
+        assert s.flush(timeout=5.0)
+        assert len(s.events("2-3", "kim")) == 3
+    finally:
+        s.close()
+
+
+def test_two_stores_share_one_file(db):
+    first, second = SessionStore(db), SessionStore(db)
+    try:
+        first.save_memo("2-3", "kim", PAGE, "a", "from first")
+        second.save_memo("2-3", "kim", PAGE, "b", "from second")
+        assert first.flush(timeout=5.0) and second.flush(timeout=5.0)
+        assert first.memos("2-3", "kim", PAGE) == {"a": "from first", "b": "from second"}
+    finally:
+        first.close()
+        second.close()
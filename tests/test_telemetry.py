@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+seqlab.telemetry: rerun 계측과 JSONL·Prometheus 파일
+
+수집기마다 tmp_path 를 쓰고, 쓰기 스레드를 기다리지 않도록 flush() 를 직접 부릅니다.
+"""
+import json
+import os
+import threading
+
+import pytest
+
+from seqlab import telemetry
+from seqlab.telemetry import Collector
+
+
+@pytest.fixture
+def collector(tmp_path, monkeypatch):
+    c = Collector(directory=str(tmp_path), flush_interval=3600.0)
+    monkeypatch.setattr(telemetry, "COLLECTOR", c)
+    monkeypatch.setattr(telemetry, "ENABLED", True)
+    monkeypatch.setattr(telemetry, "SAMPLE_RATE", 1.0)
+    telemetry._local.record = None
+    yield c
+    telemetry._local.record = None
+
+
+def _lines(directory):
+    with open(os.path.join(directory, telemetry.JSONL_NAME), encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def _prometheus(directory):
+    with open(os.path.join(directory, telemetry.PROM_NAME), encoding="utf-8") as f:
+        return f.read()
+
+
+def test_rerun_is_written_as_one_jsonl_line(collector):
+    telemetry.begin_rerun("lab")
+    with telemetry.span("sympify"):
+        pass
+    with telemetry.span("sympify"):
+        pass
+    telemetry.payload("chart", 1500)
+    telemetry.payload("chart", 500)
+    telemetry.end_rerun()
+    collector.flush()
+
+    line, = _lines(collector.directory)
+    assert (line["page"], line["kind"], line["status"]) == ("lab", "script", "ok")
+    assert set(line["spans"]) == {"sympify"} and line["ms"] >= line["spans"]["sympify"]
+    assert line["bytes"] == {"chart": 2000}
+
+
+def test_unfinished_rerun_is_closed_as_stopped(collector):
+    telemetry.begin_rerun("lab")
+    telemetry.begin_rerun("lab")            # st.stop() 뒤의 다음 rerun
+    telemetry.end_rerun()
+    collector.flush()
+    assert [line["status"] for line in _lines(collector.directory)] == ["stopped", "ok"]
+
+
+def test_dead_thread_rerun_is_closed_on_flush(collector):
+    worker = threading.Thread(target=telemetry.begin_rerun, args=("game",))
+    worker.start()
+    worker.join()
+    collector.flush()
+    line, = _lines(collector.directory)
+    assert (line["page"], line["status"]) == ("game", "stopped")
+
+
+def test_traced_fragment(collector):
+    @telemetry.traced("lab", "export_panel")
+    def panel():
+        return 7
+
+    assert panel() == 7                     # fragment 만 다시 실행: 기록 하나
+    telemetry.begin_rerun("lab")
+    assert panel() == 7                     # 페이지 rerun 안: span 하나
+    telemetry.end_rerun()
+    collector.flush()
+    first, second = _lines(collector.directory)
+    assert first["kind"] == "export_panel" and first["spans"] == {}
+    assert second["kind"] == "script" and set(second["spans"]) == {"export_panel"}
+
+
+def test_disabled_records_nothing(collector, monkeypatch):
+    monkeypatch.setattr(telemetry, "ENABLED", False)
+    telemetry.begin_rerun("lab")
+    assert telemetry.span("x") is telemetry._NO_SPAN
+    telemetry.end_rerun()
+    collector.flush()
+    assert os.listdir(collector.directory) == []
+
+
+def test_prometheus_histograms(collector):
+    for _ in range(3):
+        telemetry.begin_rerun("lab")
+        with telemetry.span("figure"):
+            pass
+        telemetry.payload("chart", 5000)
+        telemetry.end_rerun()
+    collector.flush()
+    text = _prometheus(collector.directory)
+    assert text == collector.prometheus_text()
+
+    samples = {}
+    for line in text.splitlines():
+        if not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    assert samples['seqlab_reruns_total{page="lab",kind="script",status="ok"}'] == 3
+    assert samples['seqlab_rerun_seconds_count{page="lab"}'] == 3
+    assert samples['seqlab_rerun_seconds_bucket{page="lab",le="+Inf"}'] == 3
+    assert samples['seqlab_span_seconds_count{page="lab",span="figure"}'] == 3
+    # 5000 바이트는 4096 버킷에는 없고 16384 버킷부터 (누적)
+    assert samples['seqlab_payload_bytes_bucket{page="lab",name="chart",le="4096.0"}'] == 0
+    assert samples['seqlab_payload_bytes_bucket{page="lab",name="chart",le="16384.0"}'] == 3
+    assert samples['seqlab_payload_bytes_sum{page="lab",name="chart"}'] == 15000
+    assert samples["seqlab_telemetry_dropped_total"] == 0
+    buckets = [v for k, v in samples.items() if k.startswith('seqlab_rerun_seconds_bucket')]
+    assert buckets == sorted(buckets)
+
+
+def test_jsonl_rotation(collector, monkeypatch):
+    monkeypatch.setattr(telemetry, "MAX_BYTES", 1)
+    monkeypatch.setattr(telemetry, "BACKUPS", 2)
+    for _ in range(4):
+        telemetry.begin_rerun("lab")
+        telemetry.end_rerun()
+        collector.flush()
+    names = sorted(os.listdir(collector.directory))
+    jsonl = telemetry.JSONL_NAME
+    assert names == sorted([jsonl, jsonl + ".1", jsonl + ".2", telemetry.PROM_NAME])
+    assert len(_lines(collector.directory)) == 1
+
+
+def test_drops_lines_beyond_max_pending(collector, monkeypatch):
+    monkeypatch.setattr(telemetry, "MAX_PENDING", 2)
+    for _ in range(5):
+        telemetry.begin_rerun("lab")
+        telemetry.end_rerun()
+    collector.flush()
+    assert len(_lines(collector.directory)) == 2
+    assert collector.dropped == 3
+    assert "seqlab_telemetry_dropped_total 3" in _prometheus(collector.directory)
+    # 히스토그램에는 버린 줄도 들어갑니다.
+    assert collector.snapshot()["reruns"][("lab", "script", "ok")] == 5